@@ -0,0 +1,343 @@
+"""Icon search traversal benchmark over large synthetic directory trees.
+
+Builds a directory tree shaped like a shared asset drive and runs each
+traversal strategy over it with the icon search's extensions and skip
+rules. For each strategy it records the time to the first result, the
+time to N results, and directory entries visited per second.
+
+The tree is described by its depth, fan-out, files per directory and icon
+density. Each directory can also carry hidden directories (.git, .cache)
+and vendor directories (node_modules, venv) full of decoy icons, which the
+search must skip. Trees are cached under --tree-dir and reused while the
+parameters stay the same.
+
+--latency-ms adds a delay to every directory listing to emulate network
+filesystems, where each scandir round-trip is expensive.
+
+    python benchmarks/icon_traversal.py --depth 5 --fanout 6 --icon-density 0.001
+    python benchmarks/icon_traversal.py --latency-ms 2 --checkpoints 1 20 100 --json
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from py2exe_converter_v4 import ICON_SEARCH_SKIP_DIRS, IconIndex, ParallelDirectoryWalker  # noqa: E402
+
+# Same extensions as search_icons
+ICON_EXTENSIONS = ('.ico', '.png', '.jpg', '.jpeg', '.bmp')
+OTHER_EXTENSIONS = ('.txt', '.psd', '.svg', '.json', '.py', '.md', '.dat')
+HIDDEN_DIRS = ('.git', '.cache', '.thumbnails')
+VENDOR_DIRS = ('node_modules', 'venv', 'build', 'dist')
+
+
+def build_tree(root, depth=5, fanout=6, files_per_dir=20, icon_density=0.002, hidden_dirs=1,
+               vendor_dirs=1, decoy_files=50, seed=0):
+    """Create a synthetic tree under root; returns counts of what was written.
+
+    Every regular directory holds files_per_dir files, of which icon_density
+    are icons, and has fanout subdirectories down to depth. Hidden and vendor
+    directories are flat, holding decoy_files icons each.
+    """
+    rng = random.Random(seed)
+    counts = {'dirs': 0, 'files': 0, 'icons': 0, 'skipped_dirs': 0}
+
+    def fill(directory, level):
+        os.makedirs(directory, exist_ok=True)
+        counts['dirs'] += 1
+        for index in range(files_per_dir):
+            if rng.random() < icon_density:
+                name = f"icon_{index}{rng.choice(ICON_EXTENSIONS)}"
+                counts['icons'] += 1
+            else:
+                name = f"file_{index}{rng.choice(OTHER_EXTENSIONS)}"
+            open(os.path.join(directory, name), 'wb').close()
+            counts['files'] += 1
+
+        skipped = rng.sample(HIDDEN_DIRS, min(hidden_dirs, len(HIDDEN_DIRS)))
+        skipped += rng.sample(VENDOR_DIRS, min(vendor_dirs, len(VENDOR_DIRS)))
+        for name in skipped:
+            decoy_dir = os.path.join(directory, name)
+            os.makedirs(decoy_dir, exist_ok=True)
+            for index in range(decoy_files):
+                open(os.path.join(decoy_dir, f"decoy_{index}.png"), 'wb').close()
+            counts['skipped_dirs'] += 1
+
+        if level < depth:
+            for index in range(fanout):
+                fill(os.path.join(directory, f"dir_{level}_{index}"), level + 1)
+
+    fill(root, 1)
+    return counts
+
+
+def ensure_tree(tree_dir, **params):
+    """Reuse the tree in tree_dir if it was built with the same parameters, else rebuild it."""
+    marker = os.path.join(tree_dir, 'tree.json')
+    try:
+        with open(marker, encoding='utf-8') as f:
+            stored = json.load(f)
+        if stored['params'] == params:
+            return stored['counts']
+    except (OSError, ValueError, KeyError):
+        pass
+    shutil.rmtree(tree_dir, ignore_errors=True)
+    counts = build_tree(os.path.join(tree_dir, 'root'), **params)
+    with open(marker, 'w', encoding='utf-8') as f:
+        json.dump({'params': params, 'counts': counts}, f)
+    return counts
+
+
+class ScandirProbe:
+    """Wraps os.scandir to count visited entries and optionally add per-listing latency."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.entries = 0
+        self.listings = 0
+        self._lock = threading.Lock()
+        self._scandir = os.scandir
+
+    @contextmanager
+    def installed(self):
+        os.scandir = self
+        try:
+            yield self
+        finally:
+            os.scandir = self._scandir
+
+    def __call__(self, path='.'):
+        if self.latency:
+            time.sleep(self.latency)
+        return _ProbedIterator(self, self._scandir(path))
+
+
+class _ProbedIterator:
+    def __init__(self, probe, iterator):
+        self._probe = probe
+        self._iterator = iterator
+        with probe._lock:
+            probe.listings += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._iterator.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        entry = next(self._iterator)
+        with self._probe._lock:
+            self._probe.entries += 1
+        return entry
+
+    def close(self):
+        self._iterator.close()
+
+
+def iter_recursive(directory, extensions, limit):
+    """Depth-first recursive scandir generator, as the icon search used before the parallel walker."""
+    count = 0
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if count >= limit:
+                    return
+                if entry.is_file() and entry.name.lower().endswith(extensions):
+                    yield entry.path
+                    count += 1
+                elif entry.is_dir():
+                    name = entry.name.lower()
+                    if name.startswith('.') or name in ICON_SEARCH_SKIP_DIRS:
+                        continue
+                    for icon in iter_recursive(entry.path, extensions, limit - count):
+                        yield icon
+                        count += 1
+                        if count >= limit:
+                            return
+    except OSError:
+        pass
+
+
+def iter_os_walk(directory, extensions, limit):
+    """os.walk with the same skip rules, pruned in place."""
+    count = 0
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = [d for d in dirnames
+                       if not d.startswith('.') and d.lower() not in ICON_SEARCH_SKIP_DIRS]
+        for filename in filenames:
+            if filename.lower().endswith(extensions):
+                yield os.path.join(dirpath, filename)
+                count += 1
+                if count >= limit:
+                    return
+
+
+def iter_breadth_first(directory, extensions, limit):
+    """Iterative scandir with a FIFO of directories: shallow icons are found first."""
+    pending = [directory]
+    count = 0
+    while pending:
+        next_level = []
+        for path in pending:
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_file() and entry.name.lower().endswith(extensions):
+                            yield entry.path
+                            count += 1
+                            if count >= limit:
+                                return
+                        elif entry.is_dir():
+                            name = entry.name.lower()
+                            if not name.startswith('.') and name not in ICON_SEARCH_SKIP_DIRS:
+                                next_level.append(entry.path)
+            except OSError:
+                continue
+        pending = next_level
+
+
+def iter_parallel(directory, extensions, limit):
+    """ParallelDirectoryWalker: directory listings fanned out to a pool of worker threads."""
+    return ParallelDirectoryWalker(extensions, workers=_WALKER_WORKERS['workers']).walk(directory, limit)
+
+
+def iter_index(directory, extensions, limit):
+    """Query of the persistent icon index, built by prepare() before timing starts."""
+    return iter(_INDEX['index'].search(directory, extensions, limit))
+
+
+def prepare_index(directory, extensions):
+    index_path = os.path.join(tempfile.gettempdir(), 'py2exe_icon_index_bench.sqlite3')
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(index_path + suffix):
+            os.remove(index_path + suffix)
+    _INDEX['index'] = IconIndex(index_path)
+    _INDEX['index'].refresh(directory, extensions)
+
+
+iter_index.prepare = prepare_index
+_INDEX = {}
+_WALKER_WORKERS = {'workers': 8}
+
+STRATEGIES = {
+    'recursive': iter_recursive,
+    'os.walk': iter_os_walk,
+    'breadth-first': iter_breadth_first,
+    'parallel': iter_parallel,
+    'index': iter_index,
+}
+
+
+def measure(strategy, directory, checkpoints, limit, latency=0.0):
+    """Run one traversal and return time-to-N results and visit counts."""
+    probe = ScandirProbe(latency)
+    times = {}
+    found = 0
+    with probe.installed():
+        start = time.perf_counter()
+        for _ in STRATEGIES[strategy](directory, ICON_EXTENSIONS, limit):
+            found += 1
+            if found in checkpoints:
+                times[found] = time.perf_counter() - start
+        elapsed = time.perf_counter() - start
+    return {'found': found, 'elapsed_s': elapsed, 'times': times, 'entries': probe.entries,
+            'listings': probe.listings}
+
+
+def run_benchmark(tree_root, strategies, checkpoints, limit, repeat=3, latency=0.0):
+    """Measure every strategy repeat times; returns {strategy: summary} using medians."""
+    results = {}
+    for strategy in strategies:
+        # Strategies with setup (such as building an index) do it before timing starts
+        prepare = getattr(STRATEGIES[strategy], 'prepare', None)
+        if prepare:
+            prepare(tree_root, ICON_EXTENSIONS)
+        runs = [measure(strategy, tree_root, set(checkpoints), limit, latency) for _ in range(repeat)]
+        elapsed = statistics.median(run['elapsed_s'] for run in runs)
+        entries = runs[-1]['entries']
+        results[strategy] = {
+            'found': runs[-1]['found'],
+            'time_to_ms': {n: round(statistics.median(run['times'][n] for run in runs) * 1000, 2)
+                           for n in checkpoints if all(n in run['times'] for run in runs)},
+            'elapsed_ms': round(elapsed * 1000, 2),
+            'entries_visited': entries,
+            'listings': runs[-1]['listings'],
+            'entries_per_s': round(entries / elapsed) if elapsed else 0,
+        }
+    return results
+
+
+def format_report(results, checkpoints):
+    header = f"{'strategy':<16}" + "".join(f"{'to ' + str(n):>11}" for n in checkpoints)
+    header += f"{'total':>11}{'found':>8}{'visited':>10}{'entries/s':>12}"
+    lines = [header]
+    for strategy, result in results.items():
+        line = f"{strategy:<16}"
+        for n in checkpoints:
+            value = result['time_to_ms'].get(n)
+            line += f"{value:>9.1f}ms" if value is not None else f"{'-':>11}"
+        line += (f"{result['elapsed_ms']:>9.1f}ms{result['found']:>8}{result['entries_visited']:>10}"
+                 f"{result['entries_per_s']:>12,}")
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark icon search traversal strategies")
+    parser.add_argument("--depth", type=int, default=5, help="directory levels")
+    parser.add_argument("--fanout", type=int, default=6, help="subdirectories per directory")
+    parser.add_argument("--files-per-dir", type=int, default=20, help="files per directory")
+    parser.add_argument("--icon-density", type=float, default=0.002, help="fraction of files that are icons")
+    parser.add_argument("--hidden-dirs", type=int, default=1, help="hidden directories per directory")
+    parser.add_argument("--vendor-dirs", type=int, default=1, help="vendor directories per directory")
+    parser.add_argument("--decoy-files", type=int, default=50, help="icons inside each skipped directory")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the tree layout")
+    parser.add_argument("--tree-dir", default=os.path.join(tempfile.gettempdir(), 'py2exe_icon_tree'),
+                        help="where to build (and cache) the tree")
+    parser.add_argument("--strategies", nargs='+', choices=list(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument("--checkpoints", type=int, nargs='+', default=[1, 20],
+                        help="result counts to time (20 is the search's display limit)")
+    parser.add_argument("--limit", type=int, default=10 ** 9, help="stop after this many results")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per strategy; medians are reported")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="delay added to every directory listing (emulates network filesystems)")
+    parser.add_argument("--workers", type=int, default=8, help="threads for the parallel strategy")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+    _WALKER_WORKERS['workers'] = args.workers
+
+    params = {'depth': args.depth, 'fanout': args.fanout, 'files_per_dir': args.files_per_dir,
+              'icon_density': args.icon_density, 'hidden_dirs': args.hidden_dirs,
+              'vendor_dirs': args.vendor_dirs, 'decoy_files': args.decoy_files, 'seed': args.seed}
+    counts = ensure_tree(args.tree_dir, **params)
+    checkpoints = sorted(set(args.checkpoints))
+    results = run_benchmark(os.path.join(args.tree_dir, 'root'), args.strategies, checkpoints,
+                            args.limit, args.repeat, args.latency_ms / 1000)
+
+    if args.json:
+        print(json.dumps({'tree': dict(params, **counts), 'latency_ms': args.latency_ms,
+                          'results': results}, indent=2))
+    else:
+        print(f"Tree: {counts['dirs']:,} dirs, {counts['files']:,} files, {counts['icons']:,} icons, "
+              f"{counts['skipped_dirs']:,} skipped dirs; listing latency {args.latency_ms} ms\n")
+        print(format_report(results, checkpoints))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
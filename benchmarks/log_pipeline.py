@@ -0,0 +1,305 @@
+"""Throughput benchmark for the log pipeline: log_output -> queue -> _process_log_queue -> Text widget.
+
+Producer threads call the converter's real log_output at a configurable rate
+while the main thread plays the Tk event loop. The widget is either a mock
+Text (default; measures the pipeline's own Python cost) or a real tk.Text
+(--real-tk; adds Tcl insert and layout cost, needs a display).
+
+Reported numbers:
+    sustained lines/s    records shown in the widget per second of the run
+    latency percentiles  time from log_output to the batch being in the widget
+    UI stall time        time spent in UI flushes longer than --stall-ms
+
+    python benchmarks/log_pipeline.py --producers 4 --rate 5000 --duration 5
+    python benchmarks/log_pipeline.py --producers 8 --rate 0 --count 50000 --level build
+"""
+
+import argparse
+import heapq
+import json
+import os
+import queue
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import tkinter as tk  # noqa: E402
+
+from py2exe_converter_v4 import (  # noqa: E402
+    JsonLogSink, ModernPy2ExeConverter, SessionLog, UIUpdateBus,
+)
+
+# Message shapes per level; 'build' lines look like PyInstaller output and get coalesced
+MESSAGES = {
+    'info': "Producer {producer} processed item {index} of the current batch",
+    'build': "{index} INFO: Loading module hook 'hook-pkg{index}.py' from '/site-packages/hooks'",
+}
+
+
+class MockRoot:
+    """Single-threaded stand-in for the Tk event loop: runs after() callbacks when due."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timers = []
+        self._sequence = 0
+
+    def after(self, ms, callback=None, *args):
+        with self._lock:
+            self._sequence += 1
+            heapq.heappush(self._timers, (time.perf_counter() + ms / 1000, self._sequence, callback, args))
+        return f"after#{self._sequence}"
+
+    def after_idle(self, callback, *args):
+        return self.after(0, callback, *args)
+
+    def run_until(self, done, poll=0.001):
+        """Run due callbacks until done() is true and no callbacks remain."""
+        while True:
+            with self._lock:
+                timer = self._timers[0] if self._timers else None
+                if timer and timer[0] <= time.perf_counter():
+                    heapq.heappop(self._timers)
+                else:
+                    timer = None
+            if timer:
+                timer[2](*timer[3])
+            elif done() and not self._timers:
+                return
+            else:
+                time.sleep(poll)
+
+
+class MockText:
+    """Line-based stand-in for tk.Text supporting the calls the log pipeline makes."""
+
+    def __init__(self):
+        self.lines = ['']
+        self.state = tk.DISABLED
+
+    def config(self, **options):
+        self.state = options.get('state', self.state)
+
+    configure = config
+
+    def cget(self, option):
+        return self.state
+
+    def insert(self, index, *chunks):
+        text = ''.join(chunks[0::2])
+        if index == tk.END:
+            position = len(self.lines) - 1
+            text = self.lines[position] + text
+        else:
+            position = int(str(index).split('.')[0]) - 1
+            text += self.lines[position]
+        self.lines[position:position + 1] = text.split('\n')
+
+    def delete(self, first, last=None):
+        start = int(str(first).split('.')[0]) - 1
+        if last == tk.END:
+            end = len(self.lines)
+        else:
+            end = int(str(last).split('.')[0]) - 1 if last else start + 1
+        del self.lines[start:end]
+        if not self.lines:
+            self.lines = ['']
+
+    def see(self, index):
+        pass
+
+    def tag_config(self, *args, **options):
+        pass
+
+    def tag_bind(self, *args):
+        pass
+
+
+class LatencyQueue(queue.Queue):
+    """Log queue that remembers the enqueue time of every drained message."""
+
+    def __init__(self):
+        super().__init__()
+        self.drained = []
+
+    def get_nowait(self):
+        item = super().get_nowait()
+        self.drained.append(item[2])
+        return item
+
+
+def create_pipeline(root, text_widget, scratch, max_lines, coalesce):
+    """Build a converter with only its log pipeline, attached to the given root and widget."""
+    app = object.__new__(ModernPy2ExeConverter)
+    app.root = root
+    app.default_settings = {'log_view_max_lines': max_lines, 'coalesce_build_output': coalesce}
+    app.ui_bus = UIUpdateBus(root)
+    app.json_log = JsonLogSink(os.path.join(scratch, 'events')).start()
+    app._init_log_pipeline(SessionLog(os.path.join(scratch, 'session.log')))
+    app.log_queue = LatencyQueue()
+    app.output_text = text_widget
+    return app
+
+
+def produce(app, producer, count, rate, level, duration, sent):
+    """Call log_output count times (or until duration passes) at rate lines/s (0 = unpaced)."""
+    template = MESSAGES[level]
+    start = time.perf_counter()
+    interval = 1 / rate if rate else 0
+    index = 0
+    while index < count and (not duration or time.perf_counter() - start < duration):
+        if interval:
+            ahead = start + index * interval - time.perf_counter()
+            if ahead > 0.001:
+                time.sleep(ahead)
+        app.log_output(template.format(producer=producer, index=index), level)
+        index += 1
+    sent[producer] = index
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def run_benchmark(producers=4, rate=2000, count=None, duration=5.0, level='info', real_tk=False,
+                  max_lines=5000, coalesce=True, stall_ms=50):
+    """Drive the log pipeline and return a results dict."""
+    scratch = tempfile.mkdtemp(prefix='py2exe_logbench_')
+    if real_tk:
+        root = tk.Tk()
+        root.title("Log pipeline benchmark")
+        text_widget = tk.Text(root, wrap=tk.WORD, state=tk.DISABLED, height=30, width=120)
+        text_widget.pack(fill='both', expand=True)
+        root.update()
+    else:
+        root = MockRoot()
+        text_widget = MockText()
+    app = create_pipeline(root, text_widget, scratch, max_lines, coalesce)
+
+    # Time every flush of the UI bus: that is the time the event loop is blocked
+    flush_times = []
+    rendered = []
+    drained = app.log_queue.drained
+    original_flush = app.ui_bus._flush
+
+    def timed_flush():
+        started = time.perf_counter()
+        original_flush()
+        flush_times.append(time.perf_counter() - started)
+
+    def mark_rendered():
+        # Runs right after _process_log_queue in the same flush
+        if drained:
+            now = time.time()
+            rendered.extend(now - enqueued_at for enqueued_at in drained)
+            drained.clear()
+        return False
+
+    app.ui_bus._flush = timed_flush
+    app.ui_bus.register_pump(mark_rendered)
+
+    per_producer = count // producers if count else sys.maxsize
+    sent = {}
+    threads = [threading.Thread(target=produce, args=(app, i, per_producer, rate, level,
+                                                      None if count else duration, sent))
+               for i in range(producers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    def finished():
+        return (not any(thread.is_alive() for thread in threads) and app.log_queue.empty()
+                and len(rendered) >= sum(sent.values()))
+
+    try:
+        if real_tk:
+            while not finished():
+                root.update()
+        else:
+            root.run_until(finished)
+        elapsed = time.perf_counter() - start
+    finally:
+        for thread in threads:
+            thread.join()
+        app.json_log.close()
+        app.session_log.close()
+        if real_tk:
+            root.destroy()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    latencies = sorted(rendered)
+    stall_threshold = stall_ms / 1000
+    flushes = sorted(flush_times)
+    total_sent = sum(sent.values())
+    return {
+        'producers': producers, 'offered_rate': rate * producers if rate else None, 'level': level,
+        'widget': 'tk.Text' if real_tk else 'mock', 'lines': total_sent,
+        'elapsed_s': round(elapsed, 3),
+        'lines_per_s': round(total_sent / elapsed) if elapsed else 0,
+        'latency_ms': {name: round(percentile(latencies, fraction) * 1000, 2)
+                       for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))},
+        'flushes': len(flushes),
+        'flush_ms': {'mean': round(statistics.mean(flushes) * 1000, 2) if flushes else 0.0,
+                     'p99': round(percentile(flushes, 0.99) * 1000, 2),
+                     'max': round(percentile(flushes, 1.0) * 1000, 2)},
+        'stalls': sum(1 for t in flushes if t > stall_threshold),
+        'stall_ms': round(sum(t for t in flushes if t > stall_threshold) * 1000, 1),
+        'ui_busy_pct': round(100 * sum(flushes) / elapsed, 1) if elapsed else 0.0,
+        'max_queue_depth': app.log_metrics['max_depth'],
+    }
+
+
+def format_report(result):
+    latency = result['latency_ms']
+    flush = result['flush_ms']
+    offered = f"{result['offered_rate']} lines/s offered" if result['offered_rate'] else "unpaced"
+    return "\n".join([
+        f"{result['producers']} producers, {offered}, level '{result['level']}', {result['widget']} widget",
+        f"  throughput   {result['lines_per_s']:,} lines/s ({result['lines']:,} lines in {result['elapsed_s']} s)",
+        f"  latency      p50 {latency['p50']} ms · p90 {latency['p90']} ms · p99 {latency['p99']} ms · "
+        f"max {latency['max']} ms",
+        f"  UI flushes   {result['flushes']:,} · mean {flush['mean']} ms · p99 {flush['p99']} ms · "
+        f"max {flush['max']} ms · busy {result['ui_busy_pct']}%",
+        f"  stalls       {result['stalls']} over threshold, {result['stall_ms']} ms total · "
+        f"max queue depth {result['max_queue_depth']:,}",
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the log pipeline's throughput and latency")
+    parser.add_argument("--producers", type=int, default=4, help="producer threads calling log_output")
+    parser.add_argument("--rate", type=float, default=2000,
+                        help="lines/s per producer; 0 sends as fast as possible")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds to produce for")
+    parser.add_argument("--count", type=int, help="total lines to send instead of a duration")
+    parser.add_argument("--level", choices=list(MESSAGES), default='info',
+                        help="message level; 'build' lines exercise coalescing")
+    parser.add_argument("--no-coalesce", action="store_true", help="disable collapsing of build lines")
+    parser.add_argument("--max-lines", type=int, default=5000, help="log widget line cap")
+    parser.add_argument("--stall-ms", type=float, default=50, help="flush duration that counts as a stall")
+    parser.add_argument("--real-tk", action="store_true", help="use a real tk.Text widget (needs a display)")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    if args.count is None and args.rate == 0:
+        parser.error("--rate 0 needs --count")
+    try:
+        result = run_benchmark(args.producers, args.rate, args.count, args.duration, args.level,
+                               args.real_tk, args.max_lines, not args.no_coalesce, args.stall_ms)
+    except tk.TclError as e:
+        print(f"Cannot open a Tk window: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(result, indent=2) if args.json else format_report(result))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""Conversion benchmarks over the example scripts with baseline regression tracking.
+
+Converts each workload under each option preset and records build time,
+output size, startup time, CPU time and peak memory:
+
+    cold      fresh PyInstaller cache and work directory, --clean
+    warm      cache and work directory reused from a priming build
+    parallel  all workloads built at once with cold caches
+
+Results are written as JSON. Compared against a baseline, any metric that
+got worse by more than the threshold fails the run with exit code 1.
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --threshold 0.15
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from py2exe_converter_v4 import (  # noqa: E402
+    ProcessResourceSampler, build_pyinstaller_command, get_executable_path, get_path_size,
+    summarize_resources, time_executable, wait_with_rusage,
+)
+
+EXAMPLES_DIR = os.path.join(REPO_ROOT, 'examples')
+
+# Fixed workloads: stdin answers every prompt so console apps exit on their own.
+# GUI apps never exit, so their startup time is not measured. A workload may
+# also carry 'extra_args' passed through to PyInstaller (e.g. --add-data).
+EXAMPLES = {
+    'hello_world': {'script': os.path.join(EXAMPLES_DIR, 'hello_world.py'), 'stdin': "bench\n\n"},
+    'simple_calculator': {'script': os.path.join(EXAMPLES_DIR, 'simple_calculator.py'), 'gui': True},
+    'file_organizer': {'script': os.path.join(EXAMPLES_DIR, 'file_organizer.py'), 'stdin': "quit\n"},
+}
+
+# Conversion option presets, in the same shape as the converter's options dict
+PRESETS = {
+    'onedir': {'onefile': False},
+    'onefile': {'onefile': True},
+    'onefile-noconsole': {'onefile': True, 'noconsole': True},
+}
+
+MODES = ('cold', 'warm', 'parallel')
+
+# Metrics compared against the baseline; all are "lower is better"
+COMPARED_METRICS = ('build_s', 'size_bytes', 'startup_s', 'peak_rss_mb')
+
+# Absolute changes below these are treated as noise whatever the ratio
+MIN_DELTAS = {'build_s': 0.5, 'size_bytes': 64 * 1024, 'startup_s': 0.05, 'peak_rss_mb': 10}
+
+
+def build_workload(name, workload, options, root, cache_dir, clean=True):
+    """Convert one workload and return its measurements.
+
+    root holds the dist, work and spec directories; cache_dir is used as
+    PyInstaller's config directory so cold builds start from an empty cache.
+    """
+    dist_dir = os.path.join(root, 'dist')
+    work_dir = os.path.join(root, 'work')
+    os.makedirs(dist_dir, exist_ok=True)
+    cmd = build_pyinstaller_command(workload['script'], dist_dir, options, clean=clean)
+    cmd[-1:-1] = ["--workpath", work_dir, "--specpath", root, "--noconfirm",
+                  *workload.get('extra_args', ())]
+    env = dict(os.environ, PYINSTALLER_CONFIG_DIR=cache_dir)
+
+    log_path = os.path.join(root, f"{name}.log")
+    with open(log_path, 'w', encoding='utf-8') as log_file:
+        start = time.perf_counter()
+        process = subprocess.Popen(cmd, stdout=log_file, stderr=subprocess.STDOUT, env=env)
+        sampler = ProcessResourceSampler(process.pid).start()
+        rusage = wait_with_rusage(process)
+        resources = summarize_resources(time.perf_counter() - start, rusage, sampler.stop())
+
+    result = {'build_s': resources['wall_s'], 'cpu_user_s': resources['cpu_user_s'],
+              'peak_rss_mb': resources['peak_rss_mb'], 'returncode': process.returncode,
+              'size_bytes': None, 'startup_s': None}
+    if process.returncode != 0:
+        with open(log_path, encoding='utf-8', errors='replace') as f:
+            result['error'] = f.read()[-2000:]
+        return result
+
+    exe_path = get_executable_path(workload['script'], dist_dir, options.get('onefile', False))
+    output = exe_path if options.get('onefile') else os.path.dirname(exe_path)
+    result['size_bytes'] = get_path_size(output)
+    if not workload.get('gui') and not options.get('noconsole'):
+        try:
+            elapsed, returncode = time_executable(exe_path, stdin_text=workload.get('stdin'), timeout=60)
+            if returncode == 0:
+                result['startup_s'] = round(elapsed, 3)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+    return result
+
+
+def median_result(results):
+    """Combine repeated runs of one build into a single result using medians."""
+    merged = dict(results[-1])
+    for key in ('build_s', 'cpu_user_s', 'peak_rss_mb', 'startup_s', 'size_bytes'):
+        values = [r[key] for r in results if r.get(key) is not None]
+        merged[key] = round(statistics.median(values), 3) if values else None
+    merged['runs'] = len(results)
+    return merged
+
+
+def run_suite(workloads, presets, modes, repeat=1, scratch_dir=None, log=print):
+    """Run every workload under every preset and mode; returns {'preset/mode/name': result}."""
+    results = {}
+    scratch = tempfile.mkdtemp(prefix='py2exe_bench_', dir=scratch_dir)
+    try:
+        for preset in presets:
+            options = PRESETS[preset]
+            for mode in modes:
+                runs = {}
+                for run in range(repeat):
+                    run_dir = os.path.join(scratch, preset, mode, str(run))
+                    if mode == 'parallel':
+                        start = time.perf_counter()
+                        with ThreadPoolExecutor(max_workers=len(workloads)) as pool:
+                            futures = {name: pool.submit(build_workload, name, workload, options,
+                                                         os.path.join(run_dir, name),
+                                                         os.path.join(run_dir, name, 'cache'))
+                                       for name, workload in workloads.items()}
+                        for name, future in futures.items():
+                            runs.setdefault(name, []).append(future.result())
+                        runs.setdefault('_batch', []).append(
+                            {'build_s': round(time.perf_counter() - start, 2), 'returncode': 0})
+                        continue
+
+                    for name, workload in workloads.items():
+                        root = os.path.join(run_dir, name)
+                        cache_dir = os.path.join(root, 'cache')
+                        if mode == 'warm':
+                            build_workload(name, workload, options, root, cache_dir)
+                        runs.setdefault(name, []).append(
+                            build_workload(name, workload, options, root, cache_dir, clean=(mode == 'cold')))
+
+                for name, name_runs in runs.items():
+                    key = f"{preset}/{mode}/{name}"
+                    results[key] = median_result(name_runs)
+                    log(format_result(key, results[key]))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return results
+
+
+def format_result(key, result):
+    """Format one benchmark result as a report line."""
+    if result.get('returncode'):
+        return f"  ✗ {key}: build failed (exit {result['returncode']})"
+    text = f"  ✓ {key}: build {result['build_s']:.2f} s"
+    if result.get('size_bytes') is not None:
+        text += f" · {result['size_bytes'] / 1024 / 1024:.1f} MB"
+    if result.get('startup_s') is not None:
+        text += f" · startup {result['startup_s'] * 1000:.0f} ms"
+    if result.get('peak_rss_mb') is not None:
+        text += f" · peak RSS {result['peak_rss_mb']:.0f} MB"
+    return text
+
+
+def get_environment():
+    """Describe the machine and toolchain, so baselines from different setups are not mixed up."""
+    try:
+        pyinstaller = subprocess.run(["pyinstaller", "--version"], capture_output=True,
+                                     text=True).stdout.strip()
+    except OSError:
+        pyinstaller = None
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'machine': platform.machine(), 'cpu_count': os.cpu_count(), 'pyinstaller': pyinstaller}
+
+
+def compare_results(results, baseline, threshold, min_deltas=MIN_DELTAS):
+    """Return [(key, metric, baseline value, current value, change ratio)] of regressions."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None or new - old < min_deltas.get(metric, 0):
+                continue
+            change = new / old - 1
+            if change > threshold:
+                regressions.append((key, metric, old, new, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark conversions of the example scripts")
+    parser.add_argument("--examples", nargs='+', choices=list(EXAMPLES), default=list(EXAMPLES),
+                        help="workloads to convert")
+    parser.add_argument("--presets", nargs='+', choices=list(PRESETS), default=list(PRESETS),
+                        help="option presets to convert under")
+    parser.add_argument("--modes", nargs='+', choices=MODES, default=list(MODES), help="cache modes to run")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per build; medians are reported")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this results JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown that counts as a regression (default 0.10 = 10%%)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="store the results as the new baseline")
+    parser.add_argument("--scratch-dir", help="directory for build output (default: system temp)")
+    args = parser.parse_args(argv)
+
+    if shutil.which("pyinstaller") is None:
+        print("PyInstaller is not installed: pip install pyinstaller", file=sys.stderr)
+        return 2
+
+    workloads = {name: EXAMPLES[name] for name in args.examples}
+    print(f"Benchmarking {len(workloads)} workloads × {len(args.presets)} presets × "
+          f"{len(args.modes)} modes, {args.repeat} run(s) each")
+    report = {'created': datetime.now().isoformat(timespec='seconds'), 'environment': get_environment(),
+              'results': run_suite(workloads, args.presets, args.modes, args.repeat, args.scratch_dir)}
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"Results written to {path}")
+
+    failed = [key for key, result in report['results'].items() if result.get('returncode')]
+    if failed:
+        print(f"{len(failed)} build(s) failed: {', '.join(failed)}", file=sys.stderr)
+        return 2
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('environment', {}).get('platform') != report['environment']['platform']:
+            print("Warning: the baseline was recorded on a different platform", file=sys.stderr)
+        regressions = compare_results(report['results'], baseline.get('results', {}), args.threshold)
+        for key, metric, old, new, change in regressions:
+            print(f"  REGRESSION {key} {metric}: {old} → {new} (+{change:.0%})")
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}", file=sys.stderr)
+            return 1
+        print(f"No regressions above {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""Build-scaling benchmark over synthetic projects, charted with Pillow.
+
+Generates projects of increasing size with synthetic_project.py and converts
+batches of their entry scripts the way the converter does: one after
+another, sharing one PyInstaller cache that starts cold. Batch time, time per
+build, peak memory and output size are recorded per (project size, batch
+size) point and plotted against project size, one line per batch size.
+
+    python benchmarks/run_scaling.py --modules 10 100 500 2000 --batch-sizes 1 4 8 \\
+        --output scaling.json --chart scaling.png
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from PIL import Image, ImageDraw
+
+# The sibling benchmark modules are importable whatever the working directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from run_benchmarks import PRESETS, build_workload, format_result  # noqa: E402
+from synthetic_project import generate_project, project_workloads  # noqa: E402
+
+SERIES_COLORS = ['#4a9eff', '#ff6b6b', '#51cf66', '#ffa94d', '#cc5de8', '#22b8cf', '#fcc419']
+
+
+def run_batch(workloads, options, root):
+    """Convert workloads one after another with a shared cache; returns the batch point.
+
+    Only the first build passes --clean, so the cache starts cold and warms
+    up over the batch, as it does in the converter.
+    """
+    cache_dir = os.path.join(root, 'cache')
+    start = time.perf_counter()
+    results = {name: build_workload(name, workload, options, os.path.join(root, name), cache_dir,
+                                    clean=(index == 0))
+               for index, (name, workload) in enumerate(workloads.items())}
+    batch_s = time.perf_counter() - start
+
+    failed = [name for name, result in results.items() if result.get('returncode')]
+    startups = [r['startup_s'] for r in results.values() if r.get('startup_s') is not None]
+    return {'batch_s': round(batch_s, 2),
+            'build_s_mean': round(statistics.mean(r['build_s'] for r in results.values()), 2),
+            'peak_rss_mb': max(r['peak_rss_mb'] or 0 for r in results.values()),
+            'size_bytes': max(r['size_bytes'] or 0 for r in results.values()),
+            'startup_s': round(statistics.median(startups), 3) if startups else None,
+            'failed': failed, 'builds': results}
+
+
+def run_scaling(module_counts, batch_sizes, options, depth=3, data_files=10, scratch_dir=None,
+                log=print):
+    """Run every (project size, batch size) combination and return the list of points."""
+    points = []
+    scratch = tempfile.mkdtemp(prefix='py2exe_scaling_', dir=scratch_dir)
+    try:
+        for modules in module_counts:
+            project = generate_project(os.path.join(scratch, f"project_{modules}"), modules, depth,
+                                       data_files, entry_scripts=max(batch_sizes))
+            workloads = project_workloads(project)
+            for batch_size in batch_sizes:
+                batch = dict(list(workloads.items())[:batch_size])
+                point = run_batch(batch, options, os.path.join(scratch, f"build_{modules}_{batch_size}"))
+                point.update(modules=modules, batch_size=batch_size)
+                points.append(point)
+                log(format_result(f"{modules} modules × {batch_size} scripts",
+                                  {'build_s': point['batch_s'], 'size_bytes': point['size_bytes'],
+                                   'startup_s': point['startup_s'], 'peak_rss_mb': point['peak_rss_mb'],
+                                   'returncode': 1 if point['failed'] else 0}))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return points
+
+
+def draw_panel(draw, box, points, metric, title):
+    """Draw one line chart of metric against module count, one series per batch size."""
+    left, top, right, bottom = box
+    plot = (left + 60, top + 30, right - 20, bottom - 40)
+    draw.text((left + 60, top + 5), title, fill='#e0e0e0')
+    draw.rectangle(plot, outline='#555555')
+
+    module_counts = sorted({p['modules'] for p in points})
+    values = [p[metric] for p in points if p.get(metric) is not None]
+    max_value = max(values, default=0) * 1.1 or 1
+
+    def x_of(modules):
+        # Evenly spaced categories: project sizes usually grow geometrically
+        if len(module_counts) == 1:
+            return (plot[0] + plot[2]) / 2
+        return plot[0] + (plot[2] - plot[0]) * module_counts.index(modules) / (len(module_counts) - 1)
+
+    def y_of(value):
+        return plot[3] - (plot[3] - plot[1]) * value / max_value
+
+    for tick in range(5):
+        value = max_value * tick / 4
+        y = y_of(value)
+        draw.line((plot[0], y, plot[2], y), fill='#333333')
+        draw.text((left + 5, y - 6), f"{value:.1f}", fill='#aaaaaa')
+    for modules in module_counts:
+        draw.text((x_of(modules) - 10, plot[3] + 8), str(modules), fill='#aaaaaa')
+    draw.text(((plot[0] + plot[2]) / 2 - 30, bottom - 18), "modules", fill='#aaaaaa')
+
+    batch_sizes = sorted({p['batch_size'] for p in points})
+    for index, batch_size in enumerate(batch_sizes):
+        color = SERIES_COLORS[index % len(SERIES_COLORS)]
+        series = [(x_of(p['modules']), y_of(p[metric]))
+                  for p in sorted(points, key=lambda p: p['modules'])
+                  if p['batch_size'] == batch_size and p.get(metric) is not None]
+        if len(series) > 1:
+            draw.line(series, fill=color, width=2)
+        for x, y in series:
+            draw.ellipse((x - 3, y - 3, x + 3, y + 3), fill=color)
+        legend_x = plot[2] - 100 * (len(batch_sizes) - index)
+        draw.rectangle((legend_x, top + 8, legend_x + 10, top + 18), fill=color)
+        draw.text((legend_x + 16, top + 7), f"batch of {batch_size}", fill='#e0e0e0')
+
+
+def draw_chart(points, path, width=1200, height=460):
+    """Save a PNG with batch time and peak memory plotted against project size."""
+    image = Image.new('RGB', (width, height), '#1e1e1e')
+    draw = ImageDraw.Draw(image)
+    half = width // 2
+    draw_panel(draw, (0, 0, half, height), points, 'batch_s', "Batch conversion time (s)")
+    draw_panel(draw, (half, 0, width, height), points, 'peak_rss_mb', "Peak build memory (MB)")
+    image.save(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Chart conversion time and memory against project size")
+    parser.add_argument("--modules", type=int, nargs='+', default=[10, 100, 500],
+                        help="project sizes in generated modules")
+    parser.add_argument("--batch-sizes", type=int, nargs='+', default=[1, 4],
+                        help="numbers of entry scripts converted per batch")
+    parser.add_argument("--depth", type=int, default=3, help="levels in each project's import tree")
+    parser.add_argument("--data-files", type=int, default=10, help="data files bundled with each project")
+    parser.add_argument("--preset", choices=list(PRESETS), default='onedir', help="option preset")
+    parser.add_argument("--output", help="write the points to this JSON file")
+    parser.add_argument("--chart", default="scaling.png", help="PNG chart to write")
+    parser.add_argument("--scratch-dir", help="directory for generated projects and builds")
+    args = parser.parse_args(argv)
+
+    if shutil.which("pyinstaller") is None:
+        print("PyInstaller is not installed: pip install pyinstaller", file=sys.stderr)
+        return 2
+
+    points = run_scaling(args.modules, args.batch_sizes, PRESETS[args.preset], args.depth,
+                         args.data_files, args.scratch_dir)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(points, f, indent=2)
+        print(f"Results written to {args.output}")
+    draw_chart(points, args.chart)
+    print(f"Chart written to {args.chart}")
+    return 2 if any(p['failed'] for p in points) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
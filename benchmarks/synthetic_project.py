@@ -0,0 +1,174 @@
+"""Generate synthetic Python projects of configurable size for build-scaling benchmarks.
+
+A project is a package of generated modules arranged in import levels (each
+module imports a few modules of the next level, down to the configured
+depth), a folder of data files, and any number of entry scripts. Every entry
+script imports the whole package, reads the data files and exits with 0, so
+its startup time can be measured like the examples.
+
+    python benchmarks/synthetic_project.py out/project --modules 200 --depth 4 --entry-scripts 3
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+PACKAGE = 'synth_pkg'
+DATA_DIR = 'data'
+
+MODULE_TEMPLATE = '''"""Generated module {name} (level {level})."""
+{imports}
+
+CONSTANTS = {constants!r}
+
+
+class {class_name}:
+    """Generated class with a little state and behaviour."""
+
+    def __init__(self, seed={seed}):
+        self.values = [seed * i for i in range({width})]
+
+    def total(self):
+        return sum(self.values)
+
+{functions}
+
+def checksum():
+    return {class_name}().total() + sum(CONSTANTS){child_sums}
+'''
+
+FUNCTION_TEMPLATE = '''def function_{index}(value):
+    result = value
+    for step in range({steps}):
+        result = (result * 31 + step) % 1000003
+    return result
+
+'''
+
+ENTRY_TEMPLATE = '''"""Generated entry script {index} of a synthetic benchmark project."""
+import os
+import sys
+
+from {package} import checksum
+
+
+def data_dir():
+    base = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, {data_dir!r})
+
+
+def main():
+    total = checksum()
+    directory = data_dir()
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            with open(os.path.join(directory, name), 'rb') as f:
+                total += len(f.read())
+    print(f"entry {index}: checksum {{total}}")
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+def module_levels(modules, depth):
+    """Split module indices into depth levels, smallest first, so imports fan out downward."""
+    depth = max(1, min(depth, modules))
+    weights = [2 ** level for level in range(depth)]
+    # One module per level, the rest shared out by weight; rounding leftovers go to the deepest level
+    spare = modules - depth
+    counts = [1 + spare * weight // sum(weights) for weight in weights]
+    counts[-1] += modules - sum(counts)
+    assert sum(counts) == modules, (modules, depth, counts)
+    levels, start = [], 0
+    for count in counts:
+        levels.append(list(range(start, start + count)))
+        start += count
+    return [level for level in levels if level]
+
+
+def generate_project(root, modules=50, depth=3, data_files=10, data_size=4096, entry_scripts=1,
+                     functions_per_module=5, seed=0):
+    """Write a synthetic project under root and return its description.
+
+    The returned dict lists the entry scripts and the PyInstaller arguments
+    needed to bundle the data files, ready to be used as benchmark workloads.
+    """
+    rng = random.Random(seed)
+    package_dir = os.path.join(root, PACKAGE)
+    data_dir = os.path.join(root, DATA_DIR)
+    os.makedirs(package_dir, exist_ok=True)
+    os.makedirs(data_dir, exist_ok=True)
+
+    levels = module_levels(modules, depth)
+    for level_index, level in enumerate(levels):
+        next_level = levels[level_index + 1] if level_index + 1 < len(levels) else []
+        for position, index in enumerate(level):
+            # Each child is imported by exactly one parent, so every module is reachable
+            children = next_level[position::len(level)]
+            name = f"mod_{index:05d}"
+            source = MODULE_TEMPLATE.format(
+                name=name, level=level_index,
+                imports="\n".join(f"from . import mod_{child:05d}" for child in children),
+                constants=[rng.randrange(1000) for _ in range(8)],
+                class_name=f"Model{index}", seed=rng.randrange(1, 100), width=rng.randrange(4, 16),
+                functions="".join(FUNCTION_TEMPLATE.format(index=i, steps=rng.randrange(2, 10))
+                                  for i in range(functions_per_module)),
+                child_sums="".join(f" + mod_{child:05d}.checksum()" for child in children))
+            with open(os.path.join(package_dir, f"{name}.py"), 'w', encoding='utf-8') as f:
+                f.write(source)
+
+    with open(os.path.join(package_dir, '__init__.py'), 'w', encoding='utf-8') as f:
+        f.write('"""Generated benchmark package."""\n')
+        f.write("".join(f"from . import mod_{index:05d}\n" for index in levels[0]))
+        f.write("\n\ndef checksum():\n    return 0" +
+                "".join(f" + mod_{index:05d}.checksum()" for index in levels[0]) + "\n")
+
+    for index in range(data_files):
+        content = rng.getrandbits(8 * data_size).to_bytes(data_size, 'little') if data_size else b''
+        with open(os.path.join(data_dir, f"data_{index:05d}.bin"), 'wb') as f:
+            f.write(content)
+
+    scripts = []
+    for index in range(entry_scripts):
+        script = os.path.join(root, f"entry_{index:03d}.py")
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write(ENTRY_TEMPLATE.format(index=index, package=PACKAGE, data_dir=DATA_DIR))
+        scripts.append(script)
+
+    extra_args = ["--paths", root]
+    if data_files:
+        extra_args += ["--add-data", f"{data_dir}{os.pathsep}{DATA_DIR}"]
+    return {'root': root, 'modules': modules, 'depth': len(levels), 'data_files': data_files,
+            'data_size': data_size, 'scripts': scripts, 'extra_args': extra_args}
+
+
+def project_workloads(project):
+    """Return benchmark workloads (as in run_benchmarks.EXAMPLES) for a generated project."""
+    return {os.path.splitext(os.path.basename(script))[0]: {'script': script,
+                                                            'extra_args': project['extra_args']}
+            for script in project['scripts']}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic project for build benchmarks")
+    parser.add_argument("root", help="directory to write the project to")
+    parser.add_argument("--modules", type=int, default=50, help="number of generated modules")
+    parser.add_argument("--depth", type=int, default=3, help="levels in the import tree")
+    parser.add_argument("--data-files", type=int, default=10, help="number of bundled data files")
+    parser.add_argument("--data-size", type=int, default=4096, help="bytes per data file")
+    parser.add_argument("--entry-scripts", type=int, default=1, help="number of entry scripts")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for generated content")
+    args = parser.parse_args(argv)
+
+    project = generate_project(args.root, args.modules, args.depth, args.data_files, args.data_size,
+                               args.entry_scripts, seed=args.seed)
+    print(json.dumps(project, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
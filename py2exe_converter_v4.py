@@ -7,13 +7,22 @@ import threading
 from PIL import Image, ImageTk, ImageDraw
 import json
 import weakref
-from collections import OrderedDict
+from array import array
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
+import fnmatch
+import io
 import math
 import platform
 import queue
-import weakref
+import re
+import sqlite3
+import tempfile
+import time
+import traceback
 
 class Tooltip:
     """Enhanced tooltip for tkinter widgets."""
@@ -51,9 +60,2105 @@ try:
 except ImportError:
     EMBEDDED_DOCS_AVAILABLE = False
 
+# Environment variable read by the import-recording hook. When set, the traced
+# process dumps the names in sys.modules to that path as JSON on exit.
+TRACE_IMPORTS_ENV = "PY2EXE_TRACE_IMPORTS"
+
+IMPORT_TRACE_HOOK = f'''import atexit, os, sys
+_trace_out = os.environ.get({TRACE_IMPORTS_ENV!r})
+if _trace_out:
+    def _dump_imported_modules():
+        names = sorted(sys.modules)
+        import json
+        with open(_trace_out, "w", encoding="utf-8") as f:
+            json.dump(names, f)
+    atexit.register(_dump_imported_modules)
+'''
+
+# Bootstrap used to run a plain script under the import-recording hook
+IMPORT_TRACE_BOOTSTRAP = IMPORT_TRACE_HOOK + '''import runpy
+sys.argv = sys.argv[1:]
+runpy.run_path(sys.argv[0], run_name="__main__")
+'''
+
+# Top-level modules that must never be offered as excludes, even if unused
+TRACE_PROTECTED_MODULES = frozenset({'encodings', 'pyimod01_archive', 'pyimod02_importers',
+                                     'pyimod03_ctypes', 'pyimod04_pywin32', 'pyi_rth_inspect'})
+
+# Matches bundled module entries in PyInstaller's Analysis TOC files
+TOC_MODULE_RE = re.compile(r"\(\s*'([\w.]+)',\s*(?:r?'[^']*'|None),\s*'(?:PYMODULE|EXTENSION)'\s*\)")
+
+
+def build_pyinstaller_command(script, output_dir, options, excludes=(), runtime_hooks=(), clean=True):
+    """Build the PyInstaller command line for a script from a conversion options dict."""
+    cmd = ["pyinstaller"]
+
+    if options.get('onefile'):
+        cmd.append("--onefile")
+    if options.get('noconsole'):
+        cmd.append("--noconsole")
+    if options.get('debug'):
+        cmd.append("--debug")
+
+    icon_file = options.get('icon')
+    if icon_file and os.path.exists(icon_file):
+        cmd.extend(["--icon", icon_file])
+
+    for hidden in options.get('hidden_imports', ()):
+        cmd.extend(["--hidden-import", hidden])
+    for module in excludes:
+        cmd.extend(["--exclude-module", module])
+    for hook in runtime_hooks:
+        cmd.extend(["--runtime-hook", hook])
+
+    cmd.extend(["--distpath", output_dir])
+    if clean:
+        cmd.append("--clean")
+    cmd.append(script)
+    return cmd
+
+
+def get_executable_path(script, output_dir, onefile=True):
+    """Return where PyInstaller places the executable built from a script."""
+    name = os.path.splitext(os.path.basename(script))[0]
+    exe_name = name + ('.exe' if platform.system() == 'Windows' else '')
+    if onefile:
+        return os.path.join(output_dir, exe_name)
+    return os.path.join(output_dir, name, exe_name)
+
+
+def get_pyinstaller_work_dir(script):
+    """Return PyInstaller's default work directory for a script (./build/<name>)."""
+    name = os.path.splitext(os.path.basename(script))[0]
+    return os.path.join(os.getcwd(), 'build', name)
+
+
+def get_path_size(path):
+    """Return the size in bytes of a file, or of all files below a directory."""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+    return total
+
+
+def read_bundled_modules(work_dir):
+    """Read the module names PyInstaller's analysis put in the bundle.
+
+    Parses the Analysis TOC files in the work directory; each bundled module
+    appears there as a ('name', 'path', 'PYMODULE'|'EXTENSION') entry.
+    """
+    modules = set()
+    try:
+        with os.scandir(work_dir) as it:
+            toc_files = [e.path for e in it if e.name.startswith('Analysis') and e.name.endswith('.toc')]
+    except OSError:
+        return modules
+
+    for toc_file in toc_files:
+        with open(toc_file, 'r', encoding='utf-8', errors='replace') as f:
+            modules.update(TOC_MODULE_RE.findall(f.read()))
+    return modules
+
+
+def run_import_trace(target, args=(), stdin_text=None, timeout=120, frozen=False):
+    """Run a script or traced executable and return (imported modules, elapsed seconds, returncode).
+
+    Scripts run under IMPORT_TRACE_BOOTSTRAP; executables must have been built
+    with IMPORT_TRACE_HOOK as a runtime hook so they honour TRACE_IMPORTS_ENV.
+    """
+    fd, trace_file = tempfile.mkstemp(prefix="py2exe_trace_", suffix=".json")
+    os.close(fd)
+    env = dict(os.environ, **{TRACE_IMPORTS_ENV: trace_file})
+    if frozen:
+        cmd = [target, *args]
+    else:
+        cmd = [get_target_interpreter(), "-c", IMPORT_TRACE_BOOTSTRAP, target, *args]
+
+    try:
+        start = time.perf_counter()
+        result = subprocess.run(cmd, input=stdin_text or "", capture_output=True, text=True,
+                                timeout=timeout, env=env,
+                                cwd=os.path.dirname(os.path.abspath(target)))
+        elapsed = time.perf_counter() - start
+        try:
+            with open(trace_file, 'r', encoding='utf-8') as f:
+                modules = set(json.load(f))
+        except (OSError, ValueError):
+            modules = set()
+        return modules, elapsed, result.returncode
+    finally:
+        try:
+            os.remove(trace_file)
+        except OSError:
+            pass
+
+
+def time_executable(exe_path, args=(), stdin_text=None, timeout=120):
+    """Run an executable to completion and return (elapsed seconds, returncode)."""
+    start = time.perf_counter()
+    result = subprocess.run([exe_path, *args], input=stdin_text or "", capture_output=True,
+                            text=True, timeout=timeout, cwd=os.path.dirname(os.path.abspath(exe_path)))
+    return time.perf_counter() - start, result.returncode
+
+
+def compute_trace_excludes(bundled_modules, traced_modules):
+    """Return sorted top-level packages that were bundled but never imported at runtime."""
+    bundled_top = {name.split('.')[0] for name in bundled_modules}
+    traced_top = {name.split('.')[0] for name in traced_modules}
+    return sorted(name for name in bundled_top - traced_top
+                  if name not in TRACE_PROTECTED_MODULES and not name.startswith(('pyimod', 'pyi_')))
+
+
+MISSING_MODULE_RE = re.compile(r"(?:ModuleNotFoundError|ImportError): No module named '?([\w.]+)'?")
+
+
+def smoke_test_executable(exe_path, args=(), timeout=10):
+    """Launch a built executable and report whether it started cleanly.
+
+    An executable passes if it exits with code 0, or is still running at the
+    timeout without having printed a traceback (e.g. GUI or server apps).
+    """
+    result = {'passed': False, 'returncode': None, 'timed_out': False,
+              'traceback': '', 'missing_modules': []}
+    try:
+        completed = subprocess.run([exe_path, *args], capture_output=True, text=True, timeout=timeout,
+                                   stdin=subprocess.DEVNULL, cwd=os.path.dirname(os.path.abspath(exe_path)))
+        result['returncode'] = completed.returncode
+        stderr = completed.stderr or ''
+    except subprocess.TimeoutExpired as e:
+        result['timed_out'] = True
+        stderr = e.stderr or ''
+        if isinstance(stderr, bytes):
+            stderr = stderr.decode('utf-8', errors='replace')
+    except OSError as e:
+        result['traceback'] = str(e)
+        return result
+
+    tb_start = stderr.find('Traceback (most recent call last)')
+    if tb_start != -1:
+        result['traceback'] = stderr[tb_start:].strip()
+    result['missing_modules'] = list(OrderedDict.fromkeys(MISSING_MODULE_RE.findall(stderr)))
+    result['passed'] = (result['returncode'] == 0 if not result['timed_out']
+                        else not result['traceback'])
+    return result
+
+
+WARN_LINE_RE = re.compile(r"^missing module named (.+?) - imported by (.+)$")
+WARN_IMPORTER_RE = re.compile(r"([\w.]+) \(([^)]*)\)")
+
+# Platform-specific modules PyInstaller routinely reports as missing on the
+# other platforms; stdlib names are also filtered via sys.stdlib_module_names.
+HARMLESS_MISSING_MODULES = frozenset({
+    'pwd', 'grp', 'posix', 'nt', 'msvcrt', 'winreg', '_winreg', '_winapi', '_overlapped',
+    '_scproxy', '_osx_support', 'termios', 'fcntl', 'resource', 'readline', '_curses',
+    'vms_lib', 'java', 'org', 'ce', 'riscos', 'riscosenviron', 'riscospath', 'os2', 'os2emxpath',
+    '_posixsubprocess', '_posixshmem', '_frozen_importlib', '_frozen_importlib_external',
+    '__builtin__', '_dummy_threading', '_wmi', 'win32api', 'win32con', 'win32pdh',
+    'pywintypes', 'winerror', 'AppKit', 'Foundation', 'pyimod02_importers', '_typeshed',
+})
+STDLIB_MODULE_NAMES = frozenset(getattr(sys, 'stdlib_module_names', ()))
+
+
+def parse_warn_file(path):
+    """Parse a PyInstaller warn-<name>.txt file.
+
+    Returns {module: {importer: set(import kinds)}} for every missing module,
+    where kinds are PyInstaller's top-level/conditional/delayed/optional tags.
+    """
+    missing = {}
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            match = WARN_LINE_RE.match(line.strip())
+            if not match:
+                continue
+            module = match.group(1).strip("'")
+            importers = missing.setdefault(module, {})
+            for importer, kinds in WARN_IMPORTER_RE.findall(match.group(2)):
+                importers.setdefault(importer, set()).update(k.strip() for k in kinds.split(','))
+    return missing
+
+
+def is_harmless_missing_module(module):
+    """Return True for missing modules that are platform-specific or stdlib false positives."""
+    top = module.split('.')[0]
+    return top in HARMLESS_MISSING_MODULES or top in STDLIB_MODULE_NAMES
+
+
+class MissingModuleIndex:
+    """Deduplicated index of PyInstaller missing-module warnings across a batch."""
+
+    def __init__(self):
+        self.modules = {}
+
+    def add_warn_file(self, script, path):
+        """Merge a build's warn file into the index. Returns the number of modules read."""
+        missing = parse_warn_file(path)
+        for module, importers in missing.items():
+            entry = self.modules.setdefault(module, {'scripts': set(), 'importers': set(), 'kinds': set(),
+                                                     'unguarded': set()})
+            entry['scripts'].add(os.path.basename(script))
+            entry['importers'].update(importers)
+            for importer, kinds in importers.items():
+                entry['kinds'].update(kinds)
+                # An import tagged optional or conditional is guarded, whatever its other tags
+                if not kinds & {'optional', 'conditional'}:
+                    entry['unguarded'].add(importer)
+        return len(missing)
+
+    def suggestions(self):
+        """Return [(module, entry)] worth adding as hidden imports, most likely first.
+
+        Harmless platform modules are dropped, as are modules whose every
+        importer imports them optionally or conditionally (already guarded by
+        code), e.g. a "delayed, optional" import inside try/except.
+        """
+        ranked = [(module, entry) for module, entry in self.modules.items()
+                  if not is_harmless_missing_module(module) and entry['unguarded']]
+        ranked.sort(key=lambda item: ('top-level' not in item[1]['kinds'],
+                                      -len(item[1]['scripts']), item[0]))
+        return ranked
+
+
+MODULE_INDEX_CACHE = os.path.join(os.path.expanduser("~"), ".py2exe_converter_module_index.json")
+
+# Runs in the target interpreter; lists importable modules without importing them
+MODULE_INDEX_SCRIPT = '''import json, os, pkgutil, sys
+names = set(sys.builtin_module_names)
+def walk(path, prefix, depth):
+    for info in pkgutil.iter_modules(path, prefix):
+        names.add(info.name)
+        finder_path = getattr(info.module_finder, "path", None)
+        if info.ispkg and finder_path and depth < 2:
+            walk([os.path.join(finder_path, info.name.rsplit(".", 1)[-1])], info.name + ".", depth + 1)
+walk(None, "", 0)
+# Namespace packages (directories without __init__.py) are not listed by pkgutil
+for entry in sys.path:
+    try:
+        for name in os.listdir(entry or "."):
+            if name.isidentifier() and name != "__pycache__" and os.path.isdir(os.path.join(entry or ".", name)):
+                names.add(name)
+    except OSError:
+        pass
+print(json.dumps(sorted(names)))
+'''
+
+# Runs in the target interpreter; the authoritative check for names the index does not list
+FIND_SPEC_SCRIPT = '''import importlib.util, sys
+try:
+    found = importlib.util.find_spec(sys.argv[1]) is not None
+except Exception:
+    found = False
+print(found)
+'''
+
+INTERPRETER_PATHS_SCRIPT = "import json, sys; print(json.dumps([sys.version, sys.path]))"
+
+
+def get_target_interpreter():
+    """Return the Python interpreter whose packages PyInstaller will bundle."""
+    if getattr(sys, 'frozen', False):
+        import shutil
+        return shutil.which('python') or shutil.which('python3') or sys.executable
+    return sys.executable
+
+
+class ModuleIndex:
+    """Importable module names of the target interpreter, for hidden import completion.
+
+    Built in a background thread and cached on disk; the cache is keyed by a
+    fingerprint of the interpreter's sys.path directories and their mtimes, so
+    installing or removing a package invalidates it.
+    """
+
+    def __init__(self, python=None, cache_path=MODULE_INDEX_CACHE):
+        self.python = python or get_target_interpreter()
+        self.cache_path = cache_path
+        self.names = []
+        self.name_set = frozenset()
+        self.top_level = []
+        self.ready = threading.Event()
+        self.error = None
+
+    def fingerprint(self):
+        """Fingerprint the interpreter version and its sys.path directory mtimes."""
+        import hashlib
+
+        result = subprocess.run([self.python, "-c", INTERPRETER_PATHS_SCRIPT],
+                                capture_output=True, text=True, check=True, timeout=30)
+        version, paths = json.loads(result.stdout)
+        parts = [self.python, version, MODULE_INDEX_SCRIPT]
+        for path in paths:
+            try:
+                parts.append(f"{path}:{os.stat(path or '.').st_mtime_ns}")
+            except OSError:
+                parts.append(f"{path}:missing")
+        return hashlib.sha1("\n".join(parts).encode('utf-8')).hexdigest()
+
+    def build(self):
+        """Load the index from cache or rebuild it. Safe to run in a background thread."""
+        try:
+            fingerprint = self.fingerprint()
+            names = None
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                if cached.get('fingerprint') == fingerprint:
+                    names = cached['modules']
+            except (OSError, ValueError, KeyError):
+                pass
+
+            if names is None:
+                result = subprocess.run([self.python, "-c", MODULE_INDEX_SCRIPT],
+                                        capture_output=True, text=True, check=True, timeout=300)
+                names = json.loads(result.stdout)
+                try:
+                    with open(self.cache_path, 'w', encoding='utf-8') as f:
+                        json.dump({'fingerprint': fingerprint, 'modules': names}, f)
+                except OSError:
+                    pass
+
+            self.names = sorted(names)
+            self.name_set = frozenset(self.names)
+            self.top_level = [name for name in self.names if '.' not in name]
+        except Exception as e:
+            self.error = e
+        finally:
+            self.ready.set()
+
+    def start(self):
+        """Build the index in a daemon thread."""
+        threading.Thread(target=self.build, daemon=True).start()
+        return self
+
+    def is_valid(self, module):
+        """Return False only if module's top-level package is not installed.
+
+        The index lists packages two levels deep and misses aliases such as
+        os.path, so deeper names are assumed valid; use find_spec() to check
+        them. Returns True while the index cannot tell yet.
+        """
+        if not self.ready.is_set() or self.error or not self.names:
+            return True
+        return module in self.name_set or module.split('.')[0] in self.name_set
+
+    def find_spec(self, module):
+        """Ask the target interpreter whether module can be imported; None if it cannot be asked."""
+        try:
+            result = subprocess.run([self.python, "-c", FIND_SPEC_SCRIPT, module],
+                                    capture_output=True, text=True, timeout=30)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return result.stdout.strip() == "True"
+
+    def complete(self, text, limit=10):
+        """Return up to limit names: prefix matches, then substring, then fuzzy matches."""
+        if not self.ready.is_set() or not text:
+            return []
+        import bisect
+
+        start = bisect.bisect_left(self.names, text)
+        matches = []
+        for name in self.names[start:]:
+            if not name.startswith(text) or len(matches) >= limit:
+                break
+            matches.append(name)
+
+        if len(matches) < limit:
+            seen = set(matches)
+            lowered = text.lower()
+            for name in self.names:
+                if lowered in name.lower() and name not in seen:
+                    matches.append(name)
+                    seen.add(name)
+                    if len(matches) >= limit:
+                        break
+
+        if len(matches) < limit:
+            import difflib
+            for name in difflib.get_close_matches(text, self.top_level, n=limit - len(matches), cutoff=0.7):
+                if name not in matches:
+                    matches.append(name)
+        return matches
+
+
+class UIUpdateBus:
+    """Single channel for UI updates posted from worker threads.
+
+    Updates posted under the same key are coalesced (the latest one wins), so a
+    burst of progress or status changes costs one widget update per frame.
+    The Tk loop is only woken when something is pending; registered pumps
+    (such as the log drain) run on every flush and keep it awake while they
+    report remaining work.
+    """
+
+    FRAME_MS = 16
+
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        self._keyed = OrderedDict()
+        self._calls = []
+        self._pumps = []
+        self._scheduled = False
+        self.flushes = 0
+
+    def post(self, key, callback, *args):
+        """Queue callback(*args) under key, replacing any pending update with the same key."""
+        with self._lock:
+            self._keyed[key] = (callback, args)
+            self._keyed.move_to_end(key)
+        self.wake()
+
+    def call(self, callback, *args):
+        """Queue callback(*args) to run exactly once, in posting order (e.g. dialogs)."""
+        with self._lock:
+            self._calls.append((callback, args))
+        self.wake()
+
+    def register_pump(self, pump):
+        """Run pump() on every flush; a truthy return value means it has more work."""
+        self._pumps.append(pump)
+
+    def wake(self, delay_ms=None):
+        """Schedule a flush unless one is already pending. Thread-safe."""
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        try:
+            self.root.after(self.FRAME_MS if delay_ms is None else delay_ms, self._flush)
+        except (RuntimeError, tk.TclError):
+            # The main loop is gone (application shutting down)
+            self._scheduled = False
+
+    def _flush(self):
+        """Run all pending updates and pumps on the Tk thread."""
+        with self._lock:
+            self._scheduled = False
+            keyed = list(self._keyed.values())
+            self._keyed.clear()
+            calls, self._calls = self._calls, []
+        self.flushes += 1
+
+        for callback, args in keyed + calls:
+            try:
+                callback(*args)
+            except tk.TclError:
+                # Target widget was destroyed before the update arrived
+                pass
+
+        busy = False
+        for pump in self._pumps:
+            busy = bool(pump()) or busy
+        if busy:
+            # Backlog left: yield to pending Tk events, then continue
+            self.wake(delay_ms=1)
+
+
+# Directories the icon search never descends into, besides hidden ones
+ICON_SEARCH_SKIP_DIRS = frozenset({'node_modules', 'venv', '.venv', '__pycache__', 'build', 'dist', 'target'})
+
+
+class ParallelDirectoryWalker:
+    """Finds files by listing directories on a bounded pool of threads.
+
+    Each directory listing is a work item: workers take directories from a
+    shared queue, queue the subdirectories they find and hand matching files
+    to the consumer as soon as they are seen. On high-latency filesystems
+    (NFS, SMB) many scandir round-trips are in flight at once instead of one
+    at a time. Hidden directories and ICON_SEARCH_SKIP_DIRS are never entered;
+    ignore_patterns are fnmatch patterns matched against file and directory
+    names. Results arrive in no particular order.
+    """
+
+    def __init__(self, extensions, workers=8, max_depth=None, ignore_patterns=(), skip_dirs=ICON_SEARCH_SKIP_DIRS):
+        self.extensions = tuple(extensions)
+        self.workers = max(1, workers)
+        self.max_depth = max_depth
+        self.skip_dirs = skip_dirs
+        self._ignore = (re.compile("|".join(fnmatch.translate(p.lower()) for p in ignore_patterns)).match
+                        if ignore_patterns else None)
+
+    def walk(self, root, limit, on_directory=None):
+        """Yield up to limit matching file paths below root.
+
+        on_directory() is called (serialized) before each listing; an exception
+        it raises, e.g. TaskCancelled, stops the walk and is re-raised here.
+        Closing the generator early stops the workers.
+        """
+        work = queue.Queue()
+        results = queue.Queue()
+        taken = threading.Event()
+        stop = threading.Event()
+        lock = threading.Lock()
+        pending = [1]
+        done = object()
+
+        def worker():
+            while not stop.is_set():
+                try:
+                    directory, depth = work.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                try:
+                    if on_directory is not None:
+                        with lock:
+                            on_directory()
+                    # Performance Optimization: Pause while a hit waits to be taken. On fast local
+                    # disks listing is CPU-bound, and workers holding the GIL would otherwise keep
+                    # the consumer from seeing the first hits until the walk is over.
+                    if not results.empty():
+                        taken.wait(0.005)
+                    self._list(directory, depth, work, results, taken, stop, lock, pending)
+                except BaseException as e:
+                    results.put(e)
+                    stop.set()
+                finally:
+                    with lock:
+                        pending[0] -= 1
+                        finished = pending[0] == 0
+                    if finished:
+                        results.put(done)
+
+        work.put((root, 0))
+        threads = [threading.Thread(target=worker, name=f"DirectoryWalker-{i}", daemon=True)
+                   for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        count = 0
+        try:
+            while count < limit:
+                item = results.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                taken.set()
+                yield item
+                count += 1
+        finally:
+            stop.set()
+
+    def accepts(self, root, path):
+        """Return whether a walk from root would report path, judged by max_depth and ignore_patterns.
+
+        Used to filter results that come from elsewhere (the icon index) through the same rules.
+        """
+        parts = os.path.relpath(path, root).lower().split(os.sep)
+        if self.max_depth is not None and len(parts) - 1 > self.max_depth:
+            return False
+        return self._ignore is None or not any(self._ignore(part) for part in parts)
+
+    def _list(self, directory, depth, work, results, taken, stop, lock, pending):
+        """List one directory: queue its subdirectories and report its matching files."""
+        descend = self.max_depth is None or depth < self.max_depth
+        ignore = self._ignore
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if stop.is_set():
+                        return
+                    name = entry.name.lower()
+                    if ignore is not None and ignore(name):
+                        continue
+                    try:
+                        if entry.is_file():
+                            if name.endswith(self.extensions):
+                                taken.clear()
+                                results.put(entry.path)
+                        elif descend and entry.is_dir():
+                            if name.startswith('.') or name in self.skip_dirs:
+                                continue
+                            with lock:
+                                pending[0] += 1
+                            work.put((entry.path, depth + 1))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+
+ICON_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".py2exe_converter_icon_index.sqlite3")
+
+ICON_INDEX_VERSION = 2
+
+# Every path column except icons.path holds an _index_key; icons.path is the path as found
+ICON_INDEX_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS roots (root TEXT PRIMARY KEY, refreshed REAL);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, parent TEXT, mtime_ns INTEGER);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent);
+CREATE TABLE IF NOT EXISTS icons (key TEXT PRIMARY KEY, path TEXT, dir TEXT, ext TEXT, size INTEGER,
+                                  mtime_ns INTEGER, width INTEGER, height INTEGER,
+                                  frames INTEGER, hash TEXT);
+CREATE INDEX IF NOT EXISTS icons_dir ON icons (dir);
+'''
+
+
+def _index_key(path):
+    """Normalize a path for the icon index, so C:\\Icons and c:\\icons are one entry on Windows."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _path_range(directory):
+    """Return (low, high) bounds that select every path below directory in an ordered index."""
+    prefix = os.path.join(directory, '')
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class IconIndex:
+    """Persistent SQLite index of the icon files below searched directories.
+
+    Stores the path, size, mtime, dimensions, frame count and content hash of
+    every icon. A refresh lists only directories whose mtime changed since
+    the last visit; unchanged directories are skipped and their known
+    subdirectories are checked with one stat each. Editing a file in place
+    does not change its directory's mtime, so such edits are picked up when
+    the directory next changes or when the root is rebuilt.
+
+    Writers take _write_lock for one directory's changes at a time, so
+    add_files never waits for a whole refresh.
+    """
+
+    HASH_CHUNK = 1 << 20
+
+    def __init__(self, path=ICON_INDEX_PATH):
+        self.path = path
+        self._write_lock = threading.Lock()
+        try:
+            self._create_schema()
+        except sqlite3.Error:
+            # Unusable index file (e.g. corrupt): start over
+            for suffix in ('', '-wal', '-shm'):
+                try:
+                    os.remove(self.path + suffix)
+                except OSError:
+                    pass
+            self._create_schema()
+
+    def _create_schema(self):
+        db = self._connect()
+        try:
+            if db.execute("PRAGMA user_version").fetchone()[0] != ICON_INDEX_VERSION:
+                # Older layout: the index is only a cache, so start it over
+                db.executescript("DROP TABLE IF EXISTS roots; DROP TABLE IF EXISTS dirs; "
+                                 "DROP TABLE IF EXISTS icons;")
+            db.executescript(ICON_INDEX_SCHEMA)
+            db.execute(f"PRAGMA user_version = {ICON_INDEX_VERSION}")
+        finally:
+            db.close()
+
+    def _connect(self):
+        # One short-lived connection per call keeps the index usable from any thread
+        db = sqlite3.connect(self.path, timeout=10)
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    def covering_root(self, directory):
+        """Return the indexed root that directory lies in, or None if it was never indexed."""
+        directory = _index_key(directory)
+        db = self._connect()
+        try:
+            roots = [row[0] for row in db.execute("SELECT root FROM roots")]
+        finally:
+            db.close()
+        for root in sorted(roots, key=len, reverse=True):
+            if directory == root or directory.startswith(os.path.join(root, '')):
+                return root
+        return None
+
+    def search(self, directory, extensions=None, limit=20, accept=None):
+        """Return up to limit indexed icon paths below directory, in path order.
+
+        accept(path) optionally filters the rows, e.g. ParallelDirectoryWalker.accepts.
+        """
+        low, high = _path_range(_index_key(directory))
+        query = "SELECT path FROM icons WHERE key >= ? AND key < ?"
+        params = [low, high]
+        if extensions:
+            query += f" AND ext IN ({','.join('?' * len(extensions))})"
+            params.extend(extensions)
+        query += " ORDER BY key"
+        if accept is None:
+            query += " LIMIT ?"
+            params.append(limit)
+        db = self._connect()
+        try:
+            rows = (row[0] for row in db.execute(query, params))
+            if accept is not None:
+                rows = (path for path in rows if accept(path))
+            return list(islice(rows, limit))
+        finally:
+            db.close()
+
+    def details(self, path):
+        """Return the indexed metadata of one icon as a dict, or None."""
+        db = self._connect()
+        try:
+            row = db.execute("SELECT size, mtime_ns, width, height, frames, hash FROM icons WHERE key = ?",
+                             (_index_key(path),)).fetchone()
+        finally:
+            db.close()
+        if row is None:
+            return None
+        return dict(zip(('size', 'mtime_ns', 'width', 'height', 'frames', 'hash'), row))
+
+    @classmethod
+    def read_icon(cls, path, stat=None):
+        """Return the index row values (size, mtime_ns, width, height, frames, hash) of a file."""
+        import hashlib
+
+        stat = stat or os.stat(path)
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(cls.HASH_CHUNK), b''):
+                digest.update(chunk)
+        try:
+            with Image.open(path) as img:
+                width, height = img.size
+                frames = getattr(img, 'n_frames', 1)
+        except Exception:
+            width = height = frames = None
+        return stat.st_size, stat.st_mtime_ns, width, height, frames, digest.hexdigest()
+
+    def add_files(self, paths):
+        """Index (or re-index) specific files, e.g. icons the app just created."""
+        rows = []
+        for path in paths:
+            path = os.path.abspath(path)
+            key = _index_key(path)
+            try:
+                rows.append((key, path, os.path.dirname(key), os.path.splitext(key)[1],
+                             *self.read_icon(path)))
+            except OSError:
+                continue
+        with self._write_lock:
+            db = self._connect()
+            try:
+                db.executemany("INSERT OR REPLACE INTO icons VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                db.commit()
+            finally:
+                db.close()
+
+    def refresh(self, root, extensions, token=None, progress=None):
+        """Bring the index for root up to date; returns a dict of what changed.
+
+        token is an optional CancelToken, checked between directories. A
+        cancelled refresh leaves a consistent index: every directory is
+        committed together with its subdirectories, and the root is only
+        marked as indexed once the whole tree was visited.
+        progress(dirs_visited, icons_seen) is called every 200 directories.
+        """
+        root = os.path.abspath(root)
+        stats = {'dirs_listed': 0, 'dirs_unchanged': 0, 'added': 0, 'updated': 0, 'removed': 0}
+        db = self._connect()
+        try:
+            pending = [root]
+            visited = 0
+            while pending:
+                if token is not None:
+                    token.check()
+                directory = pending.pop()
+                key = _index_key(directory)
+                visited += 1
+                if progress and visited % 200 == 0:
+                    progress(visited, stats['added'] + stats['updated'])
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except OSError:
+                    with self._write_lock:
+                        self._forget_tree(db, key, stats)
+                        db.commit()
+                    continue
+
+                known = db.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (key,)).fetchone()
+                if known and known[0] == mtime_ns:
+                    # Listing unchanged: no files added, removed or renamed here
+                    stats['dirs_unchanged'] += 1
+                    pending.extend(row[0] for row in db.execute("SELECT path FROM dirs WHERE parent = ?", (key,)))
+                    continue
+
+                stats['dirs_listed'] += 1
+                pending.extend(self._refresh_directory(db, directory, key, mtime_ns, extensions, stats))
+
+            with self._write_lock:
+                db.execute("INSERT OR REPLACE INTO roots VALUES (?, ?)", (_index_key(root), time.time()))
+                db.commit()
+        finally:
+            db.close()
+        return stats
+
+    def _refresh_directory(self, db, directory, key, mtime_ns, extensions, stats):
+        """Re-list one directory, commit its icons and subdirectories and return the subdirectories."""
+        subdirs = []
+        icons = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            name = entry.name.lower()
+                            if not name.startswith('.') and name not in ICON_SEARCH_SKIP_DIRS:
+                                subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(extensions):
+                            icons[_index_key(entry.path)] = (entry.path, entry.stat())
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+        # Performance Optimization: Hash and decode changed icons before taking the write lock,
+        # which is then held only for this directory's writes.
+        known = {icon_key: (size, mtime) for icon_key, size, mtime in
+                 db.execute("SELECT key, size, mtime_ns FROM icons WHERE dir = ?", (key,))}
+        rows = []
+        for icon_key, (path, stat) in icons.items():
+            if known.get(icon_key) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            try:
+                rows.append((icon_key, path, key, os.path.splitext(icon_key)[1], *self.read_icon(path, stat)))
+            except OSError:
+                continue
+            stats['updated' if icon_key in known else 'added'] += 1
+        subdir_keys = {_index_key(subdir): subdir for subdir in subdirs}
+
+        with self._write_lock:
+            for icon_key in known.keys() - icons.keys():
+                db.execute("DELETE FROM icons WHERE key = ?", (icon_key,))
+                stats['removed'] += 1
+            db.executemany("INSERT OR REPLACE INTO icons VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            known_subdirs = {row[0] for row in db.execute("SELECT path FROM dirs WHERE parent = ?", (key,))}
+            for gone in known_subdirs - subdir_keys.keys():
+                self._forget_tree(db, gone, stats)
+            # Subdirectories are recorded with the listing but without an mtime, so a refresh
+            # cancelled before reaching them still lists them next time
+            db.executemany("INSERT OR IGNORE INTO dirs VALUES (?, ?, NULL)",
+                           [(subdir_key, key) for subdir_key in subdir_keys])
+            db.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", (key, os.path.dirname(key), mtime_ns))
+            db.commit()
+        return subdirs
+
+    def _forget_tree(self, db, directory, stats):
+        """Drop a directory that no longer exists, with everything indexed below it."""
+        low, high = _path_range(directory)
+        stats['removed'] += db.execute("DELETE FROM icons WHERE dir = ? OR (key >= ? AND key < ?)",
+                                       (directory, low, high)).rowcount
+        db.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (directory, low, high))
+
+
+METRICS_PORT_ENV = "PY2EXE_METRICS_PORT"
+
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and histograms rendered in Prometheus text format.
+
+    Metrics are declared once with their type and help text. Values are keyed
+    by label sets passed as keyword arguments. Callback metrics are computed
+    when the endpoint is scraped.
+    """
+
+    DEFAULT_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta = OrderedDict()
+        self._values = {}
+        self._callbacks = {}
+
+    def declare(self, name, kind, help_text, buckets=None):
+        """Declare a 'counter', 'gauge' or 'histogram'."""
+        self._meta[name] = (kind, help_text, tuple(buckets or self.DEFAULT_BUCKETS))
+        return self
+
+    def declare_callback(self, name, kind, help_text, callback):
+        """Declare a metric whose {labels tuple: value} (or single value) is read on scrape."""
+        self._meta[name] = (kind, help_text, ())
+        self._callbacks[name] = callback
+        return self
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._values[(name, tuple(sorted(labels.items())))] = value
+
+    def value(self, name, **labels):
+        """Return the current value of a counter or gauge sample, 0 if it was never set."""
+        with self._lock:
+            return self._values.get((name, tuple(sorted(labels.items()))), 0)
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        buckets = self._meta[name][2]
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(buckets), 0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            values = dict(self._values)
+        lines = []
+        for name, (kind, help_text, buckets) in self._meta.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if name in self._callbacks:
+                try:
+                    result = self._callbacks[name]()
+                except Exception:
+                    continue
+                samples = result.items() if isinstance(result, dict) else [((), result)]
+                lines.extend(f"{name}{self._labels(labels)} {value}" for labels, value in samples)
+                continue
+            for (metric, labels), value in values.items():
+                if metric != name:
+                    continue
+                if kind != 'histogram':
+                    lines.append(f"{name}{self._labels(labels)} {value}")
+                    continue
+                counts, total, count = value
+                for bound, bucket_count in zip(buckets, counts):
+                    lines.append(f"{name}_bucket{self._labels(labels, [('le', bound)])} {bucket_count}")
+                lines.append(f"{name}_bucket{self._labels(labels, [('le', '+Inf')])} {count}")
+                lines.append(f"{name}_sum{self._labels(labels)} {total}")
+                lines.append(f"{name}_count{self._labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Local HTTP endpoint serving a MetricsRegistry at /metrics."""
+
+    def __init__(self, registry, port, host="127.0.0.1"):
+        self.registry = registry
+        self.port = port
+        self.host = host
+        self._server = None
+
+    def start(self):
+        """Start serving on a daemon thread. Raises OSError if the port is unavailable."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# PyInstaller announces each build phase with one of these lines
+PYINSTALLER_PHASE_RE = re.compile(r"INFO: (?:Building|Running) (Analysis|PYZ|PKG|EXE|COLLECT|BUNDLE)\b")
+
+
+class SpanTracer:
+    """Lightweight span recorder exporting Chrome/Perfetto trace JSON.
+
+    Spans are stored as complete ("X") trace events with microsecond
+    timestamps and the recording thread's id, so a timeline shows how busy
+    each worker was and where work serialized. Only the newest max_events
+    spans are kept.
+    """
+
+    def __init__(self, max_events=200000):
+        self.events = deque(maxlen=max_events)
+        self.thread_names = {}
+        self._origin = time.perf_counter()
+
+    def now_us(self):
+        """Microseconds since the tracer was created."""
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def add(self, name, category, start_us, end_us, **args):
+        """Record a finished span from timestamps taken with now_us()."""
+        thread = threading.current_thread()
+        self.thread_names.setdefault(thread.ident, thread.name)
+        self.events.append({'name': name, 'cat': category, 'ph': 'X', 'ts': round(start_us, 1),
+                            'dur': round(end_us - start_us, 1), 'pid': os.getpid(), 'tid': thread.ident,
+                            'args': args})
+
+    @contextmanager
+    def span(self, name, category="app", **args):
+        """Record the body of a with-block as one span on the current thread."""
+        start = self.now_us()
+        try:
+            yield args
+        finally:
+            self.add(name, category, start, self.now_us(), **args)
+
+    def export(self, path):
+        """Write all recorded spans as a Chrome trace file. Returns the number of spans."""
+        events = list(self.events)
+        pid = os.getpid()
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': "Python to EXE Converter"}}]
+        metadata += [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                     for tid, name in self.thread_names.items()]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+
+PROFILE_ENV = "PY2EXE_PROFILE"
+PROFILE_DIR = os.path.join(os.path.expanduser("~"), ".py2exe_converter_profiles")
+
+
+class OperationProfiler:
+    """Developer-mode cProfile capture around named operations.
+
+    When enabled, each profiled operation writes a pstats file named
+    <operation>-<timestamp>.pstats to profile_dir. Up to Python 3.11 a profile
+    covers the thread that started it, so operations on the background
+    executor are profiled there. From Python 3.12 cProfile uses process-wide
+    sys.monitoring and only one profile can be active at a time; an
+    operation that starts while another is being profiled is skipped and
+    logged.
+    """
+
+    def __init__(self, enabled=False, profile_dir=PROFILE_DIR, log=None):
+        self.enabled = enabled
+        self.profile_dir = profile_dir
+        self.log = log
+        self.last_path = None
+
+    def begin(self, operation):
+        """Start profiling the calling thread; returns a handle for end(), or None if disabled."""
+        if not self.enabled:
+            return None
+        import cProfile
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active (always process-wide on Python 3.12+)
+            if self.log:
+                self.log(f"🔬 Not profiling {operation}: another profile is already running", "warning")
+            return None
+        return operation, profiler, time.perf_counter()
+
+    def end(self, handle):
+        """Stop a profile started by begin() and save its stats. Returns the file path."""
+        if handle is None:
+            return None
+        operation, profiler, started = handle
+        profiler.disable()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            path = os.path.join(self.profile_dir,
+                                f"{operation}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.pstats")
+            profiler.dump_stats(path)
+        except OSError as e:
+            if self.log:
+                self.log(f"Could not save {operation} profile: {e}", "warning")
+            return None
+        self.last_path = path
+        if self.log:
+            self.log(f"🔬 Profiled {operation} ({elapsed_ms:.0f} ms): {path}", "info")
+        return path
+
+    @contextmanager
+    def profile(self, operation):
+        """Profile the body of a with-block as one operation."""
+        handle = self.begin(operation)
+        try:
+            yield
+        finally:
+            self.end(handle)
+
+    def recent_profiles(self, limit=50):
+        """Return the newest saved profile paths, newest first."""
+        try:
+            paths = [e.path for e in os.scandir(self.profile_dir) if e.name.endswith('.pstats')]
+        except OSError:
+            return []
+        return sorted(paths, key=os.path.getmtime, reverse=True)[:limit]
+
+
+def format_profile_stats(path, top=30, sort='cumulative'):
+    """Return the top functions of a pstats file as text."""
+    import io
+    import pstats
+
+    stream = io.StringIO()
+    stats = pstats.Stats(path, stream=stream)
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+    return stream.getvalue()
+
+
+class StallMonitor:
+    """Watchdog for Tk event-loop stalls.
+
+    A heartbeat scheduled with root.after measures how late each tick fires,
+    which is the event-loop latency. A watcher thread notices when a heartbeat
+    is overdue by more than threshold_ms and samples the main thread's stack
+    while it is still blocked, so each recorded stall names the handler that
+    was running and the line it was stuck on.
+    """
+
+    INTERVAL_MS = 100
+    SAMPLE_INTERVAL = 0.05
+    MAX_STALLS = 500
+    LOG_STALL_MS = 1000
+
+    def __init__(self, root, threshold_ms=200, log=None):
+        self.root = root
+        self.threshold_ms = threshold_ms
+        self.log = log
+        self.main_thread_id = threading.get_ident()
+        self.latency = {'last_ms': 0.0, 'max_ms': 0.0, 'total_ms': 0.0, 'ticks': 0}
+        self.stalls = deque(maxlen=self.MAX_STALLS)
+        self.stall_count = 0
+        self._expected = None
+        self._samples = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start the heartbeat and the sampling thread. Call on the Tk thread."""
+        self._schedule()
+        threading.Thread(target=self._watch, name="StallMonitor", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _schedule(self):
+        self._expected = time.perf_counter() + self.INTERVAL_MS / 1000
+        self.root.after(self.INTERVAL_MS, self._heartbeat)
+
+    def _heartbeat(self):
+        drift_ms = max(0.0, (time.perf_counter() - self._expected) * 1000)
+        latency = self.latency
+        latency['last_ms'] = drift_ms
+        latency['max_ms'] = max(latency['max_ms'], drift_ms)
+        latency['total_ms'] += drift_ms
+        latency['ticks'] += 1
+
+        with self._lock:
+            samples, self._samples = self._samples, []
+        if drift_ms >= self.threshold_ms:
+            self._record_stall(drift_ms, samples)
+        if not self._stop.is_set():
+            self._schedule()
+
+    def _watch(self):
+        """Sample the main thread's stack while a heartbeat is overdue."""
+        while not self._stop.wait(self.SAMPLE_INTERVAL):
+            expected = self._expected
+            if expected is None or (time.perf_counter() - expected) * 1000 < self.threshold_ms:
+                continue
+            frame = sys._current_frames().get(self.main_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            del frame
+            with self._lock:
+                self._samples.append(stack)
+
+    # Functions in this module that only dispatch callbacks: UIUpdateBus._flush, BackgroundExecutor._deliver
+    DISPATCH_FUNCTIONS = frozenset({'_flush', '_deliver'})
+
+    @classmethod
+    def _handler_of(cls, stack):
+        """Return the outermost frame below the dispatch code: the callback that was running.
+
+        Dispatch code is tkinter itself plus the UI bus and executor delivery
+        functions, so work posted through the bus is reported under its own callback.
+        """
+        in_dispatch = False
+        for frame in stack:
+            if (os.sep + 'tkinter' + os.sep in frame.filename
+                    or (frame.filename == __file__ and frame.name in cls.DISPATCH_FUNCTIONS)):
+                in_dispatch = True
+            elif in_dispatch:
+                return frame
+        return stack[-1] if stack else None
+
+    def _record_stall(self, duration_ms, samples):
+        if samples:
+            # The most frequently sampled handler and innermost line of this stall
+            handlers = Counter(self._format_frame(self._handler_of(stack)) for stack in samples)
+            hot_lines = Counter(self._format_frame(stack[-1]) for stack in samples if stack)
+            handler = handlers.most_common(1)[0][0]
+            hot_line = hot_lines.most_common(1)[0][0]
+            stack = samples[-1]
+        else:
+            handler = hot_line = "(not sampled)"
+            stack = []
+
+        self.stall_count += 1
+        self.stalls.append({
+            'time': datetime.now().strftime("%H:%M:%S"),
+            'duration_ms': duration_ms,
+            'handler': handler,
+            'hot_line': hot_line,
+            'samples': len(samples),
+            'stack': ''.join(traceback.format_list(stack)),
+        })
+        if self.log and duration_ms >= self.LOG_STALL_MS:
+            self.log(f"🐢 UI stalled for {duration_ms:.0f} ms in {handler}", "warning")
+
+    @staticmethod
+    def _format_frame(frame):
+        if frame is None:
+            return "(unknown)"
+        return f"{frame.name} ({os.path.basename(frame.filename)}:{frame.lineno})"
+
+    def report(self):
+        """Group stalls by handler: [(handler, count, worst_ms, total_ms, worst stall)], worst first."""
+        groups = {}
+        for stall in list(self.stalls):
+            group = groups.setdefault(stall['handler'], [stall['handler'], 0, 0.0, 0.0, stall])
+            group[1] += 1
+            group[3] += stall['duration_ms']
+            if stall['duration_ms'] >= group[2]:
+                group[2] = stall['duration_ms']
+                group[4] = stall
+        return sorted((tuple(group) for group in groups.values()), key=lambda g: g[2], reverse=True)
+
+
+class TaskCancelled(Exception):
+    """Raised inside a background task once its cancel token is set."""
+
+
+class CancelToken:
+    """Cooperative cancellation flag shared by the UI and one background task."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Raise TaskCancelled if cancellation was requested."""
+        if self._event.is_set():
+            raise TaskCancelled()
+
+    def wait(self, timeout=None):
+        """Block until cancellation is requested or timeout expires; return whether it was."""
+        return self._event.wait(timeout)
+
+
+def terminate_on_cancel(process, token, interval=0.2):
+    """Terminate a child process from a daemon thread once token is cancelled.
+
+    Tasks blocked reading a child's output never reach their next token.check(),
+    so the watcher ends the child instead; it exits by itself when the child does.
+    """
+    def watch():
+        while process.poll() is None:
+            if token.wait(interval):
+                process.terminate()
+                return
+
+    thread = threading.Thread(target=watch, name="cancel-watch", daemon=True)
+    thread.start()
+    return thread
+
+
+class BackgroundTask:
+    """Handle of a submitted task: its cancel token and progress reporting."""
+
+    def __init__(self, executor, name, on_progress=None):
+        self.name = name
+        self.token = CancelToken()
+        self.future = None
+        self._executor = executor
+        self._on_progress = on_progress
+
+    def cancel(self):
+        self.token.cancel()
+
+    def report(self, done, total=None, message=""):
+        """Report progress; delivered on the Tk thread, coalesced to one update per frame."""
+        if self._on_progress and not self.token.cancelled:
+            self._executor.ui_bus.post(('task_progress', self.name), self._on_progress, done, total, message)
+
+
+class BackgroundExecutor:
+    """Shared thread pool for work that would otherwise block the Tk event loop.
+
+    Tasks are called with their BackgroundTask as the first argument and should
+    call task.token.check() between units of work. Results, errors and progress
+    are delivered on the Tk thread through the UIUpdateBus. Submitting under a
+    name that is still running cancels the older task, so only the latest
+    preview or search delivers its result.
+    """
+
+    def __init__(self, ui_bus, max_workers=6, log=None):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.ui_bus = ui_bus
+        self.log = log
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="background")
+        self._lock = threading.Lock()
+        self.tasks = {}
+        # Every unfinished task, including ones replaced under their name
+        self._active = set()
+
+    def submit(self, name, fn, *args, on_done=None, on_error=None, on_progress=None, on_cancelled=None):
+        """Run fn(task, *args) on the pool and return its BackgroundTask."""
+        task = BackgroundTask(self, name, on_progress)
+        with self._lock:
+            previous = self.tasks.get(name)
+            if previous is not None:
+                previous.cancel()
+            self.tasks[name] = task
+            self._active.add(task)
+        task.future = self._pool.submit(self._run, task, fn, args, on_done, on_error, on_cancelled)
+        return task
+
+    def is_running(self, name):
+        with self._lock:
+            return name in self.tasks
+
+    def cancel(self, name):
+        """Request cancellation of the task running under name, if any."""
+        with self._lock:
+            task = self.tasks.get(name)
+        if task is not None:
+            task.cancel()
+
+    def shutdown(self, timeout=10.0):
+        """Cancel all tasks, stop accepting new ones and wait up to timeout for running ones.
+
+        Queued tasks are dropped without starting. Returns True once every worker
+        has finished, False if a task is still running when timeout expires.
+        """
+        from concurrent.futures import wait
+
+        with self._lock:
+            tasks = list(self._active)
+        for task in tasks:
+            task.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        _, running = wait([task.future for task in tasks if task.future is not None], timeout)
+        return not running
+
+    def _run(self, task, fn, args, on_done, on_error, on_cancelled):
+        try:
+            task.token.check()
+            result = fn(task, *args)
+            task.token.check()
+        except TaskCancelled:
+            if on_cancelled:
+                self.ui_bus.call(on_cancelled)
+        except Exception as e:
+            if on_error:
+                self.ui_bus.call(on_error, e)
+            elif self.log:
+                self.log(f"❌ Background task '{task.name}' failed: {e}", "error")
+        else:
+            if on_done:
+                self.ui_bus.call(self._deliver, task, on_done, result)
+        finally:
+            with self._lock:
+                if self.tasks.get(task.name) is task:
+                    del self.tasks[task.name]
+                self._active.discard(task)
+
+    @staticmethod
+    def _deliver(task, on_done, result):
+        # A newer task may have replaced this one after it finished
+        if not task.token.cancelled:
+            on_done(result)
+
+
+LOG_DIR = os.path.join(os.path.expanduser("~"), ".py2exe_converter_logs")
+
+
+class JsonLogSink:
+    """Asynchronous JSON-lines event log with size-based rotation and gzip compression.
+
+    Events are queued by emit() from any thread and written by a dedicated
+    daemon thread to <log_dir>/events.jsonl. When the file exceeds max_bytes it
+    is renamed to events-<timestamp>.jsonl.gz (compressed by the writer thread)
+    and only the newest max_files rotated files are kept. At most max_queue
+    events wait for the writer; further events are counted in dropped. If the
+    file cannot be opened the sink reports it through log and disables itself.
+    """
+
+    def __init__(self, log_dir=os.path.join(LOG_DIR, 'events'), max_bytes=5 * 1024 * 1024, max_files=20,
+                 max_queue=10000, log=None):
+        self.log_dir = log_dir
+        self.path = os.path.join(log_dir, 'events.jsonl')
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.log = log
+        # Performance Optimization: Bounded queue, so a stalled disk drops events instead of growing memory
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self.dropped = 0
+        self.disabled = False
+
+    def start(self):
+        """Start the writer thread."""
+        self._thread = threading.Thread(target=self._run, name="JsonLogSink", daemon=True)
+        self._thread.start()
+        return self
+
+    def emit(self, level, message, job=None, phase=None, timestamp=None):
+        """Queue an event for writing. Never blocks on disk I/O."""
+        if self.disabled:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait({
+                'ts': datetime.fromtimestamp(timestamp or time.time()).isoformat(timespec='milliseconds'),
+                'level': level,
+                'job': job['id'] if job else None,
+                'script': os.path.basename(job['script']) if job else None,
+                'phase': phase,
+                'message': message,
+            })
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=2.0):
+        """Flush queued events and stop the writer thread."""
+        if self._thread:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            f = open(self.path, 'ab')
+        except OSError as e:
+            self._disable(e)
+            return
+        size = f.tell()
+        while True:
+            event = self._queue.get()
+            # Drain everything queued so one flush covers the whole batch
+            batch = [event]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            for i, event in enumerate(batch):
+                if event is None:
+                    stop = True
+                    continue
+                # Encoded up front so rotation counts bytes on disk, not characters
+                line = (json.dumps(event, ensure_ascii=False) + "\n").encode('utf-8', errors='replace')
+                try:
+                    f.write(line)
+                except OSError:
+                    self.dropped += 1
+                    continue
+                size += len(line)
+                if size >= self.max_bytes:
+                    f.close()
+                    self._rotate()
+                    try:
+                        f = open(self.path, 'ab')
+                    except OSError as e:
+                        self.dropped += sum(1 for rest in batch[i + 1:] if rest is not None)
+                        self._disable(e)
+                        return
+                    size = 0
+            f.flush()
+            if stop:
+                f.close()
+                return
+
+    def _disable(self, error):
+        """Stop writing after the log file could not be opened; later events are dropped."""
+        self.disabled = True
+        while True:
+            try:
+                if self._queue.get_nowait() is not None:
+                    self.dropped += 1
+            except queue.Empty:
+                break
+        if self.log:
+            self.log(f"❌ JSON event log disabled - could not open {self.path}: {error}", "error")
+
+    def _rotate(self):
+        """Compress the current file into a timestamped archive and prune old archives."""
+        import gzip
+        import shutil
+
+        archive = os.path.join(self.log_dir, f"events-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.jsonl.gz")
+        try:
+            with open(self.path, 'rb') as src, gzip.open(archive, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(self.path)
+            archives = sorted(e.path for e in os.scandir(self.log_dir)
+                              if e.name.startswith('events-') and e.name.endswith('.jsonl.gz'))
+            for old in archives[:max(0, len(archives) - self.max_files)]:
+                os.remove(old)
+        except OSError:
+            pass
+
+
+def iter_json_log_events(log_dir=os.path.join(LOG_DIR, 'events')):
+    """Yield events from the rotated archives and the current file, oldest first."""
+    import gzip
+
+    try:
+        archives = sorted(e.path for e in os.scandir(log_dir)
+                          if e.name.startswith('events-') and e.name.endswith('.jsonl.gz'))
+    except OSError:
+        return
+    current = os.path.join(log_dir, 'events.jsonl')
+    for path in archives + ([current] if os.path.exists(current) else []):
+        opener = gzip.open if path.endswith('.gz') else open
+        try:
+            with opener(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except (OSError, EOFError):
+            continue
+
+
+BUILD_HISTORY_PATH = os.path.join(LOG_DIR, 'build_history.jsonl')
+
+
+class ProcessResourceSampler:
+    """Samples the memory and I/O of a process tree from /proc while it runs.
+
+    PyInstaller does its analysis in child interpreters, so the whole tree
+    under pid is sampled. The last I/O counters seen for each process are kept
+    after it exits. Does nothing where /proc is not available.
+    """
+
+    def __init__(self, pid, interval=0.2):
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = 0
+        self._io = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if os.path.isdir(f"/proc/{self.pid}"):
+            self._thread = threading.Thread(target=self._run, name="ResourceSampler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop sampling; returns (peak tree RSS bytes, read bytes, written bytes)."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return (self.peak_rss, sum(read for read, _ in self._io.values()),
+                sum(written for _, written in self._io.values()))
+
+    def _tree(self):
+        pids = [self.pid]
+        for pid in pids:
+            try:
+                for task in os.listdir(f"/proc/{pid}/task"):
+                    with open(f"/proc/{pid}/task/{task}/children") as f:
+                        pids.extend(int(child) for child in f.read().split())
+            except (OSError, ValueError):
+                continue
+        return pids
+
+    def _run(self):
+        while True:
+            rss = 0
+            for pid in self._tree():
+                try:
+                    with open(f"/proc/{pid}/status") as f:
+                        for line in f:
+                            if line.startswith('VmHWM:'):
+                                self.peak_rss = max(self.peak_rss, int(line.split()[1]) * 1024)
+                            elif line.startswith('VmRSS:'):
+                                rss += int(line.split()[1]) * 1024
+                    with open(f"/proc/{pid}/io") as f:
+                        counters = dict(line.split(': ') for line in f.read().splitlines())
+                    self._io[pid] = (int(counters['read_bytes']), int(counters['write_bytes']))
+                except (OSError, ValueError, KeyError):
+                    continue
+            self.peak_rss = max(self.peak_rss, rss)
+            if self._stop.wait(self.interval):
+                return
+
+
+def wait_with_rusage(process):
+    """Wait for a Popen child and return its resource usage, including reaped descendants.
+
+    Returns None where os.wait4 is not available (Windows).
+    """
+    if not hasattr(os, 'wait4'):
+        process.wait()
+        return None
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return rusage
+
+
+def summarize_resources(wall, rusage=None, sampled=(0, 0, 0)):
+    """Combine rusage and /proc samples into a JSON-friendly resource summary."""
+    peak_rss, read_bytes, write_bytes = sampled
+    resources = {'wall_s': round(wall, 2), 'cpu_user_s': None, 'cpu_sys_s': None}
+    if rusage is not None:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        max_rss = rusage.ru_maxrss if sys.platform == 'darwin' else rusage.ru_maxrss * 1024
+        peak_rss = max(peak_rss, max_rss)
+        read_bytes = max(read_bytes, rusage.ru_inblock * 512)
+        write_bytes = max(write_bytes, rusage.ru_oublock * 512)
+        resources['cpu_user_s'] = round(rusage.ru_utime, 2)
+        resources['cpu_sys_s'] = round(rusage.ru_stime, 2)
+    resources['peak_rss_mb'] = round(peak_rss / 1024 / 1024, 1)
+    resources['read_mb'] = round(read_bytes / 1024 / 1024, 1)
+    resources['write_mb'] = round(write_bytes / 1024 / 1024, 1)
+    return resources
+
+
+def format_resources(resources):
+    """Format a resource summary as one log line."""
+    text = f"{resources['wall_s']:.1f} s wall"
+    if resources['cpu_user_s'] is not None:
+        text += f" · CPU {resources['cpu_user_s']:.1f} s user / {resources['cpu_sys_s']:.1f} s sys"
+    return (text + f" · peak RSS {resources['peak_rss_mb']:.0f} MB · "
+            f"I/O {resources['read_mb']:.1f} MB read / {resources['write_mb']:.1f} MB written")
+
+
+def append_build_history(records, path=BUILD_HISTORY_PATH):
+    """Append build records to the JSON-lines build history."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+    except OSError:
+        pass
+
+
+def read_build_history(limit=500, path=BUILD_HISTORY_PATH):
+    """Return the newest build history records, newest first."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            lines = deque(f, maxlen=limit)
+    except OSError:
+        return []
+    records = []
+    for line in reversed(lines):
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+class SessionLog:
+    """Append-only on-disk log of one session with an in-memory record index.
+
+    Every record is written as one "[HH:MM:SS] [LEVEL] message" entry. The byte
+    offset and level of each record are kept in compact arrays so any range
+    of records can be read back without scanning the file. Writes are
+    buffered; the log pipeline flushes after every drained batch. If the file
+    cannot be created the records are kept in memory instead (in_memory).
+    """
+
+    LEVELS = ('info', 'success', 'warning', 'error', 'build', 'timestamp')
+    MAX_SESSION_FILES = 20
+
+    def __init__(self, path):
+        self.path = path
+        self.offsets = array('Q')
+        self.levels = bytearray()
+        self._level_codes = {level: i for i, level in enumerate(self.LEVELS)}
+        self._size = 0
+        self._lock = threading.Lock()
+        try:
+            self._writer = open(path, 'ab')
+            self.in_memory = False
+        except OSError:
+            # A read-only or full log directory must not prevent startup
+            self._writer = io.BytesIO()
+            self.in_memory = True
+        self._reader = None
+        self._dirty = False
+
+    @classmethod
+    def create_for_session(cls, log_dir=LOG_DIR):
+        """Create a new session log file, pruning the oldest session files."""
+        sessions_dir = os.path.join(log_dir, 'sessions')
+        try:
+            os.makedirs(sessions_dir, exist_ok=True)
+        except OSError:
+            sessions_dir = tempfile.gettempdir()
+
+        try:
+            old_sessions = sorted(e.path for e in os.scandir(sessions_dir)
+                                  if e.name.startswith('session-') and e.name.endswith('.log'))
+            for old in old_sessions[:max(0, len(old_sessions) - cls.MAX_SESSION_FILES + 1)]:
+                os.remove(old)
+        except OSError:
+            pass
+
+        name = f"session-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.log"
+        return cls(os.path.join(sessions_dir, name))
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def append(self, timestamp, message, level):
+        """Append a record and return its record number."""
+        data = f"[{timestamp}] [{level.upper()}] {message}\n".encode('utf-8', errors='replace')
+        with self._lock:
+            record = len(self.offsets)
+            self.offsets.append(self._size)
+            self.levels.append(self._level_codes.get(level, 0))
+            self._writer.write(data)
+            self._size += len(data)
+            self._dirty = True
+        return record
+
+    def flush(self):
+        """Flush buffered records to disk."""
+        with self._lock:
+            if self._dirty:
+                self._writer.flush()
+                self._dirty = False
+
+    def read_raw(self, start, end):
+        """Return the raw bytes of records [start, end)."""
+        start = max(0, start)
+        end = min(end, len(self.offsets))
+        if start >= end:
+            return b''
+        self.flush()
+        with self._lock:
+            stop = self.offsets[end] if end < len(self.offsets) else self._size
+            if self.in_memory:
+                with self._writer.getbuffer() as buffer:
+                    return bytes(buffer[self.offsets[start]:stop])
+            if self._reader is None:
+                self._reader = open(self.path, 'rb')
+            self._reader.seek(self.offsets[start])
+            return self._reader.read(stop - self.offsets[start])
+
+    def read(self, start, end):
+        """Return records [start, end) as (timestamp, message, level) tuples."""
+        data = self.read_raw(start, end)
+        if not data:
+            return []
+        base = self.offsets[max(0, start)]
+        bounds = [self.offsets[i] - base for i in range(max(0, start), min(end, len(self.offsets)))]
+        bounds.append(len(data))
+        records = []
+        for i, record in enumerate(range(max(0, start), min(end, len(self.offsets)))):
+            text = data[bounds[i]:bounds[i + 1]].decode('utf-8', errors='replace').rstrip('\n')
+            stamp, _, rest = text.partition('] ')
+            _, _, message = rest.partition('] ')
+            records.append((stamp[1:], message, self.LEVELS[self.levels[record]]))
+        return records
+
+    def close(self):
+        """Close the underlying files."""
+        with self._lock:
+            self._writer.close()
+            if self._reader is not None:
+                self._reader.close()
+
+
+# Quoted strings, paths and numbers vary between otherwise identical build lines
+LOG_PATTERN_RE = re.compile(r"'[^']*'|\"[^\"]*\"|\S*[\\/]\S*|\d+")
+
+
+def log_line_pattern(message, level):
+    """Return the coalescing key of a log line, or None if it must always be shown."""
+    if level != 'build' or '\n' in message:
+        return None
+    return LOG_PATTERN_RE.sub('#', message)
+
+
+class LogSearchIndex:
+    """Incremental inverted index over session log records.
+
+    Records are tokenized as the log queue is drained, so a search never scans
+    the log text. Postings are ascending arrays of record numbers; query terms
+    match token prefixes and are intersected with the level and job postings.
+    """
+
+    TOKEN_RE = re.compile(r"\w+")
+    MAX_TOKEN_LENGTH = 32
+
+    def __init__(self):
+        self.postings = {}
+        self.level_postings = {}
+        self.job_postings = {}
+        self.job_labels = {}
+        self.records = 0
+        self._vocabulary = []
+        self._vocabulary_dirty = False
+
+    def add(self, record, message, level, job=None):
+        """Index one record. Records must be added in ascending order."""
+        postings = self.postings
+        max_length = self.MAX_TOKEN_LENGTH
+        for token in set(self.TOKEN_RE.findall(message.lower())):
+            token = token[:max_length]
+            entry = postings.get(token)
+            if entry is None:
+                postings[token] = entry = array('I')
+                self._vocabulary_dirty = True
+            elif entry[-1] == record:
+                continue
+            entry.append(record)
+
+        entry = self.level_postings.get(level)
+        if entry is None:
+            self.level_postings[level] = entry = array('I')
+        entry.append(record)
+
+        if job:
+            entry = self.job_postings.get(job['id'])
+            if entry is None:
+                self.job_postings[job['id']] = entry = array('I')
+                self.job_labels[job['id']] = f"{job['id']} · {os.path.basename(job['script'])}"
+            entry.append(record)
+        self.records = record + 1
+
+    def _prefix_tokens(self, term):
+        """Return the indexed tokens starting with term."""
+        import bisect
+
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self.postings)
+            self._vocabulary_dirty = False
+        vocabulary = self._vocabulary
+        i = bisect.bisect_left(vocabulary, term)
+        tokens = []
+        while i < len(vocabulary) and vocabulary[i].startswith(term):
+            tokens.append(vocabulary[i])
+            i += 1
+        return tokens
+
+    def search(self, query="", level=None, job=None, start=0):
+        """Return the ascending record numbers >= start matching every term and filter.
+
+        Returns None when there is nothing to search for (no terms and no filters).
+        """
+        import bisect
+
+        candidates = []
+        for term in self.TOKEN_RE.findall(query.lower()):
+            tokens = self._prefix_tokens(term[:self.MAX_TOKEN_LENGTH])
+            if not tokens:
+                return []
+            if len(tokens) == 1:
+                candidates.append(self.postings[tokens[0]])
+            else:
+                merged = set()
+                for token in tokens:
+                    merged.update(self.postings[token])
+                candidates.append(array('I', sorted(merged)))
+        if level:
+            candidates.append(self.level_postings.get(level, array('I')))
+        if job:
+            candidates.append(self.job_postings.get(job, array('I')))
+        if not candidates:
+            return None
+
+        # Performance Optimization: Walk the shortest postings list and binary-search
+        # the others, so rare terms stay cheap however common the filters are.
+        candidates.sort(key=len)
+        shortest, others = candidates[0], candidates[1:]
+        results = []
+        for record in shortest[bisect.bisect_left(shortest, start):]:
+            for postings in others:
+                i = bisect.bisect_left(postings, record)
+                if i == len(postings) or postings[i] != record:
+                    break
+            else:
+                results.append(record)
+        return results
+
+
+IMPORTTIME_MARKER = "--py2exe-importtime-start--"
+
+# Imports the target script without running its __main__ block, after a marker
+# that separates interpreter startup imports from the script's own imports.
+# Executed directly rather than through runpy, whose lazy imports would be
+# attributed to the script.
+IMPORTTIME_BOOTSTRAP = f'''import sys
+sys.stderr.write({IMPORTTIME_MARKER!r} + "\\n")
+sys.argv = sys.argv[1:]
+with open(sys.argv[0], "rb") as f:
+    code = compile(f.read(), sys.argv[0], "exec")
+exec(code, {{"__name__": "__importtime__", "__file__": sys.argv[0], "__builtins__": __builtins__}})
+'''
+
+IMPORTTIME_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( +)(\S+)")
+
+
+def parse_importtime(text):
+    """Parse `python -X importtime` output into a list of root import nodes.
+
+    Each node is a dict with name, self_us, cumulative_us and children. The
+    interpreter prints children before their parent, two spaces deeper.
+    """
+    pending = {}
+    for line in text.splitlines():
+        match = IMPORTTIME_LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = (len(indent) - 1) // 2
+        node = {'name': name, 'self_us': int(self_us), 'cumulative_us': int(cumulative_us),
+                'children': pending.pop(depth + 1, [])}
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def find_deferrable_imports(script_path):
+    """Return {module: names} for top-level imports only used inside function bodies.
+
+    Such imports run at startup but are not needed until a function is called,
+    so moving them into that function defers their cost.
+    """
+    import ast
+
+    with open(script_path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=script_path)
+
+    imported = {}
+
+    def collect_imports(statements):
+        for stmt in statements:
+            if isinstance(stmt, ast.Import):
+                for alias in stmt.names:
+                    bound = alias.asname or alias.name.split('.')[0]
+                    imported.setdefault(bound, alias.name)
+            elif isinstance(stmt, ast.ImportFrom) and stmt.module and not stmt.level:
+                for alias in stmt.names:
+                    imported.setdefault(alias.asname or alias.name, stmt.module)
+            elif isinstance(stmt, (ast.If, ast.Try)):
+                collect_imports(stmt.body)
+                collect_imports(stmt.orelse)
+                for handler in getattr(stmt, 'handlers', ()):
+                    collect_imports(handler.body)
+                collect_imports(getattr(stmt, 'finalbody', ()))
+
+    collect_imports(tree.body)
+
+    # Names loaded by code that executes at import time: everything except
+    # function bodies (decorators, defaults and class bodies still count).
+    module_level_uses = set()
+
+    def visit(node):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            for child in [*getattr(node, 'decorator_list', ()), *node.args.defaults,
+                          *[d for d in node.args.kw_defaults if d is not None]]:
+                visit(child)
+            return
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            module_level_uses.add(node.id)
+        for child in ast.iter_child_nodes(node):
+            visit(child)
+
+    visit(tree)
+
+    deferrable = {}
+    for bound, module in imported.items():
+        if bound not in module_level_uses:
+            deferrable.setdefault(module, []).append(bound)
+    return deferrable
+
+
+def profile_import_time(script, timeout=120):
+    """Import a script under -X importtime and return its parsed root import nodes."""
+    result = subprocess.run([get_target_interpreter(), "-X", "importtime", "-c", IMPORTTIME_BOOTSTRAP, script],
+                            capture_output=True, text=True, timeout=timeout, stdin=subprocess.DEVNULL,
+                            cwd=os.path.dirname(os.path.abspath(script)))
+    _, marker, script_output = result.stderr.partition(IMPORTTIME_MARKER)
+    return parse_importtime(script_output if marker else result.stderr)
+
+
+def summarize_import_profile(script, roots, threshold_ms=20.0):
+    """Flag heavy top-level imports of a script that could be deferred.
+
+    Returns a list of (node, deferrable_names) for roots at or above the
+    threshold, heaviest first; deferrable_names is empty when the import is
+    used at module level.
+    """
+    try:
+        deferrable = find_deferrable_imports(script)
+    except (OSError, SyntaxError, ValueError):
+        deferrable = {}
+
+    heavy = []
+    for node in sorted(roots, key=lambda n: n['cumulative_us'], reverse=True):
+        if node['cumulative_us'] / 1000 < threshold_ms:
+            break
+        names = [name for module, bound in deferrable.items()
+                 if module == node['name'] or module.startswith(node['name'] + '.')
+                 for name in bound]
+        heavy.append((node, names))
+    return heavy
+
+
 class ModernPy2ExeConverter:
     """Modern Python to EXE Converter with enhanced GUI and icon management."""
 
+    # Bounds of the shaped icon and mask LRU caches
+    MAX_MASK_CACHE = 64
+    MAX_SHAPED_ICONS = 32
+
     # Performance Optimization: Pre-calculate unit circle vertices for shapes to avoid
     # redundant trigonometric calculations during mask generation.
     HEX_VERTICES = [(math.cos(math.radians(60 * i)), math.sin(math.radians(60 * i))) for i in range(6)]
@@ -63,6 +2168,11 @@ class ModernPy2ExeConverter:
 
     def __init__(self):
         """Initialize the main application window with modern styling."""
+        # Developer mode: PY2EXE_PROFILE=1 profiles startup and every major operation
+        self.profiler = OperationProfiler(enabled=os.environ.get(PROFILE_ENV, '') not in ('', '0'),
+                                          log=self.log_output)
+        startup_profile = self.profiler.begin('startup')
+
         self.root = tk.Tk()
         self.root.title("Modern Python to EXE Converter v4.0")
         self.root.geometry("1200x800")
@@ -86,9 +2196,29 @@ class ModernPy2ExeConverter:
         self.conversion_settings = {}
         self.last_created_icon = None  # Track last created icon for auto-selection
 
-        # Initialize thread-safe log queue
-        self.log_queue = queue.Queue()
-        self._process_log_queue()
+        # Single coalescing channel for UI updates from worker threads
+        self.ui_bus = UIUpdateBus(self.root)
+
+        # Timeline of pipeline stages, exportable as a Chrome trace
+        self.tracer = SpanTracer()
+
+        # Counters and histograms for the optional /metrics endpoint
+        self.metrics = MetricsRegistry()
+        self.metrics_server = None
+
+        # Event-loop latency watchdog; started with the main loop in run()
+        self.stall_monitor = StallMonitor(self.root, int(self.default_settings.get('stall_threshold_ms', 200)),
+                                          log=self.log_output)
+
+        # Shared pool for work that must not run on the Tk thread
+        self.executor = BackgroundExecutor(self.ui_bus, log=self.log_output)
+
+        # Structured JSON-lines copy of every log event, written off the UI thread
+        self.json_log = JsonLogSink(log=self.log_output).start()
+
+        # Initialize thread-safe log queue and the on-disk session log. The log widget
+        # only holds a bounded window of records; the full session lives on disk.
+        self._init_log_pipeline(SessionLog.create_for_session())
 
         # Performance Optimization: Use WeakKeyDictionary for mousewheel scroll targets
         # to ensure destroyed widgets can be garbage collected from the cache.
@@ -99,6 +2229,12 @@ class ModernPy2ExeConverter:
         self._mask_cache = OrderedDict()
         self._pyinstaller_version = None
 
+        # Background-built index of importable modules for hidden import completion
+        self.module_index = ModuleIndex().start()
+
+        # Persistent index of icon files below searched directories
+        self.icon_index = IconIndex()
+
 
         # Icon shape options (all with rounded corners)
         self.icon_shapes = {
@@ -126,51 +2262,399 @@ class ModernPy2ExeConverter:
         # Bind global keyboard shortcuts
         self.root.bind("<Control-o>", lambda e: self.select_files())
         self.root.bind("<Control-s>", lambda e: self.save_log())
+        self.root.bind("<Control-f>", lambda e: self.focus_log_search())
         self.root.bind("<Control-Return>", lambda e: self.convert_to_exe())
         self.root.bind("<Control-q>", lambda e: self.root.quit())
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        self._setup_metrics()
+
+        self.profiler.end(startup_profile)
 
     def create_tooltip(self, widget, text):
         """Helper to create a tooltip for a widget."""
         return Tooltip(widget, text)
 
+    def _init_log_pipeline(self, session_log):
+        """Set up the log queue, session log, widget window state and search index.
+
+        Needs only root, ui_bus, json_log and default_settings, so the log
+        benchmark can drive the real pipeline without building the GUI.
+        """
+        self.log_queue = queue.Queue()
+        self.session_log = session_log
+        self.log_view_max_lines = max(500, int(self.default_settings.get('log_view_max_lines', 5000)))
+        self._log_view_first = 0          # first record shown in the widget
+        self._log_view_end = 0            # one past the last record shown
+        self._log_view_floor = 0          # records before this were cleared by the user
+        self._log_view_line_counts = deque()
+        self._log_view_following = True   # widget shows the tail of the session
+        self._log_paging_scheduled = False
+        self._log_tail_run = None         # (pattern, collapsed) of the run at the widget's tail
+        self._log_stamp_second = None
+        self._log_stamp_text = ""
+        self._log_metrics_shown_at = 0.0
+        self.log_index = LogSearchIndex()
+        self._log_search_key = None
+        self._log_search_results = []
+        self._log_search_position = None
+        self.log_metrics = {'depth': 0, 'max_depth': 0, 'lag_ms': 0.0, 'max_lag_ms': 0.0,
+                            'drained': 0, 'ticks': 0}
+        self.ui_bus.register_pump(self._process_log_queue)
+
+    # Adaptive log drain: each tick drains for at most this long before yielding to Tk
+    LOG_DRAIN_BUDGET = 0.008
+
+    def _format_log_timestamp(self, wall_time):
+        """Format a wall-clock time as HH:MM:SS, cached per second."""
+        second = int(wall_time)
+        if second != self._log_stamp_second:
+            self._log_stamp_second = second
+            self._log_stamp_text = datetime.fromtimestamp(second).strftime("%H:%M:%S")
+        return self._log_stamp_text
+
     def _process_log_queue(self):
-        """Process messages in the log queue with batched UI updates for better performance."""
+        """Drain the log queue within a time budget and batch the resulting widget updates.
+
+        Performance Optimization: Instead of a fixed number of messages on a fixed
+        100 ms timer, drain everything that fits in LOG_DRAIN_BUDGET per tick. This runs
+        as a UIUpdateBus pump: returning True keeps the bus flushing while a backlog
+        remains, and an idle queue schedules nothing until log_output wakes the bus.
+        """
         if not hasattr(self, 'output_text') or not self.output_text:
-            self.root.after(100, self._process_log_queue)
-            return
+            return False
 
         messages_processed = 0
-        batch_timestamp = None
-        inserts = []
+        records = []
+        metrics = self.log_metrics
+        now = time.time()
+        deadline = time.perf_counter() + self.LOG_DRAIN_BUDGET
+        session_append = self.session_log.append
+        index_add = self.log_index.add
+        get_nowait = self.log_queue.get_nowait
 
         try:
-            # Optimization: Process up to 25 messages per tick to minimize UI thread overhead
-            for _ in range(25):
+            while True:
+                # Check the budget every 32 messages to keep the clock off the hot path
+                if messages_processed & 31 == 0 and messages_processed and time.perf_counter() >= deadline:
+                    break
                 try:
-                    message, level = self.log_queue.get_nowait()
-
-                    # Performance Optimization: Calculate timestamp once per batch to avoid redundant calls
-                    if messages_processed == 0:
-                        batch_timestamp = datetime.now().strftime("%H:%M:%S")
-
-                    # Performance Optimization: Collect all tag-text pairs for a single insert call
-                    # This reduces IPC overhead between Python and the Tcl interpreter
-                    inserts.extend([f"[{batch_timestamp}] ", "timestamp", f"{message}\n", level])
-                    messages_processed += 1
+                    message, level, enqueued_at, job = get_nowait()
                 except queue.Empty:
                     break
 
-            if inserts:
+                if messages_processed == 0:
+                    lag_ms = (now - enqueued_at) * 1000
+                    metrics['lag_ms'] = lag_ms
+                    metrics['max_lag_ms'] = max(metrics['max_lag_ms'], lag_ms)
+
+                # Performance Optimization: Timestamps are formatted once per second, not per message
+                stamp = self._format_log_timestamp(enqueued_at)
+
+                # Every record goes to the session log and the search index;
+                # only the tail is shown in the widget
+                index_add(session_append(stamp, message, level), message, level, job)
+
+                records.append((stamp, message, level))
+                messages_processed += 1
+
+            if records and self._log_view_following:
+                # Performance Optimization: Collect all tag-text pairs for a single insert call
+                # This reduces IPC overhead between Python and the Tcl interpreter
+                inserts, line_counts, run, extends_tail = self._render_log_records(records, self._log_tail_run)
                 self.output_text.config(state=tk.NORMAL)
+                if extends_tail:
+                    # The run at the tail continues: replace its summary line
+                    summary_line = sum(self._log_view_line_counts)
+                    self.output_text.delete(f"{summary_line}.0", f"{summary_line + 1}.0")
+                    self._log_view_line_counts[-1] = 0
                 self.output_text.insert(tk.END, *inserts)
+                self._log_view_line_counts.extend(line_counts)
+                self._log_tail_run = run
+                self._log_view_end = len(self.session_log)
+                self._evict_log_lines(from_top=True)
         finally:
-            if messages_processed > 0:
+            if messages_processed > 0 and self._log_view_following:
                 # Batch UI updates: Scroll and disable once per batch
                 self.output_text.see(tk.END)
                 self.output_text.config(state=tk.DISABLED)
 
-            # Schedule next check
-            self.root.after(100, self._process_log_queue)
+            if messages_processed > 0:
+                # One flush per drained batch: a crash loses at most the batch being drawn
+                self.session_log.flush()
+
+            depth = self.log_queue.qsize()
+            metrics['depth'] = depth
+            metrics['max_depth'] = max(metrics['max_depth'], depth)
+            metrics['drained'] += messages_processed
+            metrics['ticks'] += 1
+            self._update_log_metrics_label()
+
+        return depth > 0
+
+    def _update_log_metrics_label(self):
+        """Show log queue depth and lag next to the log controls, at most twice a second."""
+        if not hasattr(self, 'log_metrics_label'):
+            return
+        now = time.perf_counter()
+        if now - self._log_metrics_shown_at < 0.5:
+            return
+        self._log_metrics_shown_at = now
+        metrics = self.log_metrics
+        self.log_metrics_label.config(
+            text=f"📊 queue {metrics['depth']} · lag {metrics['lag_ms']:.0f} ms · "
+                 f"{len(self.session_log)} lines")
+
+    def _evict_log_lines(self, from_top):
+        """Drop whole records from one end of the log widget once it exceeds its line cap.
+
+        Performance Optimization: Evict in bulk (a tenth of the cap at a time) so the
+        Text widget is trimmed with one delete call instead of one per new line.
+        """
+        total = sum(self._log_view_line_counts)
+        if total <= self.log_view_max_lines:
+            return
+
+        target = total - self.log_view_max_lines + self.log_view_max_lines // 10
+        evicted_lines = 0
+        evicted_records = 0
+        while self._log_view_line_counts and evicted_lines < target:
+            if from_top:
+                evicted_lines += self._log_view_line_counts.popleft()
+            else:
+                evicted_lines += self._log_view_line_counts.pop()
+            evicted_records += 1
+        # Collapsed records without their summary line would be unreachable
+        while not from_top and self._log_view_line_counts and self._log_view_line_counts[-1] == 0:
+            self._log_view_line_counts.pop()
+            evicted_records += 1
+
+        state = self.output_text.cget('state')
+        self.output_text.config(state=tk.NORMAL)
+        if from_top:
+            self.output_text.delete("1.0", f"{evicted_lines + 1}.0")
+            self._log_view_first += evicted_records
+        else:
+            remaining = sum(self._log_view_line_counts)
+            self.output_text.delete(f"{remaining + 1}.0", tk.END)
+            self._log_view_end -= evicted_records
+            self._log_view_following = False
+        self.output_text.config(state=state)
+
+    def _on_log_scrolled(self, first, last):
+        """Scrollbar callback that pages records in from the session log at either end."""
+        self.log_scrollbar.set(first, last)
+        if self._log_paging_scheduled:
+            return
+        if float(first) <= 0.0 and self._log_view_first > self._log_view_floor:
+            self._log_paging_scheduled = True
+            self.root.after_idle(self._page_log_backward)
+        elif float(last) >= 1.0 and not self._log_view_following:
+            self._log_paging_scheduled = True
+            self.root.after_idle(self._page_log_forward)
+
+    def _render_log_records(self, records, run=None, coalesce=None):
+        """Build Text insert arguments and per-record line counts for (timestamp, message, level) records.
+
+        Performance Optimization: Runs of build lines with the same pattern (see
+        log_line_pattern) are shown as their first line plus one clickable summary
+        line owned by the run's last record; the other records take no widget lines.
+        run is the (pattern, collapsed) state of the text being appended to. Returns
+        (inserts, line_counts, run, extends_tail), where extends_tail means the first
+        records continued a run whose summary line is already in the widget.
+        """
+        if coalesce is None:
+            coalesce = self.default_settings.get('coalesce_build_output', True)
+        inserts = []
+        line_counts = []
+        pattern, collapsed = run or (None, 0)
+        extends_tail = False
+        summary_in_batch = False
+        for stamp, message, level in records:
+            key = log_line_pattern(message, level) if coalesce else None
+            if key is not None and key == pattern:
+                if summary_in_batch:
+                    del inserts[-2:]
+                    line_counts[-1] = 0
+                elif collapsed:
+                    extends_tail = True
+                collapsed += 1
+                inserts.extend([f"        ⋯ {collapsed} more similar line{'s' if collapsed > 1 else ''} "
+                                f"(click to expand)\n", "coalesced"])
+                line_counts.append(1)
+                summary_in_batch = True
+                continue
+
+            pattern, collapsed, summary_in_batch = key, 0, False
+            inserts.extend([f"[{stamp}] ", "timestamp", f"{message}\n", level])
+            line_counts.append(message.count('\n') + 1)
+        return inserts, line_counts, (pattern, collapsed), extends_tail
+
+    def _insert_log_records(self, index, records, coalesce=None):
+        """Insert (timestamp, message, level) records at a widget index; returns per-record line counts."""
+        inserts, line_counts, _, _ = self._render_log_records(records, coalesce=coalesce)
+        if inserts:
+            self.output_text.insert(index, *inserts)
+        return line_counts
+
+    def _expand_log_run(self, line):
+        """Replace the summary line at a widget line with the raw records it stands for."""
+        counts = self._log_view_line_counts
+        seen = 0
+        for owner, count in enumerate(counts):
+            seen += count
+            if seen >= line:
+                break
+        else:
+            return
+        if "coalesced" not in self.output_text.tag_names(f"{line}.0"):
+            return
+        first = owner
+        while first > 0 and counts[first - 1] == 0:
+            first -= 1
+
+        records = self.session_log.read(self._log_view_first + first, self._log_view_first + owner + 1)
+        self.output_text.config(state=tk.NORMAL)
+        self.output_text.delete(f"{line}.0", f"{line + 1}.0")
+        line_counts = self._insert_log_records(f"{line}.0", records, coalesce=False)
+        self.output_text.config(state=tk.DISABLED)
+        for i, count in enumerate(line_counts):
+            counts[first + i] = count
+        if owner == len(counts) - 1:
+            self._log_tail_run = None
+
+    def _on_coalesced_click(self, event):
+        """Expand the collapsed run whose summary line was clicked."""
+        index = self.output_text.index(f"@{event.x},{event.y}")
+        self._expand_log_run(int(index.split('.')[0]))
+
+    def _page_log_backward(self):
+        """Load the page of records preceding the widget window from disk."""
+        self._log_paging_scheduled = False
+        page = self.log_view_max_lines // 5
+        start = max(self._log_view_floor, self._log_view_first - page)
+        records = self.session_log.read(start, self._log_view_first)
+        if not records:
+            return
+
+        self.output_text.config(state=tk.NORMAL)
+        line_counts = self._insert_log_records("1.0", records)
+        self._log_view_line_counts.extendleft(reversed(line_counts))
+        self._log_view_first = start
+        self._evict_log_lines(from_top=False)
+        self.output_text.config(state=tk.DISABLED)
+
+        # Keep the previously visible top line in place
+        self.output_text.yview(f"{sum(line_counts) + 1}.0")
+
+    def _page_log_forward(self):
+        """Load the page of records following the widget window, resuming the live tail at the end."""
+        self._log_paging_scheduled = False
+        page = self.log_view_max_lines // 5
+        end = min(len(self.session_log), self._log_view_end + page)
+        records = self.session_log.read(self._log_view_end, end)
+
+        self.output_text.config(state=tk.NORMAL)
+        line_counts = self._insert_log_records(tk.END, records)
+        self._log_view_line_counts.extend(line_counts)
+        self._log_view_end = end
+        if end >= len(self.session_log):
+            self._log_view_following = True
+            self._log_tail_run = None
+        self._evict_log_lines(from_top=True)
+        self.output_text.config(state=tk.DISABLED)
+
+    def focus_log_search(self):
+        """Switch to the converter tab and focus the log search entry."""
+        if hasattr(self, 'log_search_entry'):
+            self.notebook.select(self.converter_frame)
+            self.log_search_entry.focus_set()
+            self.log_search_entry.select_range(0, tk.END)
+
+    def _refresh_log_job_filter(self):
+        """Fill the job filter with the jobs seen so far this session."""
+        self.log_job_filter.config(values=["All jobs"] + list(self.log_index.job_labels.values()))
+
+    def _get_log_filters(self):
+        """Return the (level, job id) selected in the log search bar; None means no filter."""
+        if not hasattr(self, 'log_level_filter_var'):
+            return None, None
+        level = self.log_level_filter_var.get()
+        level = None if level == "All levels" else level
+        job_label = self.log_job_filter_var.get()
+        job = next((job_id for job_id, label in self.log_index.job_labels.items() if label == job_label), None)
+        return level, job
+
+    def find_in_log(self, direction=1):
+        """Jump to the next (direction=1) or previous (-1) record matching the search bar.
+
+        Matches come from the incremental LogSearchIndex and are cached until the
+        query, the filters or the number of indexed records change.
+        """
+        import bisect
+
+        level, job = self._get_log_filters()
+        query = self.log_search_var.get().strip()
+
+        key = (query, level, job, self._log_view_floor, self.log_index.records)
+        if key != self._log_search_key:
+            self._log_search_key = key
+            self._log_search_results = self.log_index.search(query, level, job, start=self._log_view_floor)
+        results = self._log_search_results
+
+        if results is None:
+            self.log_search_status.config(text="")
+            return
+        if not results:
+            self.log_search_status.config(text="No matches")
+            return
+
+        # Step relative to the last match shown; start from the newest match
+        position = self._log_search_position
+        if position is None:
+            i = len(results) - 1
+        elif direction > 0:
+            i = bisect.bisect_right(results, position)
+            if i == len(results):
+                i = 0
+        else:
+            i = bisect.bisect_left(results, position) - 1
+            if i < 0:
+                i = len(results) - 1
+
+        self._log_search_position = results[i]
+        self.log_search_status.config(text=f"{i + 1} of {len(results)}")
+        self._show_log_record(results[i])
+
+    def _render_log_window(self, record, coalesce=None):
+        """Replace the widget contents with a window of records centred on record."""
+        page = self.log_view_max_lines // 2
+        start = max(self._log_view_floor, record - page // 2)
+        end = min(len(self.session_log), start + page)
+        self.output_text.config(state=tk.NORMAL)
+        self.output_text.delete("1.0", tk.END)
+        self._log_view_line_counts = deque(self._insert_log_records(
+            tk.END, self.session_log.read(start, end), coalesce=coalesce))
+        self.output_text.config(state=tk.DISABLED)
+        self._log_view_first = start
+        self._log_view_end = end
+
+    def _show_log_record(self, record):
+        """Bring a session log record into view and highlight it, re-rendering the window if needed."""
+        if not self._log_view_first <= record < self._log_view_end:
+            self._render_log_window(record)
+        if self._log_view_line_counts[record - self._log_view_first] == 0:
+            # The record is hidden in a collapsed run: show this window uncollapsed
+            self._render_log_window(record, coalesce=False)
+
+        # Stop tailing so new records don't scroll the match away
+        self._log_view_following = False
+        counts = self._log_view_line_counts
+        offset = record - self._log_view_first
+        line = sum(islice(counts, offset)) + 1
+        self.output_text.tag_remove("search_match", "1.0", tk.END)
+        self.output_text.tag_add("search_match", f"{line}.0", f"{line + counts[offset]}.0")
+        self.output_text.see(f"{line}.0")
 
     def _do_write_log(self, message, level):
         """Actually write to the log widget. Should only be called from the main UI thread."""
@@ -200,6 +2684,17 @@ class ModernPy2ExeConverter:
             'theme': 'dark',
             'font_size': 10,
             'corner_radius': 10,
+            'smoke_test_enabled': False,
+            'smoke_test_args': '',
+            'smoke_test_timeout': 10,
+            'log_view_max_lines': 5000,
+            'stream_build_output': True,
+            'coalesce_build_output': True,
+            'stall_threshold_ms': 200,
+            'metrics_port': 0,
+            'icon_search_workers': 8,
+            'icon_search_max_depth': 0,
+            'icon_search_ignore': '',
             'custom_theme': {
                 'name': 'Custom',
                 'bg': '#0f172a',
@@ -735,24 +3230,22 @@ class ModernPy2ExeConverter:
         buttons_frame.pack(fill='x', pady=(15, 0))
 
         # Check PyInstaller button
-        def check_pyinstaller():
-            if self._pyinstaller_version:
+        def show_pyinstaller_status(version):
+            if version:
                 messagebox.showinfo("PyInstaller Status",
-                                   f"✅ PyInstaller is installed\nVersion: {self._pyinstaller_version}")
+                                   f"✅ PyInstaller is installed\nVersion: {version}")
                 return
 
-            try:
-                result = subprocess.run(["pyinstaller", "--version"],
-                                      capture_output=True, text=True, check=True)
-                self._pyinstaller_version = result.stdout.strip()
-                messagebox.showinfo("PyInstaller Status",
-                                   f"✅ PyInstaller is installed\nVersion: {self._pyinstaller_version}")
-            except (FileNotFoundError, subprocess.CalledProcessError):
-                result = messagebox.askyesno("PyInstaller Not Found",
-                    "❌ PyInstaller is not installed or not found in PATH.\n\n"
-                    "Would you like to install it now?")
-                if result:
-                    self.install_pyinstaller()
+            result = messagebox.askyesno("PyInstaller Not Found",
+                "❌ PyInstaller is not installed or not found in PATH.\n\n"
+                "Would you like to install it now?")
+            if result:
+                self.executor.submit('install_pyinstaller', lambda task: self.install_pyinstaller(task.token))
+
+        def check_pyinstaller():
+            # The version check spawns a process, so it runs off the Tk thread
+            self.executor.submit('check_pyinstaller', lambda task: self._get_pyinstaller_status(),
+                                 on_done=show_pyinstaller_status)
 
         self.create_modern_button(buttons_frame, "🔍 Check PyInstaller",
                                  check_pyinstaller, 'left', style='primary')
@@ -769,9 +3262,8 @@ class ModernPy2ExeConverter:
                                  open_output_dir, 'left', style='success')
 
 
-        # Add Help menu with embedded documentation (if available)
-        if EMBEDDED_DOCS_AVAILABLE:
-            self.add_help_menu()
+        # Add Help menu (with embedded documentation if available)
+        self.add_help_menu()
 
     def add_help_menu(self):
         """Add Help menu to the application."""
@@ -787,9 +3279,21 @@ class ModernPy2ExeConverter:
             # Add Help menu
             help_menu = tk.Menu(menubar, tearoff=0)
             menubar.add_cascade(label="📚 Help", menu=help_menu)
-
-            help_menu.add_command(label="📖 User Guide & Documentation",
-                                 command=show_embedded_help)
+            self.help_menu = help_menu
+
+            if EMBEDDED_DOCS_AVAILABLE:
+                help_menu.add_command(label="📖 User Guide & Documentation",
+                                     command=show_embedded_help)
+                help_menu.add_separator()
+            help_menu.add_command(label="🐢 UI Stall Report",
+                                 command=self.show_stall_report)
+            self.profiling_var = tk.BooleanVar(value=self.profiler.enabled)
+            help_menu.add_checkbutton(label="🔬 Profile Operations (Developer Mode)",
+                                     variable=self.profiling_var, command=self.toggle_profiling)
+            help_menu.add_command(label="📈 Profile Reports",
+                                 command=self.show_profile_report)
+            help_menu.add_command(label="🧭 Export Performance Trace...",
+                                 command=self.export_trace)
             help_menu.add_separator()
             help_menu.add_command(label="ℹ️ About",
                                  command=self.show_about_dialog)
@@ -798,6 +3302,185 @@ class ModernPy2ExeConverter:
             # Fail silently if menu creation fails
             pass
 
+    def export_trace(self):
+        """Save the recorded pipeline spans as a Chrome/Perfetto trace JSON file."""
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("Chrome trace", "*.json"), ("All files", "*.*")],
+            initialfile=f"py2exe-trace-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json",
+            title="Export Performance Trace"
+        )
+        if not filename:
+            return
+        try:
+            count = self.tracer.export(filename)
+            self.log_output(f"🧭 Exported {count} spans to {filename} (open in ui.perfetto.dev or chrome://tracing)",
+                            "success")
+        except OSError as e:
+            messagebox.showerror("Export Error", f"Could not export trace: {e}")
+
+    def _setup_metrics(self):
+        """Declare the exported metrics and start the endpoint if a port is configured."""
+        metrics = self.metrics
+        metrics.declare('py2exe_jobs', 'gauge', "Conversion jobs of the current batch by state.")
+        metrics.declare('py2exe_jobs_total', 'counter', "Finished conversion builds by status.")
+        metrics.declare('py2exe_smoke_tests_total', 'counter', "Post-build smoke tests by result.")
+        metrics.declare('py2exe_build_duration_seconds', 'histogram', "Wall time of PyInstaller builds.")
+        metrics.declare('py2exe_build_phase_seconds', 'histogram', "Wall time of each PyInstaller phase.")
+        metrics.declare('py2exe_cache_requests_total', 'counter', "Shape mask and shaped icon cache lookups.")
+        metrics.declare_callback('py2exe_cache_hit_ratio', 'gauge', "Hit ratio of the icon caches.",
+                                 self._cache_hit_ratios)
+        metrics.declare_callback('py2exe_icon_cache_entries', 'gauge', "Entries in the icon caches.",
+                                 lambda: {(('cache', 'mask'),): len(self._mask_cache),
+                                          (('cache', 'shaped_icon'),): len(self.shaped_icons_cache)})
+        metrics.declare_callback('py2exe_log_queue_depth', 'gauge', "Log messages waiting for the UI thread.",
+                                 self.log_queue.qsize)
+        metrics.declare_callback('py2exe_log_records_total', 'counter', "Records written to the session log.",
+                                 lambda: len(self.session_log))
+        metrics.declare_callback('py2exe_ui_stalls_total', 'counter', "Event-loop stalls over the threshold.",
+                                 lambda: self.stall_monitor.stall_count)
+        metrics.declare_callback('py2exe_ui_latency_max_seconds', 'gauge', "Worst event-loop latency seen.",
+                                 lambda: self.stall_monitor.latency['max_ms'] / 1000)
+        metrics.declare_callback('py2exe_background_tasks', 'gauge', "Running background executor tasks.",
+                                 lambda: len(self.executor.tasks))
+        self._apply_metrics_port()
+
+    def _cache_hit_ratios(self):
+        ratios = {}
+        for cache in ('mask', 'shaped_icon'):
+            hits = self.metrics.value('py2exe_cache_requests_total', cache=cache, result='hit')
+            misses = self.metrics.value('py2exe_cache_requests_total', cache=cache, result='miss')
+            if hits + misses:
+                ratios[(('cache', cache),)] = round(hits / (hits + misses), 4)
+        return ratios
+
+    def _apply_metrics_port(self):
+        """Start, restart or stop the metrics endpoint to match the configured port."""
+        port = int(os.environ.get(METRICS_PORT_ENV) or self.default_settings.get('metrics_port', 0) or 0)
+        if self.metrics_server is not None:
+            if self.metrics_server.port == port:
+                return
+            self.metrics_server.stop()
+            self.metrics_server = None
+        if port:
+            try:
+                self.metrics_server = MetricsServer(self.metrics, port).start()
+                self.log_output(f"📡 Metrics endpoint: http://127.0.0.1:{port}/metrics", "info")
+            except OSError as e:
+                self.log_output(f"Could not start metrics endpoint on port {port}: {e}", "warning")
+
+    def _profiled(self, operation, fn):
+        """Wrap a background task function so each run is profiled as one operation."""
+        def run(task, *args):
+            with self.profiler.profile(operation):
+                return fn(task, *args)
+        return run
+
+    def toggle_profiling(self):
+        """Turn per-operation profiling on or off from the Help menu."""
+        self.profiler.enabled = self.profiling_var.get()
+        if self.profiler.enabled:
+            self.log_output(f"🔬 Profiling enabled; stats are saved to {self.profiler.profile_dir}", "info")
+        else:
+            self.log_output("🔬 Profiling disabled", "info")
+
+    def show_profile_report(self):
+        """Show the top cumulative functions of a saved profile, newest first."""
+        profiles = self.profiler.recent_profiles()
+        if not profiles:
+            messagebox.showinfo("Profile Reports",
+                                "No profiles saved yet.\n\nEnable Help → Profile Operations (or set "
+                                f"{PROFILE_ENV}=1) and run a conversion, icon creation, icon search "
+                                "or theme switch.")
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("Profile Reports")
+        window.geometry("1000x600")
+        window.configure(bg=self.colors['bg'])
+
+        controls = tk.Frame(window, bg=self.colors['bg'])
+        controls.pack(fill='x', padx=15, pady=10)
+
+        names = [os.path.basename(path) for path in profiles]
+        profile_var = tk.StringVar(value=names[0])
+        ttk.Combobox(controls, textvariable=profile_var, values=names, state='readonly',
+                     width=50).pack(side='left')
+
+        ttk.Label(controls, text="Top:").pack(side='left', padx=(15, 5))
+        top_var = tk.IntVar(value=30)
+        ttk.Spinbox(controls, from_=5, to=200, increment=5, textvariable=top_var, width=5).pack(side='left')
+
+        sort_var = tk.StringVar(value='cumulative')
+        ttk.Combobox(controls, textvariable=sort_var, values=['cumulative', 'tottime', 'ncalls'],
+                     state='readonly', width=12).pack(side='left', padx=15)
+
+        report_text = tk.Text(window, bg=self.colors['card'], fg=self.colors['fg'], font=self.mono_font,
+                              borderwidth=0, wrap=tk.NONE)
+        report_text.pack(fill='both', expand=True, padx=15, pady=(0, 15))
+
+        def show(event=None):
+            path = profiles[names.index(profile_var.get())]
+            try:
+                report = format_profile_stats(path, top_var.get(), sort_var.get())
+            except Exception as e:
+                report = f"Could not read {path}: {e}"
+            report_text.delete('1.0', tk.END)
+            report_text.insert('1.0', report)
+
+        self.create_modern_button(controls, "🔄 Show", show, 'left', style='primary')
+        show()
+
+    def show_stall_report(self):
+        """Show the recorded UI stalls grouped by handler, worst first."""
+        monitor = self.stall_monitor
+        latency = monitor.latency
+        average = latency['total_ms'] / latency['ticks'] if latency['ticks'] else 0.0
+
+        window = tk.Toplevel(self.root)
+        window.title("UI Stall Report")
+        window.geometry("900x550")
+        window.configure(bg=self.colors['bg'])
+
+        summary = (f"Event-loop latency: last {latency['last_ms']:.0f} ms · average {average:.1f} ms · "
+                   f"max {latency['max_ms']:.0f} ms · {monitor.stall_count} stalls over "
+                   f"{monitor.threshold_ms} ms")
+        tk.Label(window, text=summary, bg=self.colors['bg'], fg=self.colors['fg'],
+                 font=('Segoe UI', self.base_font_size)).pack(anchor='w', padx=15, pady=10)
+
+        columns = ('count', 'worst', 'total', 'line')
+        tree = ttk.Treeview(window, columns=columns, height=10)
+        tree.heading('#0', text='Handler')
+        tree.heading('count', text='Stalls')
+        tree.heading('worst', text='Worst (ms)')
+        tree.heading('total', text='Total (ms)')
+        tree.heading('line', text='Blocked at')
+        tree.column('#0', width=280)
+        for column, width in (('count', 60), ('worst', 90), ('total', 90), ('line', 300)):
+            tree.column(column, width=width, anchor='e' if column != 'line' else 'w')
+        tree.pack(fill='x', padx=15)
+
+        stack_text = tk.Text(window, bg=self.colors['card'], fg=self.colors['fg'], font=self.mono_font,
+                             borderwidth=0, height=12)
+        stack_text.pack(fill='both', expand=True, padx=15, pady=10)
+
+        stacks = {}
+        for handler, count, worst_ms, total_ms, worst in monitor.report():
+            item = tree.insert('', 'end', text=handler,
+                               values=(count, f"{worst_ms:.0f}", f"{total_ms:.0f}", worst['hot_line']))
+            stacks[item] = (f"Worst stall at {worst['time']}: {worst_ms:.0f} ms, "
+                            f"{worst['samples']} stack samples\n\n{worst['stack']}")
+
+        def show_stack(event=None):
+            selected = tree.selection()
+            stack_text.delete('1.0', tk.END)
+            if selected:
+                stack_text.insert('1.0', stacks[selected[0]])
+
+        tree.bind('<<TreeviewSelect>>', show_stack)
+        if not stacks:
+            stack_text.insert('1.0', "No stalls recorded yet.")
+
     def show_about_dialog(self):
         """Show about dialog."""
         from tkinter import messagebox
@@ -985,6 +3668,29 @@ Use Help menu to access guides and export files."""
         cb3 = self.create_modern_checkbox(basic_frame, "🐛 Debug mode", self.debug_var)
         cb3.pack(side='left', padx=15)
 
+        # Post-build smoke test
+        smoke_frame = tk.Frame(options_frame, bg=self.colors['surface'])
+        smoke_frame.pack(fill='x', padx=15, pady=10)
+
+        self.smoke_test_var = tk.BooleanVar(value=self.default_settings.get('smoke_test_enabled', False))
+        cb_smoke = self.create_modern_checkbox(smoke_frame, "🧪 Smoke-test executables after build",
+                                               self.smoke_test_var)
+        cb_smoke.pack(side='left', padx=15)
+        self.create_tooltip(cb_smoke, "Launch each new executable and fail the build if it crashes on startup")
+
+        ttk.Label(smoke_frame, text="Arguments:").pack(side='left', padx=(15, 0))
+        self.smoke_args_entry = tk.Entry(smoke_frame,
+                                         bg=self.colors['card'],
+                                         fg=self.colors['fg'],
+                                         insertbackground=self.colors['fg'],
+                                         borderwidth=0,
+                                         highlightthickness=1,
+                                         highlightbackground=self.colors['border'],
+                                         highlightcolor=self.colors['accent'],
+                                         font=('Segoe UI', self.base_font_size + 1))
+        self.smoke_args_entry.pack(side='left', fill='x', expand=True, padx=15)
+        self.smoke_args_entry.insert(0, self.default_settings.get('smoke_test_args', ''))
+
         # Icon selection
         icon_frame = tk.Frame(options_frame, bg=self.colors['surface'])
         icon_frame.pack(fill='x', padx=15, pady=10)
@@ -1054,8 +3760,18 @@ Use Help menu to access guides and export files."""
         self.hidden_listbox.config(yscrollcommand=hidden_scrollbar.set)
         hidden_scrollbar.config(command=self.hidden_listbox.yview)
 
+        # Suggested hidden imports (filled in after builds), shown only when non-empty
+        self.hidden_import_suggestions = OrderedDict()
+        self.suggestions_frame = tk.Frame(hidden_frame, bg=self.colors['surface'])
+        tk.Label(self.suggestions_frame, text="💡 Suggested:",
+                 bg=self.colors['surface'], fg=self.colors['warning'],
+                 font=('Segoe UI', self.base_font_size)).pack(side='left', anchor='n', pady=6)
+        self.suggestions_buttons_frame = tk.Frame(self.suggestions_frame, bg=self.colors['surface'])
+        self.suggestions_buttons_frame.pack(side='left', fill='x', expand=True, padx=(10, 0))
+
         hidden_buttons = tk.Frame(hidden_frame, bg=self.colors['surface'])
         hidden_buttons.pack(fill='x', pady=10)
+        self.hidden_buttons_frame = hidden_buttons
 
         btn_add_hidden = self.create_modern_button(hidden_buttons, "➕ Add Import",
                                  self.add_hidden_import, 'left', style='primary')
@@ -1087,6 +3803,18 @@ Use Help menu to access guides and export files."""
                                                      style='warning')
         self.create_tooltip(self.validate_btn, "Check if all settings are correct before conversion")
 
+        self.trace_btn = self.create_modern_button(button_frame, "🔬 Trace Run",
+                                                  self.start_trace_run, 'left')
+        self.create_tooltip(self.trace_btn, "Record the modules a real run imports and offer a trimmed rebuild")
+
+        self.importtime_btn = self.create_modern_button(button_frame, "⏱️ Import Profile",
+                                                       self.start_import_profile, 'left')
+        self.create_tooltip(self.importtime_btn, "Find slow top-level imports in the selected script")
+
+        btn_history = self.create_modern_button(button_frame, "📜 Build History",
+                                                self.show_build_history, 'left')
+        self.create_tooltip(btn_history, "Duration, CPU time, peak memory and I/O of past builds")
+
         # Progress bar
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(controls_frame,
@@ -1107,6 +3835,38 @@ Use Help menu to access guides and export files."""
         log_frame = ttk.LabelFrame(parent, text="📋 Conversion Log")
         log_frame.pack(fill='both', expand=True, padx=15, pady=10)
 
+        # Search bar backed by the incremental log index
+        search_bar = tk.Frame(log_frame, bg=self.colors['surface'])
+        search_bar.pack(fill='x', padx=15, pady=(10, 0))
+
+        tk.Label(search_bar, text="🔍", bg=self.colors['surface'], fg=self.colors['fg']).pack(side='left')
+        self.log_search_var = tk.StringVar()
+        self.log_search_entry = ttk.Entry(search_bar, textvariable=self.log_search_var, width=30)
+        self.log_search_entry.pack(side='left', padx=(5, 10))
+        self.log_search_entry.bind('<Return>', lambda e: self.find_in_log(1))
+        self.log_search_entry.bind('<Shift-Return>', lambda e: self.find_in_log(-1))
+        self.create_tooltip(self.log_search_entry,
+                            "Search the whole session log (Enter: next, Shift+Enter: previous, Ctrl+F: focus)")
+
+        self.log_level_filter_var = tk.StringVar(value="All levels")
+        level_filter = ttk.Combobox(search_bar, textvariable=self.log_level_filter_var, state='readonly', width=11,
+                                    values=["All levels", "info", "success", "warning", "error", "build"])
+        level_filter.pack(side='left', padx=(0, 5))
+        level_filter.bind('<<ComboboxSelected>>', lambda e: self.find_in_log(1))
+
+        self.log_job_filter_var = tk.StringVar(value="All jobs")
+        self.log_job_filter = ttk.Combobox(search_bar, textvariable=self.log_job_filter_var, state='readonly',
+                                           width=28, postcommand=self._refresh_log_job_filter)
+        self.log_job_filter.pack(side='left', padx=(0, 10))
+        self.log_job_filter.bind('<<ComboboxSelected>>', lambda e: self.find_in_log(1))
+
+        self.create_modern_button(search_bar, "▲", lambda: self.find_in_log(-1), 'left')
+        self.create_modern_button(search_bar, "▼", lambda: self.find_in_log(1), 'left')
+
+        self.log_search_status = tk.Label(search_bar, text="", bg=self.colors['surface'], fg=self.colors['border'],
+                                          font=('Segoe UI', self.base_font_size - 1))
+        self.log_search_status.pack(side='left', padx=10)
+
         # Log text widget with scrollbar
         log_container = tk.Frame(log_frame, bg=self.colors['surface'])
         log_container.pack(fill='both', expand=True, padx=15, pady=15)
@@ -1125,11 +3885,12 @@ Use Help menu to access guides and export files."""
                                   font=self.mono_font)
         self.output_text.pack(side='left', fill='both', expand=True)
 
-        log_scrollbar = ttk.Scrollbar(log_container, orient='vertical')
-        log_scrollbar.pack(side='right', fill='y')
+        self.log_scrollbar = ttk.Scrollbar(log_container, orient='vertical')
+        self.log_scrollbar.pack(side='right', fill='y')
 
-        self.output_text.config(yscrollcommand=log_scrollbar.set)
-        log_scrollbar.config(command=self.output_text.yview)
+        # Scrolling past either end of the bounded window pages records in from disk
+        self.output_text.config(yscrollcommand=self._on_log_scrolled)
+        self.log_scrollbar.config(command=self.output_text.yview)
 
         # Log controls
         log_controls = tk.Frame(log_frame, bg=self.colors['surface'])
@@ -1141,18 +3902,29 @@ Use Help menu to access guides and export files."""
 
         btn_save_log = self.create_modern_button(log_controls, "💾 Save Log",
                                  self.save_log, 'left', style='primary')
-        self.create_tooltip(btn_save_log, "Save the current log to a text file (Ctrl+S)")
+        self.create_tooltip(btn_save_log, "Save the full session log to a text file, .gz to compress; the level and job filters apply (Ctrl+S)")
 
         btn_copy_log = self.create_modern_button(log_controls, "📋 Copy Log",
                                  self.copy_log_to_clipboard, 'left')
         self.create_tooltip(btn_copy_log, "Copy all log text to clipboard")
 
+        self.log_metrics_label = tk.Label(log_controls, text="",
+                                          bg=self.colors['surface'], fg=self.colors['border'],
+                                          font=('Segoe UI', self.base_font_size - 1))
+        self.log_metrics_label.pack(side='right')
+        self.create_tooltip(self.log_metrics_label, "Log queue depth, drain lag and total session lines")
+
         # Initialize log tags
         self._setup_log_tags()
 
         # Initial welcome message
         self.log_output("🎉 Welcome to Modern Python to EXE Converter v4.0", "info")
         self.log_output(f"Session started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", "info")
+        if self.session_log.in_memory:
+            self.log_output(f"⚠️ Could not create {self.session_log.path} - this session's log is kept in memory",
+                            "warning")
+        else:
+            self.log_output(f"Full session log: {self.session_log.path}", "info")
         self.log_output("💡 New features: Desktop defaults, auto icon selection, settings tab, rounded icons", "info")
 
     # Continue with rest of methods in next part...
@@ -1361,10 +4133,10 @@ Use Help menu to access guides and export files."""
             self.log_output(f"Icon file selected: {os.path.basename(icon_file)}", "info")
 
     def add_hidden_import(self):
-        """Add a hidden import module."""
+        """Add a hidden import module with completion from the installed-module index."""
         dialog = tk.Toplevel(self.root)
         dialog.title("Add Hidden Import")
-        dialog.geometry("400x150")
+        dialog.geometry("400x330")
         dialog.configure(bg=self.colors['surface'])
         dialog.resizable(False, False)
 
@@ -1387,34 +4159,143 @@ Use Help menu to access guides and export files."""
                                font=('Segoe UI', self.base_font_size + 1))
         entry_module.pack(pady=5)
 
+        # Completion list driven by the module index
+        completions = tk.Listbox(dialog, width=40, height=6,
+                                 bg=self.colors['card'],
+                                 fg=self.colors['fg'],
+                                 selectbackground=self.colors['accent'],
+                                 selectforeground='white',
+                                 borderwidth=0,
+                                 highlightthickness=1,
+                                 highlightbackground=self.colors['border'],
+                                 font=('Segoe UI', self.base_font_size))
+        completions.pack(pady=5)
+
+        index_status = "Loading installed modules..." if not self.module_index.ready.is_set() else ""
+        status_label = tk.Label(dialog, text=index_status,
+                                bg=self.colors['surface'], fg=self.colors['border'],
+                                font=('Segoe UI', self.base_font_size - 1))
+        status_label.pack()
+
         # Buttons
         button_frame = tk.Frame(dialog, bg=self.colors['surface'])
         button_frame.pack(pady=15)
 
-        def add_to_list():
+        def update_completions(event=None):
+            if event is not None and event.keysym in ('Up', 'Down', 'Return', 'Tab'):
+                return
             module = entry_module.get().strip()
-            if module:
-                if module not in self.hidden_listbox.get(0, tk.END):
-                    self.hidden_listbox.insert(tk.END, module)
-                    self.log_output(f"Added hidden import: {module}", "success")
-                    dialog.destroy()
-                else:
-                    messagebox.showinfo("Already Added", f"Module '{module}' is already in the list.")
+            completions.delete(0, tk.END)
+            matches = self.module_index.complete(module)
+            if matches:
+                completions.insert(tk.END, *matches)
+
+            if not module or self.module_index.is_valid(module):
+                entry_module.config(highlightbackground=self.colors['border'])
+                status_label.config(text="" if self.module_index.ready.is_set() else "Loading installed modules...",
+                                    fg=self.colors['border'])
             else:
+                entry_module.config(highlightbackground=self.colors['error'])
+                status_label.config(text=f"⚠️ '{module}' is not importable in {os.path.basename(self.module_index.python)}",
+                                    fg=self.colors['error'])
+
+        def use_completion(event=None):
+            selected = completions.curselection()
+            if selected:
+                entry_module.delete(0, tk.END)
+                entry_module.insert(0, completions.get(selected[0]))
+                entry_module.icursor(tk.END)
+                entry_module.focus_set()
+                update_completions()
+            return "break"
+
+        def move_selection(step):
+            size = completions.size()
+            if not size:
+                return "break"
+            selected = completions.curselection()
+            index = (selected[0] + step) % size if selected else (0 if step > 0 else size - 1)
+            completions.selection_clear(0, tk.END)
+            completions.selection_set(index)
+            completions.see(index)
+            return "break"
+
+        def insert_module(module):
+            if module not in self.hidden_listbox.get(0, tk.END):
+                self.hidden_listbox.insert(tk.END, module)
+                self.log_output(f"Added hidden import: {module}", "success")
+                dialog.destroy()
+            else:
+                messagebox.showinfo("Already Added", f"Module '{module}' is already in the list.")
+
+        def spec_checked(module, found):
+            # Delivered through the UI bus; the dialog may be gone or the name edited meanwhile
+            if not dialog.winfo_exists() or entry_module.get().strip() != module:
+                return
+            if found is not False:
+                entry_module.config(highlightbackground=self.colors['border'])
+                status_label.config(text="", fg=self.colors['border'])
+                insert_module(module)
+                return
+            entry_module.config(highlightbackground=self.colors['error'])
+            status_label.config(text=f"⚠️ '{module}' is not importable in {os.path.basename(self.module_index.python)}",
+                                fg=self.colors['error'])
+            if messagebox.askyesno(
+                    "Module Not Found",
+                    f"'{module}' was not found in the target interpreter and would likely fail the build.\n\n"
+                    "Add it anyway?", parent=dialog):
+                insert_module(module)
+
+        def add_to_list():
+            module = entry_module.get().strip()
+            if not module:
                 messagebox.showwarning("Invalid Input", "Please provide a module name.")
+            elif module in self.module_index.name_set:
+                insert_module(module)
+            else:
+                # The index can miss deep modules and aliases: confirm in the target interpreter,
+                # off the Tk thread since it starts a subprocess
+                status_label.config(text=f"Checking '{module}' in {os.path.basename(self.module_index.python)}...",
+                                    fg=self.colors['border'])
+                self.executor.submit('find_spec', lambda task: self.module_index.find_spec(module),
+                                     on_done=lambda found: spec_checked(module, found),
+                                     on_error=lambda e: spec_checked(module, None))
 
         self.create_modern_button(button_frame, "Add", add_to_list, 'left', style='success')
         self.create_modern_button(button_frame, "Cancel", dialog.destroy, 'left', style='danger')
 
-        # Focus on entry and bind Enter key
+        # Refresh once the background index finishes loading
+        def wait_for_index():
+            if not dialog.winfo_exists():
+                return
+            if self.module_index.ready.is_set():
+                update_completions()
+            else:
+                dialog.after(200, wait_for_index)
+
+        wait_for_index()
+
+        # Focus on entry and bind keys
         entry_module.focus_set()
-        entry_module.bind('<Return>', lambda e: add_to_list())
+        entry_module.bind('<KeyRelease>', update_completions)
+        entry_module.bind('<Down>', lambda e: move_selection(1))
+        entry_module.bind('<Up>', lambda e: move_selection(-1))
+        entry_module.bind('<Tab>', use_completion)
+        entry_module.bind('<Return>', lambda e: use_completion() if completions.curselection() else add_to_list())
+        completions.bind('<Double-1>', use_completion)
 
     # Logging and validation methods
-    def log_output(self, message, level="info"):
-        """Log a message via a thread-safe queue. This is more efficient and prevents UI hangs."""
+    def log_output(self, message, level="info", job=None, phase=None):
+        """Log a message via a thread-safe queue. This is more efficient and prevents UI hangs.
+
+        job is the conversion job dict (with 'id' and 'script') the message belongs
+        to and phase the pipeline stage; both are recorded in the structured log.
+        """
         if hasattr(self, 'log_queue'):
-            self.log_queue.put((message, level))
+            now = time.time()
+            self.log_queue.put((message, level, now, job))
+            self.json_log.emit(level, message, job, phase, now)
+            self.ui_bus.wake()
         else:
             # Fallback for early logging if queue is not yet initialized
             timestamp = datetime.now().strftime("%H:%M:%S")
@@ -1430,33 +4311,94 @@ Use Help menu to access guides and export files."""
         self.output_text.tag_config("success", foreground=self.colors['success'])
         self.output_text.tag_config("warning", foreground=self.colors['warning'])
         self.output_text.tag_config("error", foreground=self.colors['error'])
+        self.output_text.tag_config("build", foreground=self.colors['border'])
+        self.output_text.tag_config("search_match", background=self.colors['border'])
+        self.output_text.tag_config("coalesced", foreground=self.colors['accent'])
+        self.output_text.tag_bind("coalesced", "<Button-1>", self._on_coalesced_click)
+        self.output_text.tag_bind("coalesced", "<Enter>", lambda e: self.output_text.config(cursor='hand2'))
+        self.output_text.tag_bind("coalesced", "<Leave>", lambda e: self.output_text.config(cursor='xterm'))
 
     def clear_log(self):
-        """Clear the output log."""
+        """Clear the output log. Cleared records stay in the session log on disk."""
         self.output_text.config(state=tk.NORMAL)
         self.output_text.delete(1.0, tk.END)
         self.output_text.config(state=tk.DISABLED)
+        self._log_view_floor = self._log_view_first = self._log_view_end = len(self.session_log)
+        self._log_view_line_counts.clear()
+        self._log_view_following = True
+        self._log_tail_run = None
+        self._log_search_position = None
         self.log_output("Log cleared", "info")
 
     def save_log(self):
-        """Save the output log to a file."""
+        """Save the session log to a file.
+
+        Performance Optimization: The log is streamed in chunks from the on-disk
+        session log on a background thread instead of copying the Text widget into
+        one string on the UI thread. File names ending in .gz are gzip-compressed,
+        and the level and job filters of the log search bar apply.
+        """
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text files", "*.txt"), ("Gzip-compressed text", "*.gz"), ("All files", "*.*")],
+            title="Save Log File"
+        )
+        if not filename:
+            return
+
+        level, job = self._get_log_filters()
+        # Snapshot the matching records and session length on the UI thread
+        records = self.log_index.search(level=level, job=job) if level or job else None
+        end = len(self.session_log)
+        self.executor.submit('save_log', lambda task: self._write_log_file(filename, end, records,
+                                                                            token=task.token))
+
+    def _write_log_file(self, filename, end, records=None, chunk_records=10000, token=None):
+        """Write session log records [0, end), or only the given ascending records, to filename.
+
+        Checks token between chunks; a cancelled save removes the partial file.
+        """
+        import gzip
+
+        read_raw = self.session_log.read_raw
         try:
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".txt",
-                filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
-                title="Save Log File"
-            )
-            if filename:
-                log_content = self.output_text.get(1.0, tk.END)
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(log_content)
-                self.log_output(f"Log saved to: {filename}", "success")
+            opener = gzip.open if filename.endswith('.gz') else open
+            with opener(filename, 'wb') as f:
+                if records is None:
+                    for start in range(0, end, chunk_records):
+                        if token is not None:
+                            token.check()
+                        f.write(read_raw(start, min(end, start + chunk_records)))
+                    count = end
+                else:
+                    # Read each contiguous range of matching records in one call
+                    i = 0
+                    while i < len(records):
+                        if token is not None:
+                            token.check()
+                        j = i + 1
+                        while j < len(records) and records[j] == records[j - 1] + 1 and j - i < chunk_records:
+                            j += 1
+                        f.write(read_raw(records[i], records[j - 1] + 1))
+                        i = j
+                    count = len(records)
+            self.log_output(f"Log saved to: {filename} ({count} lines)", "success")
+        except TaskCancelled:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+            raise
         except Exception as e:
             self.log_output(f"Error saving log: {e}", "error")
-            messagebox.showerror("Save Error", f"Could not save log file: {e}")
+            self.ui_bus.call(messagebox.showerror, "Save Error", f"Could not save log file: {e}")
 
     def validate_settings(self):
         """Validate conversion settings before starting."""
+        with self.tracer.span("validation", "conversion"):
+            return self._validate_settings()
+
+    def _validate_settings(self):
         errors = []
         warnings = []
 
@@ -1538,11 +4480,19 @@ Use Help menu to access guides and export files."""
         except (FileNotFoundError, subprocess.CalledProcessError):
             return False
 
-    def install_pyinstaller(self):
-        """Install PyInstaller if not available."""
+    def install_pyinstaller(self, token=None):
+        """Install PyInstaller if not available. Cancelling token stops pip and raises TaskCancelled."""
         try:
             self.log_output("Installing PyInstaller...", "info")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
+            cmd = [sys.executable, "-m", "pip", "install", "pyinstaller"]
+            with subprocess.Popen(cmd, stdin=subprocess.DEVNULL) as process:
+                if token is not None:
+                    terminate_on_cancel(process, token)
+                returncode = process.wait()
+            if token is not None:
+                token.check()
+            if returncode:
+                raise subprocess.CalledProcessError(returncode, cmd)
 
             # Reset cache and verify installation
             self._pyinstaller_version = None
@@ -1552,11 +4502,268 @@ Use Help menu to access guides and export files."""
             else:
                 raise Exception("Installation appeared successful but PyInstaller is still not found")
 
+        except TaskCancelled:
+            self.log_output("⏹️ PyInstaller installation cancelled", "warning")
+            raise
         except Exception as e:
             self.log_output(f"Failed to install PyInstaller: {e}", "error")
-            messagebox.showerror("Installation Error", f"Failed to install PyInstaller: {e}")
+            self.ui_bus.call(messagebox.showerror, "Installation Error", f"Failed to install PyInstaller: {e}")
             return False
 
+    def _run_pyinstaller(self, cmd, stream_output=True, job=None, token=None):
+        """Run a PyInstaller command, optionally streaming its output into the log.
+
+        Raises CalledProcessError on failure, carrying the last lines of output
+        as stderr so callers can report them. The build's CPU time, peak RSS and
+        I/O are stored in job['resources'] when a job is given. Cancelling token
+        terminates PyInstaller and raises TaskCancelled.
+        """
+        tail = deque(maxlen=40)
+        tracer = self.tracer
+        script = os.path.basename(job['script']) if job else ""
+        phase, phase_start = "startup", tracer.now_us()
+        started = time.perf_counter()
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   stdin=subprocess.DEVNULL, text=True, errors='replace', bufsize=1)
+        sampler = ProcessResourceSampler(process.pid).start()
+        if token is not None:
+            terminate_on_cancel(process, token)
+        try:
+            with process:
+                for line in process.stdout:
+                    line = line.rstrip()
+                    if not line:
+                        continue
+                    tail.append(line)
+                    # Each phase announcement closes the previous phase's span, streamed or not
+                    match = PYINSTALLER_PHASE_RE.search(line)
+                    if match and match.group(1) != phase:
+                        now = tracer.now_us()
+                        tracer.add(f"PyInstaller {phase}", "pyinstaller", phase_start, now, script=script)
+                        self.metrics.observe('py2exe_build_phase_seconds', (now - phase_start) / 1e6, phase=phase)
+                        phase, phase_start = match.group(1), now
+                    if stream_output:
+                        self.log_output(line, "build", job, "build")
+                rusage = wait_with_rusage(process)
+        finally:
+            # Also stops the polling thread when reading the output fails or is interrupted
+            samples = sampler.stop()
+        if token is not None:
+            token.check()
+        now = tracer.now_us()
+        tracer.add(f"PyInstaller {phase}", "pyinstaller", phase_start, now, script=script)
+        self.metrics.observe('py2exe_build_phase_seconds', (now - phase_start) / 1e6, phase=phase)
+
+        resources = summarize_resources(time.perf_counter() - started, rusage, samples)
+        if job is not None:
+            job['resources'] = resources
+
+        output = "\n".join(tail)
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, cmd, output=output, stderr=output)
+        return output
+
+    def _log_batch_resources(self, batch_id, jobs):
+        """Log the batch's resource totals and record every job in the build history."""
+        measured = [job for job in jobs if job.get('resources')]
+        if len(measured) > 1:
+            hog = max(measured, key=lambda job: job['resources']['peak_rss_mb'])
+            cpu = sum((job['resources']['cpu_user_s'] or 0) + (job['resources']['cpu_sys_s'] or 0)
+                      for job in measured)
+            self.log_output(f"📈 Batch used {cpu:.1f} s CPU; largest peak RSS: "
+                            f"{os.path.basename(hog['script'])} ({hog['resources']['peak_rss_mb']:.0f} MB)",
+                            "info", phase="summary")
+
+        records = []
+        for job in jobs:
+            exe_size = get_path_size(job['exe']) if job['exe'] and os.path.exists(job['exe']) else None
+            records.append({
+                'time': datetime.fromtimestamp(job.get('started_at', time.time())).isoformat(timespec='seconds'),
+                'batch': batch_id,
+                'job': job['id'],
+                'script': job['script'],
+                'status': job['status'],
+                'exe_mb': round(exe_size / 1024 / 1024, 1) if exe_size is not None else None,
+                'resources': job.get('resources'),
+            })
+        append_build_history(records)
+
+    def show_build_history(self):
+        """Show recorded builds with their duration, CPU time, peak memory and I/O."""
+        records = read_build_history()
+        if not records:
+            messagebox.showinfo("Build History", "No builds recorded yet.")
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("Build History")
+        window.geometry("1100x500")
+        window.configure(bg=self.colors['bg'])
+
+        columns = (('time', "Started", 150), ('script', "Script", 170), ('status', "Status", 80),
+                   ('wall_s', "Wall (s)", 80), ('cpu_user_s', "CPU user (s)", 95), ('cpu_sys_s', "CPU sys (s)", 90),
+                   ('peak_rss_mb', "Peak RSS (MB)", 105), ('read_mb', "Read (MB)", 85),
+                   ('write_mb', "Written (MB)", 95), ('exe_mb', "EXE (MB)", 80))
+        tree = ttk.Treeview(window, columns=[key for key, _, _ in columns], show='headings')
+        scrollbar = ttk.Scrollbar(window, orient='vertical', command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y', pady=15)
+        tree.pack(fill='both', expand=True, padx=15, pady=15)
+
+        def row(record):
+            resources = record.get('resources') or {}
+            values = []
+            for key, _, _ in columns:
+                value = record.get(key, resources.get(key))
+                values.append(os.path.basename(value) if key == 'script' else ("" if value is None else value))
+            return values
+
+        def sort_by(key):
+            numeric = key not in ('time', 'script', 'status')
+            rows = [(tree.set(item, key), item) for item in tree.get_children('')]
+            if numeric:
+                rows = [(float(value) if value else -1.0, item) for value, item in rows]
+            rows.sort(reverse=numeric or key == 'time')
+            for index, (_, item) in enumerate(rows):
+                tree.move(item, '', index)
+
+        for key, heading, width in columns:
+            tree.heading(key, text=heading, command=lambda k=key: sort_by(k))
+            tree.column(key, width=width, anchor='w' if key in ('time', 'script', 'status') else 'e')
+        for record in records:
+            tree.insert('', 'end', values=row(record))
+
+    def collect_conversion_options(self):
+        """Read the conversion options from the converter tab into a plain dict."""
+        try:
+            smoke_timeout = self.smoke_timeout_var.get()
+        except tk.TclError:
+            # Spinbox text that is not a number (e.g. while being edited)
+            smoke_timeout = self.default_settings.get('smoke_test_timeout', 10)
+        return {
+            'onefile': self.onefile_var.get(),
+            'noconsole': self.noconsole_var.get(),
+            'debug': self.debug_var.get(),
+            'icon': self.icon_entry.get().strip(),
+            'hidden_imports': list(self.hidden_listbox.get(0, tk.END)),
+            'smoke_test': self.smoke_test_var.get(),
+            'smoke_args': self.smoke_args_entry.get().strip(),
+            'smoke_timeout': smoke_timeout,
+        }
+
+    def _collect_missing_module_warnings(self, jobs):
+        """Index the warn files of a batch and offer the results as hidden import suggestions."""
+        index = MissingModuleIndex()
+        total = 0
+        for job in jobs:
+            stem = os.path.splitext(os.path.basename(job['script']))[0]
+            warn_file = os.path.join(get_pyinstaller_work_dir(job['script']), f"warn-{stem}.txt")
+            if not job.get('started_at'):
+                continue
+            try:
+                # Skip stale warn files left over from earlier builds
+                if os.path.getmtime(warn_file) < job['started_at']:
+                    continue
+                total += index.add_warn_file(job['script'], warn_file)
+            except OSError:
+                continue
+
+        self.missing_module_index = index
+        suggestions = index.suggestions()
+        if not total:
+            return
+        self.log_output(f"PyInstaller reported {len(index.modules)} distinct missing modules; "
+                        f"{len(suggestions)} may need hidden imports", "warning" if suggestions else "info",
+                        phase="warnings")
+        if suggestions:
+            details = {}
+            for module, entry in suggestions:
+                importers = ', '.join(sorted(entry['importers'])[:3])
+                details[module] = (f"PyInstaller warnings ({', '.join(sorted(entry['kinds']))} import "
+                                   f"by {importers}; {len(entry['scripts'])} script(s))")
+            self.ui_bus.call(self.add_hidden_import_suggestions, details)
+
+    def _run_smoke_tests(self, jobs, options):
+        """Launch every built executable in parallel and fail jobs whose smoke run fails."""
+        from concurrent.futures import ThreadPoolExecutor
+        import shlex
+
+        if not jobs:
+            return
+        try:
+            args = shlex.split(options['smoke_args'])
+        except ValueError as e:
+            self.log_output(f"⚠️ Skipping smoke tests - invalid arguments: {e}", "warning")
+            return
+
+        timeout = options['smoke_timeout']
+        self.log_output(f"🧪 Smoke-testing {len(jobs)} executables (timeout {timeout}s)...", "info", phase="smoke")
+        self.ui_bus.post('status', self.status_label.config, {'text': "Smoke-testing executables..."})
+
+        # Performance Optimization: Smoke runs are I/O-bound waits on child processes,
+        # so run them concurrently instead of serially adding up their timeouts
+        with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 4)) as pool:
+            def smoke(job):
+                with self.tracer.span("smoke test", "conversion", script=os.path.basename(job['script'])):
+                    return smoke_test_executable(job['exe'], args, timeout)
+
+            results = list(pool.map(smoke, jobs))
+
+        suggestions = []
+        for job, smoke in zip(jobs, results):
+            name = os.path.basename(job['exe'])
+            job['smoke'] = smoke
+            self.metrics.inc('py2exe_smoke_tests_total', result='passed' if smoke['passed'] else 'failed')
+            if smoke['passed']:
+                state = "still running at timeout" if smoke['timed_out'] else f"exit code {smoke['returncode']}"
+                self.log_output(f"🧪 {name} passed smoke test ({state})", "success", job, "smoke")
+                continue
+
+            job['status'] = 'failed'
+            self.log_output(f"❌ {name} failed smoke test (exit code {smoke['returncode']})", "error", job, "smoke")
+            if smoke['traceback']:
+                self.log_output(f"Traceback:\n{smoke['traceback'][-1500:]}", "error", job, "smoke")
+            for module in smoke['missing_modules']:
+                if module not in suggestions:
+                    suggestions.append(module)
+
+        if suggestions:
+            self.log_output(f"💡 Suggested hidden imports from smoke tests: {', '.join(suggestions)}", "warning")
+            self.ui_bus.call(self.add_hidden_import_suggestions,
+                             {module: "smoke test traceback" for module in suggestions})
+
+    def add_hidden_import_suggestions(self, suggestions):
+        """Offer {module: reason} as one-click hidden imports. Must be called on the main thread."""
+        current = set(self.hidden_listbox.get(0, tk.END))
+        for module, source in suggestions.items():
+            if module not in current:
+                self.hidden_import_suggestions[module] = source
+        self._refresh_hidden_import_suggestions()
+
+    def accept_hidden_import_suggestion(self, module):
+        """Move a suggested module into the hidden imports list."""
+        self.hidden_import_suggestions.pop(module, None)
+        if module not in self.hidden_listbox.get(0, tk.END):
+            self.hidden_listbox.insert(tk.END, module)
+            self.log_output(f"Added hidden import: {module}", "success")
+        self._refresh_hidden_import_suggestions()
+
+    def _refresh_hidden_import_suggestions(self):
+        """Rebuild the suggestion buttons below the hidden imports list."""
+        for widget in self.suggestions_buttons_frame.winfo_children():
+            widget.destroy()
+
+        if not self.hidden_import_suggestions:
+            self.suggestions_frame.pack_forget()
+            return
+
+        for module, source in self.hidden_import_suggestions.items():
+            btn = self.create_modern_button(self.suggestions_buttons_frame, f"➕ {module}",
+                                            lambda m=module: self.accept_hidden_import_suggestion(m), 'left')
+            btn.pack_configure(padx=(0, 6), pady=2)
+            self.create_tooltip(btn, f"Suggested by {source}\nClick to add as hidden import")
+        self.suggestions_frame.pack(fill='x', pady=(0, 10), before=self.hidden_buttons_frame)
+
     def convert_to_exe(self):
         """Main conversion function with enhanced error handling."""
         if not self.validate_settings():
@@ -1565,113 +4772,381 @@ Use Help menu to access guides and export files."""
         files = list(self.files_listbox.get(0, tk.END))
         output_dir = self.output_entry.get().strip()
 
-        # Check and install PyInstaller if necessary (using cache if available)
-        if not self._pyinstaller_version:
-            try:
-                result = subprocess.run(["pyinstaller", "--version"], capture_output=True, text=True, check=True)
-                self._pyinstaller_version = result.stdout.strip()
-            except (FileNotFoundError, subprocess.CalledProcessError):
-                if not self.install_pyinstaller():
-                    return
+        # Performance Optimization: Extract loop-invariant configurations on the Tk thread before
+        # the batch starts. This minimizes redundant Tcl interpreter calls during batch conversions
+        options = self.collect_conversion_options()
+        stream_output = self.default_settings.get('stream_build_output', True)
 
         # Disable convert button and start progress
         self.convert_btn.config(state=tk.DISABLED, text="🔄 Converting...")
         self.progress_var.set(0)
         self.progress_bar.config(mode='determinate', maximum=len(files))
 
-        def run_conversion():
-            """Run the conversion process in a separate thread."""
-            successful_conversions = 0
+        def run_conversion(task):
+            """Run the conversion process on the background executor."""
+            batch_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+            jobs = [{'id': f"{batch_id}-{i + 1:02d}", 'script': file, 'status': 'pending', 'exe': None}
+                    for i, file in enumerate(files)]
 
             try:
-                # Create output directory if it doesn't exist
-                os.makedirs(output_dir, exist_ok=True)
-
-                # Performance Optimization: Extract loop-invariant configurations before processing loop
-                # This minimizes redundant Tcl interpreter calls and filesystem checks during batch conversions
-                use_onefile = self.onefile_var.get()
-                use_noconsole = self.noconsole_var.get()
-                use_debug = self.debug_var.get()
-                icon_file = self.icon_entry.get().strip()
-                icon_valid = icon_file and os.path.exists(icon_file)
-                hidden_imports_list = list(self.hidden_listbox.get(0, tk.END))
+                with self.tracer.span("pre-flight", "conversion"):
+                    # Check and install PyInstaller if necessary (using cache if available)
+                    if not self._get_pyinstaller_status() and not self.install_pyinstaller(task.token):
+                        return
+
+                    # Create output directory if it doesn't exist
+                    os.makedirs(output_dir, exist_ok=True)
 
                 # Optimization: Single UI update before loop instead of every iteration
-                self.root.after(0, lambda: self.convert_btn.config(text="⏳ Converting..."))
+                self.ui_bus.post('convert_btn', self.convert_btn.config, {'text': "⏳ Converting..."})
 
-                for i, file in enumerate(files):
+                for i, job in enumerate(jobs):
+                    task.token.check()
+                    file = job['script']
+                    self.metrics.set('py2exe_jobs', len(jobs) - i - 1, state='queued')
+                    self.metrics.set('py2exe_jobs', 1, state='running')
                     try:
-                        self.log_output(f"Converting {os.path.basename(file)}...", "info")
-
-                        # Build PyInstaller command
-                        cmd = ["pyinstaller"]
-
-                        # Add options
-                        if use_onefile:
-                            cmd.append("--onefile")
-                        if use_noconsole:
-                            cmd.append("--noconsole")
-                        if use_debug:
-                            cmd.append("--debug")
+                        self.log_output(f"Converting {os.path.basename(file)}...", "info", job, "build")
 
-                        # Add icon
-                        if icon_valid:
-                            cmd.extend(["--icon", icon_file])
-
-                        # Add hidden imports
-                        for hidden in hidden_imports_list:
-                            cmd.extend(["--hidden-import", hidden])
-
-                        # Set output directory
-                        cmd.extend(["--distpath", output_dir])
-
-                        # Clean previous builds
-                        cmd.append("--clean")
-
-                        # Add the Python file
-                        cmd.append(file)
+                        cmd = build_pyinstaller_command(file, output_dir, options)
+                        job['started_at'] = time.time()
 
                         # Run PyInstaller
-                        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
-                        self.log_output(f"✅ Successfully converted {os.path.basename(file)}", "success")
-                        successful_conversions += 1
-
-                        # Optimization: Use root.after for thread-safe UI updates
-                        self.root.after(0, lambda v=i+1: self.progress_var.set(v))
-
+                        with self.tracer.span("build", "conversion", script=os.path.basename(file)):
+                            self._run_pyinstaller(cmd, stream_output, job, task.token)
+
+                        self.log_output(f"✅ Successfully converted {os.path.basename(file)}", "success", job, "build")
+                        if job.get('resources'):
+                            self.log_output(f"📈 {os.path.basename(file)}: {format_resources(job['resources'])}",
+                                            "info", job, "build")
+                        job['status'] = 'succeeded'
+                        job['exe'] = get_executable_path(file, output_dir, options['onefile'])
+
+                        # Optimization: Progress updates are coalesced by the UI bus (latest value wins)
+                        self.ui_bus.post('progress', self.progress_var.set, i + 1)
+
+                    except TaskCancelled:
+                        job['status'] = 'cancelled'
+                        raise
                     except subprocess.CalledProcessError as e:
+                        job['status'] = 'failed'
                         error_msg = f"❌ Error converting {os.path.basename(file)}: {e}"
-                        self.log_output(error_msg, "error")
+                        self.log_output(error_msg, "error", job, "build")
                         if e.stderr:
-                            self.log_output(f"Error details: {e.stderr[:500]}...", "error")
+                            self.log_output(f"Error details: {e.stderr[:500]}...", "error", job, "build")
                     except Exception as e:
+                        job['status'] = 'failed'
                         error_msg = f"❌ Unexpected error converting {os.path.basename(file)}: {e}"
-                        self.log_output(error_msg, "error")
+                        self.log_output(error_msg, "error", job, "build")
+
+                    # Counted as each build finishes, so the counters move during long batches;
+                    # builds still facing a smoke test are counted once their status is final
+                    if not (options['smoke_test'] and job['status'] == 'succeeded'):
+                        self.metrics.inc('py2exe_jobs_total', status=job['status'])
+                    if job.get('resources'):
+                        self.metrics.observe('py2exe_build_duration_seconds', job['resources']['wall_s'],
+                                             status=job['status'])
+
+                self._collect_missing_module_warnings(jobs)
+
+                # Optional post-build verification of every new executable
+                if options['smoke_test']:
+                    task.token.check()
+                    built = [job for job in jobs if job['status'] == 'succeeded']
+                    try:
+                        self._run_smoke_tests(built, options)
+                    finally:
+                        for job in built:
+                            self.metrics.inc('py2exe_jobs_total', status=job['status'])
+
+                self._log_batch_resources(batch_id, jobs)
 
                 # Final summary
+                successful_conversions = sum(1 for job in jobs if job['status'] == 'succeeded')
                 if successful_conversions > 0:
-                    self.log_output(f"🎉 Conversion completed! {successful_conversions}/{len(files)} files converted successfully.", "success")
+                    self.log_output(f"🎉 Conversion completed! {successful_conversions}/{len(files)} files converted successfully.", "success", phase="summary")
                     msg = f"Successfully converted {successful_conversions} out of {len(files)} files.\n\nOutput directory: {output_dir}"
-                    self.root.after(0, lambda m=msg: messagebox.showinfo("Conversion Complete", m))
+                    self.ui_bus.call(messagebox.showinfo, "Conversion Complete", msg)
                 else:
-                    self.log_output("❌ Conversion failed for all files.", "error")
-                    self.root.after(0, lambda: messagebox.showerror("Conversion Failed", "No files were successfully converted."))
+                    self.log_output("❌ Conversion failed for all files.", "error", phase="summary")
+                    self.ui_bus.call(messagebox.showerror, "Conversion Failed", "No files were successfully converted.")
 
+            except TaskCancelled:
+                self.log_output("⏹️ Conversion cancelled", "warning", phase="summary")
+                raise
             except Exception as e:
                 error_msg = f"❌ Critical error during conversion: {e}"
                 self.log_output(error_msg, "error")
-                self.root.after(0, lambda m=error_msg: messagebox.showerror("Critical Error", m))
+                self.ui_bus.call(messagebox.showerror, "Critical Error", error_msg)
 
             finally:
-                # Optimization: Ensure all final UI updates are scheduled on the main thread
-                self.root.after(0, lambda: self.convert_btn.config(state=tk.NORMAL, text="🔄 Convert to EXE"))
-                self.root.after(0, lambda: self.progress_var.set(0))
+                self.metrics.set('py2exe_jobs', 0, state='queued')
+                self.metrics.set('py2exe_jobs', 0, state='running')
+
+                # Optimization: Final UI updates go through the UI bus and land in a single frame
+                self.ui_bus.post('convert_btn', self.convert_btn.config,
+                                 {'state': tk.NORMAL, 'text': "🔄 Convert to EXE"})
+                self.ui_bus.post('progress', self.progress_var.set, 0)
                 if hasattr(self, 'status_label'):
-                    self.root.after(0, lambda: self.status_label.config(text="Conversion completed"))
+                    self.ui_bus.post('status', self.status_label.config, {'text': "Conversion completed"})
+
+        # Run conversion on the background executor
+        self.executor.submit('conversion', self._profiled('conversion_batch', run_conversion))
+
+    def start_trace_run(self):
+        """Open the trace run dialog for recording runtime imports of a script or its executable."""
+        files = list(self.files_listbox.get(0, tk.END))
+        output_dir = self.output_entry.get().strip()
+        if not files:
+            messagebox.showwarning("No Script", "Please add a Python script to trace first.")
+            return
+        if not output_dir or output_dir == "Path to output directory...":
+            messagebox.showwarning("No Output Directory", "Please set an output directory first.")
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Trace Run")
+        dialog.geometry("520x300")
+        dialog.configure(bg=self.colors['surface'])
+        dialog.resizable(False, False)
+        dialog.transient(self.root)
+        dialog.grab_set()
 
-        # Run conversion in a separate thread
-        threading.Thread(target=run_conversion, daemon=True).start()
+        label_opts = {'bg': self.colors['surface'], 'fg': self.colors['fg'], 'font': self.font_normal}
+        entry_opts = {'bg': self.colors['card'], 'fg': self.colors['fg'],
+                      'insertbackground': self.colors['fg'], 'highlightthickness': 1,
+                      'highlightbackground': self.colors['border'],
+                      'highlightcolor': self.colors['accent'], 'font': self.font_normal}
+
+        tk.Label(dialog, text="Script:", **label_opts).pack(anchor='w', padx=15, pady=(15, 0))
+        script_var = tk.StringVar(value=files[0])
+        ttk.Combobox(dialog, textvariable=script_var, values=files,
+                     state='readonly', width=60).pack(fill='x', padx=15)
+
+        tk.Label(dialog, text="Scenario arguments:", **label_opts).pack(anchor='w', padx=15, pady=(10, 0))
+        args_entry = tk.Entry(dialog, **entry_opts)
+        args_entry.pack(fill='x', padx=15)
+
+        tk.Label(dialog, text="Scenario input (stdin, use \\n for new lines):",
+                 **label_opts).pack(anchor='w', padx=15, pady=(10, 0))
+        stdin_entry = tk.Entry(dialog, **entry_opts)
+        stdin_entry.pack(fill='x', padx=15)
+
+        frozen_var = tk.BooleanVar(value=False)
+        self.create_modern_checkbox(dialog, "📦 Trace the built executable instead of the script",
+                                    frozen_var).pack(anchor='w', padx=15, pady=10)
+
+        button_frame = tk.Frame(dialog, bg=self.colors['surface'])
+        button_frame.pack(pady=5)
+
+        def start():
+            import shlex
+            try:
+                args = shlex.split(args_entry.get())
+            except ValueError as e:
+                messagebox.showerror("Invalid Arguments", f"Could not parse scenario arguments: {e}",
+                                     parent=dialog)
+                return
+            stdin_text = stdin_entry.get().replace('\\n', '\n')
+            options = self.collect_conversion_options()
+            script = script_var.get()
+            frozen = frozen_var.get()
+            dialog.destroy()
+
+            self.trace_btn.config(state=tk.DISABLED)
+            self.executor.submit('trace_run', lambda task: self._run_trace_workflow(
+                script, output_dir, options, args, stdin_text, frozen, task.token))
+
+        self.create_modern_button(button_frame, "Start", start, 'left', style='success')
+        self.create_modern_button(button_frame, "Cancel", dialog.destroy, 'left', style='danger')
+
+    def _run_trace_workflow(self, script, output_dir, options, args, stdin_text, frozen, token):
+        """Build a baseline, record runtime imports and offer a rebuild without unused packages."""
+        name = os.path.basename(script)
+        hook_file = None
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            runtime_hooks = ()
+            if frozen:
+                fd, hook_file = tempfile.mkstemp(prefix="py2exe_trace_hook_", suffix=".py")
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(IMPORT_TRACE_HOOK)
+                runtime_hooks = (hook_file,)
+
+            self.log_output(f"🔬 Trace run: building baseline for {name}...", "info")
+            cmd = build_pyinstaller_command(script, output_dir, options, runtime_hooks=runtime_hooks)
+            self._run_pyinstaller(cmd, self.default_settings.get('stream_build_output', True), token=token)
+
+            exe_path = get_executable_path(script, output_dir, options.get('onefile'))
+            bundle_path = exe_path if options.get('onefile') else os.path.dirname(exe_path)
+            baseline_size = get_path_size(bundle_path)
+
+            token.check()
+            self.log_output(f"🔬 Recording imports of {'executable' if frozen else 'script'} run...", "info")
+            traced, _, returncode = run_import_trace(exe_path if frozen else script,
+                                                     args, stdin_text, frozen=frozen)
+            if not traced:
+                self.log_output("❌ Trace run recorded no modules - did the scenario exit normally?", "error")
+                return
+            # Timed like the trimmed build: an untraced run, where the trace hook stays dormant
+            token.check()
+            baseline_startup = time_executable(exe_path, args, stdin_text)[0]
+
+            bundled = read_bundled_modules(get_pyinstaller_work_dir(script))
+            excludes = compute_trace_excludes(bundled, traced)
+            self.log_output(f"Trace recorded {len(traced)} imported modules; bundle contains "
+                            f"{len(bundled)} modules (exit code {returncode})", "info")
+            if not excludes:
+                self.log_output("✅ Every bundled package was imported during the scenario - nothing to trim.",
+                                "success")
+                return
+
+            self.log_output(f"Packages bundled but never imported: {', '.join(excludes)}", "warning")
+            baseline = {'size': baseline_size, 'startup': baseline_startup, 'returncode': returncode,
+                        'trace_hook': frozen}
+            self.ui_bus.call(self._offer_trimmed_rebuild,
+                             script, output_dir, options, args, stdin_text, excludes, baseline)
+
+        except TaskCancelled:
+            self.log_output(f"⏹️ Trace run cancelled for {name}", "warning")
+            raise
+        except subprocess.CalledProcessError as e:
+            self.log_output(f"❌ Trace run build failed for {name}: {e}", "error")
+            if e.stderr:
+                self.log_output(f"Error details: {e.stderr[:500]}...", "error")
+        except Exception as e:
+            self.log_output(f"❌ Trace run failed for {name}: {e}", "error")
+        finally:
+            if hook_file:
+                try:
+                    os.remove(hook_file)
+                except OSError:
+                    pass
+            self.ui_bus.post('trace_btn', self.trace_btn.config, {'state': tk.NORMAL})
+
+    def start_import_profile(self):
+        """Profile the import time of the selected (or first) script in a background thread."""
+        selected = self.files_listbox.curselection()
+        files = self.files_listbox.get(0, tk.END)
+        if not files:
+            messagebox.showwarning("No Script", "Please add a Python script to profile first.")
+            return
+        script = files[selected[0]] if selected else files[0]
+
+        self.importtime_btn.config(state=tk.DISABLED)
+        self.log_output(f"⏱️ Profiling imports of {os.path.basename(script)}...", "info")
+
+        def run_profile(task):
+            try:
+                roots = profile_import_time(script)
+                heavy = summarize_import_profile(script, roots)
+                total_ms = sum(node['cumulative_us'] for node in roots) / 1000
+                self.log_output(f"Imports of {os.path.basename(script)} took {total_ms:.0f} ms "
+                                f"across {len(roots)} top-level modules", "info")
+                for node, names in heavy[:5]:
+                    hint = f" - deferrable ({', '.join(names)} only used inside functions)" if names else ""
+                    self.log_output(f"  {node['name']}: {node['cumulative_us'] / 1000:.1f} ms{hint}",
+                                    "warning" if names else "info")
+                self.ui_bus.call(self.show_import_profile, script, roots, heavy)
+            except Exception as e:
+                self.log_output(f"❌ Import profiling failed: {e}", "error")
+            finally:
+                self.ui_bus.post('importtime_btn', self.importtime_btn.config, {'state': tk.NORMAL})
+
+        self.executor.submit('import_profile', run_profile)
+
+    def show_import_profile(self, script, roots, heavy):
+        """Show the cumulative import tree of a script, heaviest modules first."""
+        window = tk.Toplevel(self.root)
+        window.title(f"Import Profile - {os.path.basename(script)}")
+        window.geometry("700x500")
+        window.configure(bg=self.colors['surface'])
+
+        deferrable = {node['name']: names for node, names in heavy if names}
+        summary = (f"{len(deferrable)} heavy imports could be deferred into the functions that use them"
+                   if deferrable else "No heavy imports found that could be deferred")
+        tk.Label(window, text=summary, bg=self.colors['surface'], fg=self.colors['fg'],
+                 font=self.font_semibold).pack(anchor='w', padx=15, pady=10)
+
+        tree_frame = tk.Frame(window, bg=self.colors['surface'])
+        tree_frame.pack(fill='both', expand=True, padx=15, pady=(0, 15))
+
+        tree = ttk.Treeview(tree_frame, columns=('cumulative', 'self', 'hint'))
+        tree.heading('#0', text='Module')
+        tree.heading('cumulative', text='Cumulative (ms)')
+        tree.heading('self', text='Self (ms)')
+        tree.heading('hint', text='Suggestion')
+        tree.column('#0', width=260)
+        tree.column('cumulative', width=110, anchor='e')
+        tree.column('self', width=90, anchor='e')
+        tree.column('hint', width=200)
+
+        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+
+        def insert(parent, nodes):
+            for node in sorted(nodes, key=lambda n: n['cumulative_us'], reverse=True):
+                hint = f"defer ({', '.join(deferrable[node['name']])})" if parent == '' and node['name'] in deferrable else ''
+                item = tree.insert(parent, tk.END, text=node['name'],
+                                   values=(f"{node['cumulative_us'] / 1000:.1f}",
+                                           f"{node['self_us'] / 1000:.1f}", hint))
+                insert(item, node['children'])
+
+        insert('', roots)
+
+    def _offer_trimmed_rebuild(self, script, output_dir, options, args, stdin_text, excludes, baseline):
+        """Ask whether to rebuild without the unused packages found by a trace run."""
+        shown = "\n".join(f"• {module}" for module in excludes[:25])
+        if len(excludes) > 25:
+            shown += f"\n… and {len(excludes) - 25} more"
+        if not messagebox.askyesno("Trimmed Rebuild",
+                                   f"{len(excludes)} bundled packages were never imported during the "
+                                   f"scenario:\n\n{shown}\n\nRebuild {os.path.basename(script)} "
+                                   "excluding them?"):
+            return
+
+        self.trace_btn.config(state=tk.DISABLED)
+        self.executor.submit('trace_run', lambda task: self._run_trimmed_rebuild(
+            script, output_dir, options, args, stdin_text, excludes, baseline, task.token))
+
+    def _run_trimmed_rebuild(self, script, output_dir, options, args, stdin_text, excludes, baseline, token):
+        """Rebuild with trace-derived excludes and log a before/after comparison."""
+        name = os.path.basename(script)
+        try:
+            self.log_output(f"🔬 Rebuilding {name} with {len(excludes)} excluded packages...", "info")
+            cmd = build_pyinstaller_command(script, output_dir, options, excludes=excludes)
+            self._run_pyinstaller(cmd, self.default_settings.get('stream_build_output', True), token=token)
+
+            exe_path = get_executable_path(script, output_dir, options.get('onefile'))
+            bundle_path = exe_path if options.get('onefile') else os.path.dirname(exe_path)
+            trimmed_size = get_path_size(bundle_path)
+            token.check()
+            trimmed_startup, returncode = time_executable(exe_path, args, stdin_text)
+
+            size_delta = (trimmed_size - baseline['size']) / max(baseline['size'], 1)
+            startup_delta = (trimmed_startup - baseline['startup']) / max(baseline['startup'], 1e-9)
+            # Frozen traces need the trace runtime hook in the baseline; the trimmed build has none
+            hook_note = " - baseline includes the trace runtime hook" if baseline.get('trace_hook') else ""
+            self.log_output(f"Size: {baseline['size'] / 1048576:.1f} MB → {trimmed_size / 1048576:.1f} MB "
+                            f"({size_delta:+.0%}){hook_note}", "success")
+            self.log_output(f"Startup: {baseline['startup']:.2f}s → {trimmed_startup:.2f}s "
+                            f"({startup_delta:+.0%})", "success")
+            if returncode != baseline['returncode']:
+                self.log_output(f"⚠️ Trimmed build exited with code {returncode} "
+                                f"(baseline {baseline['returncode']}) - check the excludes", "warning")
+        except TaskCancelled:
+            self.log_output(f"⏹️ Trimmed rebuild cancelled for {name}", "warning")
+            raise
+        except subprocess.CalledProcessError as e:
+            self.log_output(f"❌ Trimmed rebuild failed for {name}: {e}", "error")
+            if e.stderr:
+                self.log_output(f"Error details: {e.stderr[:500]}...", "error")
+        except Exception as e:
+            self.log_output(f"❌ Trimmed rebuild failed for {name}: {e}", "error")
+        finally:
+            self.ui_bus.post('trace_btn', self.trace_btn.config, {'state': tk.NORMAL})
 
     # Placeholder methods for tabs (simplified version)
     def create_icon_manager_tab(self):
@@ -1782,6 +5257,13 @@ Use Help menu to access guides and export files."""
                                                         style='success', size='large')
         self.create_tooltip(self.create_icon_btn, "Generate icon files in the selected shape and sizes")
 
+        self.icon_create_status = tk.Label(create_frame, text="", bg=self.colors['surface'], fg=self.colors['border'],
+                                           font=('Segoe UI', self.base_font_size - 1))
+        self.icon_create_status.pack(side='left', padx=15)
+        btn_cancel_create = self.create_modern_button(create_frame, "✖ Cancel",
+                                                      lambda: self.executor.cancel('icon_creation'), 'left')
+        self.create_tooltip(btn_cancel_create, "Stop creating icons after the current size")
+
         # Icon browser section
         browser_frame = ttk.LabelFrame(scrollable_frame, text="🔍 Icon Browser")
         browser_frame.pack(fill='both', expand=True, padx=15, pady=10)
@@ -1812,6 +5294,15 @@ Use Help menu to access guides and export files."""
                                  self.search_icons, 'right', style='primary')
         self.create_tooltip(btn_search, "Find icon files in the selected directory")
 
+        search_status_frame = tk.Frame(browser_frame, bg=self.colors['surface'])
+        search_status_frame.pack(fill='x', padx=15)
+        self.icon_search_status = tk.Label(search_status_frame, text="", bg=self.colors['surface'],
+                                           fg=self.colors['border'], font=('Segoe UI', self.base_font_size - 1))
+        self.icon_search_status.pack(side='left')
+        btn_cancel_search = self.create_modern_button(search_status_frame, "✖ Cancel",
+                                                      lambda: self.executor.cancel('icon_search'), 'right')
+        self.create_tooltip(btn_cancel_search, "Stop the running icon search")
+
         # Icons display area
         self.create_icons_display(browser_frame)
 
@@ -1885,31 +5376,39 @@ Use Help menu to access guides and export files."""
         # Performance Optimization: Only proceed if the path is actually a file.
         # This avoids unnecessary attempts to open directories or partial paths.
         if source_path and os.path.isfile(source_path):
-            try:
-                # Clear existing preview
-                for widget in self.preview_frame.winfo_children():
-                    widget.destroy()
-
-                # Create preview
-                with Image.open(source_path) as img:
-                    # Performance Optimization: Use BOX resampling for fast thumbnail generation.
-                    # BOX is significantly faster than LANCZOS for small previews.
-                    preview_img = img.resize((80, 80), Image.Resampling.BOX)
-                    preview_photo = ImageTk.PhotoImage(preview_img)
+            # Decoding runs on the executor; a newer keystroke cancels an older preview
+            self.executor.submit('icon_preview', self._load_icon_preview, source_path,
+                                 on_done=self._show_icon_preview,
+                                 on_error=lambda e: self._show_icon_preview(None))
+
+    def _load_icon_preview(self, task, source_path):
+        """Decode and downscale the source image for the preview (background thread)."""
+        with Image.open(source_path) as img:
+            # Performance Optimization: Use BOX resampling for fast thumbnail generation.
+            # BOX is significantly faster than LANCZOS for small previews.
+            return img.resize((80, 80), Image.Resampling.BOX)
+
+    def _show_icon_preview(self, preview_img):
+        """Show a decoded preview image, or an error marker if decoding failed."""
+        # Clear existing preview
+        for widget in self.preview_frame.winfo_children():
+            widget.destroy()
 
-                    preview_label = tk.Label(self.preview_frame, image=preview_photo,
-                                           bg=self.colors['card'])
-                    preview_label.pack(expand=True)
+        if preview_img is None:
+            # Show error in preview
+            error_label = tk.Label(self.preview_frame, text="Invalid\nImage",
+                                  bg=self.colors['card'], fg=self.colors['error'],
+                                  font=('Segoe UI', self.base_font_size))
+            error_label.pack(expand=True)
+            return
 
-                    # Keep reference to prevent garbage collection
-                    preview_label.image = preview_photo
+        preview_photo = ImageTk.PhotoImage(preview_img)
+        preview_label = tk.Label(self.preview_frame, image=preview_photo,
+                               bg=self.colors['card'])
+        preview_label.pack(expand=True)
 
-            except Exception as e:
-                # Show error in preview
-                error_label = tk.Label(self.preview_frame, text="Invalid\nImage",
-                                      bg=self.colors['card'], fg=self.colors['error'],
-                                      font=('Segoe UI', self.base_font_size))
-                error_label.pack(expand=True)
+        # Keep reference to prevent garbage collection
+        preview_label.image = preview_photo
 
     def create_icon_from_image(self):
         """Create shaped icon files from source image."""
@@ -1943,115 +5442,158 @@ Use Help menu to access guides and export files."""
         if not output_dir:
             return
 
-        try:
+        if self.executor.is_running('icon_creation'):
+            messagebox.showinfo("Icon Creation", "Icons are already being created. Please wait or cancel first.")
+            return
+
+        sizes = [int(s.split('x')[0]) for s in selected_sizes]
+        self.create_icon_btn.config(state=tk.DISABLED)
+        self.icon_create_status.config(text=f"⏳ Creating 0/{len(sizes)}...")
+
+        def on_error(e):
+            self._finish_icon_creation("")
+            error_msg = f"Error creating shaped icons: {e}"
             if hasattr(self, 'log_output'):
-                self.log_output(f"Creating {shape_display.lower()} icons from {os.path.basename(source_image)}...", "info")
-
-            # Open source image
-            with Image.open(source_image) as img:
-                # Convert to RGBA if necessary
-                if img.mode != 'RGBA':
-                    img = img.convert('RGBA')
-
-                base_name = os.path.splitext(os.path.basename(source_image))[0]
-                created_icons = []
-
-                # Optimization: Resize source image to max required size once
-                # This avoids expensive resizing of large source images for every target size
-                sizes = [int(s.split('x')[0]) for s in selected_sizes]
-                max_size = max(sizes)
-
-                working_img = img
-                if img.width > max_size and img.height > max_size:
-                    if hasattr(self, 'log_output'):
-                        self.log_output(f"Optimizing: Pre-resizing source image to {max_size}x{max_size}...", "info")
-                    working_img = img.resize((max_size, max_size), Image.Resampling.LANCZOS)
-
-                # Performance Optimization: Sort sizes in descending order for progressive resizing
-                # This significantly reduces computational load by resizing from the next largest image.
-                # Quality Optimization: We maintain an unmasked source for resizing to prevent quality loss
-                # and redundant alpha-channel processing during progressive downscaling.
-                sorted_sizes = sorted(sizes, reverse=True)
-                size_to_shaped_img = {}
-                current_unmasked = working_img
-
-                for size in sorted_sizes:
-                    # 1. Resize the unmasked image to target size
+                self.log_output(error_msg, "error")
+            messagebox.showerror("Icon Creation Error", error_msg)
+
+        self.executor.submit('icon_creation', self._profiled('icon_creation', self._build_shaped_icons),
+                             source_image, sizes, shape_key, shape_display, output_dir,
+                             on_done=lambda created: self._on_shaped_icons_created(created, shape_display, output_dir),
+                             on_error=on_error,
+                             on_progress=lambda done, total, message: self.icon_create_status.config(
+                                 text=f"⏳ Creating {done}/{total}... {message}"),
+                             on_cancelled=lambda: self._finish_icon_creation("✖ Icon creation cancelled"))
+
+    def _build_shaped_icons(self, task, source_image, sizes, shape_key, shape_display, output_dir):
+        """Resize, mask and encode the icon files (background thread). Returns the created paths."""
+        tracer = self.tracer
+        if hasattr(self, 'log_output'):
+            self.log_output(f"Creating {shape_display.lower()} icons from {os.path.basename(source_image)}...", "info")
+
+        # Open source image
+        with Image.open(source_image) as img:
+            # Convert to RGBA if necessary
+            if img.mode != 'RGBA':
+                img = img.convert('RGBA')
+
+            base_name = os.path.splitext(os.path.basename(source_image))[0]
+            created_icons = []
+
+            # Optimization: Resize source image to max required size once
+            # This avoids expensive resizing of large source images for every target size
+            max_size = max(sizes)
+
+            working_img = img
+            if img.width > max_size and img.height > max_size:
+                if hasattr(self, 'log_output'):
+                    self.log_output(f"Optimizing: Pre-resizing source image to {max_size}x{max_size}...", "info")
+                working_img = img.resize((max_size, max_size), Image.Resampling.LANCZOS)
+
+            # Performance Optimization: Sort sizes in descending order for progressive resizing
+            # This significantly reduces computational load by resizing from the next largest image.
+            # Quality Optimization: We maintain an unmasked source for resizing to prevent quality loss
+            # and redundant alpha-channel processing during progressive downscaling.
+            sorted_sizes = sorted(sizes, reverse=True)
+            size_to_shaped_img = {}
+            current_unmasked = working_img
+
+            for done, size in enumerate(sorted_sizes):
+                task.token.check()
+                task.report(done, len(sizes), f"{size}x{size}")
+
+                # 1. Resize the unmasked image to target size
+                with tracer.span("icon resize", "icons", size=size):
                     if current_unmasked.size == (size, size):
                         resized_unmasked = current_unmasked
                     else:
                         resized_unmasked = current_unmasked.resize((size, size), Image.Resampling.LANCZOS)
 
-                    # 2. Apply shape/mask to the correctly-sized unmasked image (create_shaped_icon handles the masking)
+                # 2. Apply shape/mask to the correctly-sized unmasked image (create_shaped_icon handles the masking)
+                with tracer.span("icon mask", "icons", size=size, shape=shape_key):
                     shaped_icon = self.create_shaped_icon(resized_unmasked, shape_key, size)
-                    size_to_shaped_img[size] = shaped_icon
+                size_to_shaped_img[size] = shaped_icon
 
-                    # 3. Use this unmasked resized image as source for the next smaller size
-                    current_unmasked = resized_unmasked
+                # 3. Use this unmasked resized image as source for the next smaller size
+                current_unmasked = resized_unmasked
 
-                    # Save as ICO
-                    ico_path = os.path.join(output_dir, f"{base_name}_{shape_key}_{size}x{size}.ico")
+                # Save as ICO
+                ico_path = os.path.join(output_dir, f"{base_name}_{shape_key}_{size}x{size}.ico")
+                with tracer.span("icon encode", "icons", size=size):
                     shaped_icon.save(ico_path, format='ICO')
-                    created_icons.append(ico_path)
+                created_icons.append(ico_path)
+
+                if hasattr(self, 'log_output'):
+                    self.log_output(f"Created {size}x{size} {shape_display.lower()} icon: {os.path.basename(ico_path)}", "success")
 
-                    if hasattr(self, 'log_output'):
-                        self.log_output(f"Created {size}x{size} {shape_display.lower()} icon: {os.path.basename(ico_path)}", "success")
+            task.token.check()
+            task.report(len(sizes), len(sizes), "multi-size")
 
-                # Create multi-size ICO with shape
-                multi_ico_path = os.path.join(output_dir, f"{base_name}_{shape_key}_multi.ico")
+            # Create multi-size ICO with shape
+            multi_ico_path = os.path.join(output_dir, f"{base_name}_{shape_key}_multi.ico")
 
-                # Use pre-calculated icons for multi-size ICO
-                shaped_icons = [size_to_shaped_img[s] for s in sizes]
+            # Use pre-calculated icons for multi-size ICO
+            shaped_icons = [size_to_shaped_img[s] for s in sizes]
 
-                if shaped_icons:
+            if shaped_icons:
+                with tracer.span("icon encode", "icons", size="multi"):
                     shaped_icons[0].save(multi_ico_path, format='ICO',
                                        append_images=shaped_icons[1:] if len(shaped_icons) > 1 else [],
                                        sizes=[(s, s) for s in sizes])
-                    created_icons.append(multi_ico_path)
-
-                    if hasattr(self, 'log_output'):
-                        self.log_output(f"Created multi-size {shape_display.lower()} icon: {os.path.basename(multi_ico_path)}", "success")
-
-                # Auto-select the multi-size icon for conversion if enabled
-                if self.default_settings.get('auto_select_created_icons', True) and created_icons:
-                    # Use the multi-size icon if available, otherwise use the first created icon
-                    icon_to_select = multi_ico_path if multi_ico_path in created_icons else created_icons[0]
-                    if hasattr(self, 'icon_entry'):
-                        self.icon_entry.delete(0, tk.END)
-                        self.icon_entry.insert(0, icon_to_select)
-                    self.last_created_icon = icon_to_select
-                    if hasattr(self, 'log_output'):
-                        self.log_output(f"Auto-selected icon: {os.path.basename(icon_to_select)}", "info")
-
-                # Show notification if enabled
-                if self.default_settings.get('show_icon_notifications', True):
-                    messagebox.showinfo("Shaped Icons Created",
-                                       f"Successfully created {len(created_icons)} {shape_display.lower()} icon files!\n\n" +
-                                       (f"✅ Auto-selected for conversion: {os.path.basename(icon_to_select)}\n\n" if self.default_settings.get('auto_select_created_icons', True) and created_icons else "") +
-                                       "\n".join(os.path.basename(icon) for icon in created_icons) +
-                                       f"\n\n📁 Output directory: {output_dir}")
-                else:
-                    # Just show a simple success message
-                    if hasattr(self, 'log_output'):
-                        self.log_output(f"Created {len(created_icons)} icon files in {output_dir}", "success")
+                created_icons.append(multi_ico_path)
 
-                # Refresh icon browser if searching in the same directory
-                if self.search_entry.get().strip() == output_dir:
-                    self.search_icons()
+                if hasattr(self, 'log_output'):
+                    self.log_output(f"Created multi-size {shape_display.lower()} icon: {os.path.basename(multi_ico_path)}", "success")
 
-        except Exception as e:
-            error_msg = f"Error creating shaped icons: {e}"
+        # Index the new files directly so showing them does not need a re-walk
+        self.icon_index.add_files(created_icons)
+        return created_icons
+
+    def _finish_icon_creation(self, status):
+        """Re-enable the create button and show a final status."""
+        self.create_icon_btn.config(state=tk.NORMAL)
+        self.icon_create_status.config(text=status)
+
+    def _on_shaped_icons_created(self, created_icons, shape_display, output_dir):
+        """Auto-select and announce the created icons (Tk thread)."""
+        self._finish_icon_creation(f"✅ Created {len(created_icons)} icon files")
+
+        # Auto-select the multi-size icon for conversion if enabled
+        if self.default_settings.get('auto_select_created_icons', True) and created_icons:
+            # Use the multi-size icon if available (always created last), otherwise the first created icon
+            icon_to_select = created_icons[-1] if created_icons[-1].endswith('_multi.ico') else created_icons[0]
+            if hasattr(self, 'icon_entry'):
+                self.icon_entry.delete(0, tk.END)
+                self.icon_entry.insert(0, icon_to_select)
+            self.last_created_icon = icon_to_select
             if hasattr(self, 'log_output'):
-                self.log_output(error_msg, "error")
-            messagebox.showerror("Icon Creation Error", error_msg)
+                self.log_output(f"Auto-selected icon: {os.path.basename(icon_to_select)}", "info")
+
+        # Show notification if enabled
+        if self.default_settings.get('show_icon_notifications', True):
+            messagebox.showinfo("Shaped Icons Created",
+                               f"Successfully created {len(created_icons)} {shape_display.lower()} icon files!\n\n" +
+                               (f"✅ Auto-selected for conversion: {os.path.basename(icon_to_select)}\n\n" if self.default_settings.get('auto_select_created_icons', True) and created_icons else "") +
+                               "\n".join(os.path.basename(icon) for icon in created_icons) +
+                               f"\n\n📁 Output directory: {output_dir}")
+        else:
+            # Just show a simple success message
+            if hasattr(self, 'log_output'):
+                self.log_output(f"Created {len(created_icons)} icon files in {output_dir}", "success")
+
+        # Refresh icon browser if searching in the same directory
+        if self.search_entry.get().strip() == output_dir:
+            self.search_icons()
 
     def _get_shape_mask(self, shape, size, **kwargs):
         """Create and cache a shape mask to improve performance."""
         # Create a stable cache key based on shape, size and additional arguments
         mask_key = (shape, size, tuple(sorted(kwargs.items())))
         if mask_key in self._mask_cache:
+            self.metrics.inc('py2exe_cache_requests_total', cache='mask', result='hit')
             self._mask_cache.move_to_end(mask_key)
             return self._mask_cache[mask_key]
+        self.metrics.inc('py2exe_cache_requests_total', cache='mask', result='miss')
 
         mask = Image.new('L', (size, size), 0)
         draw = ImageDraw.Draw(mask)
@@ -2094,10 +5636,12 @@ Use Help menu to access guides and export files."""
         if cache_key in self.shaped_icons_cache:
             img, ref = self.shaped_icons_cache[cache_key]
             if ref() is image:
+                self.metrics.inc('py2exe_cache_requests_total', cache='shaped_icon', result='hit')
                 self.shaped_icons_cache.move_to_end(cache_key)
                 return img
             # If identity verification fails (ID reuse), remove the stale entry
             del self.shaped_icons_cache[cache_key]
+        self.metrics.inc('py2exe_cache_requests_total', cache='shaped_icon', result='miss')
 
         # Performance Optimization: Skip resize if already at target size
         if image.size == (size, size):
@@ -2137,36 +5681,8 @@ Use Help menu to access guides and export files."""
             self.search_entry.delete(0, tk.END)
             self.search_entry.insert(0, directory)
 
-    def _iter_icons(self, directory, extensions, limit):
-        """Internal recursive generator for efficient icon discovery using os.scandir."""
-        # Performance Optimization: Yield string paths directly instead of Path objects to minimize overhead
-        count = 0
-        try:
-            with os.scandir(directory) as it:
-                for entry in it:
-                    if count >= limit:
-                        return
-                    if entry.is_file() and entry.name.lower().endswith(extensions):
-                        yield entry.path
-                        count += 1
-                    elif entry.is_dir():
-                        # Performance Optimization: Skip hidden and common large or irrelevant directories
-                        # to significantly reduce filesystem I/O and traversal time.
-                        name = entry.name.lower()
-                        if name.startswith('.') or name in ('node_modules', 'venv', '.venv', '__pycache__', 'build', 'dist', 'target'):
-                            continue
-
-                        # Recursively search subdirectories
-                        for icon in self._iter_icons(entry.path, extensions, limit - count):
-                            yield icon
-                            count += 1
-                            if count >= limit:
-                                return
-        except (PermissionError, OSError):
-            pass
-
     def search_icons(self):
-        """Search for icon files in the specified directory using an efficient recursive generator."""
+        """Search for icon files in the specified directory with a parallel directory walk."""
         search_dir = self.search_entry.get().strip()
         # Handle placeholder
         if search_dir == "Directory to search for icons...":
@@ -2183,19 +5699,120 @@ Use Help menu to access guides and export files."""
         # Hide empty state label
         self.empty_icons_label.place_forget()
 
-        # Performance Optimization: Use os.scandir with a recursive generator for faster traversal and immediate termination
+        # Performance Optimization: Use os.scandir on a pool of threads for faster traversal and immediate termination
         extensions = ('.ico', '.png', '.jpg', '.jpeg', '.bmp')
         # Performance Optimization: Match search limit to display limit (20) to minimize wasted I/O
         limit = 20
 
-        icon_files = list(self._iter_icons(search_dir, extensions, limit))
-        found_count = len(icon_files)
+        # Traversal and thumbnail decoding run on the executor; a new search cancels the old one.
+        # Each thumbnail is added to the grid as soon as it is decoded.
+        self.icon_search_status.config(text="🔍 Searching...")
+        self.executor.submit('icon_search', self._profiled('icon_search', self._find_icon_thumbnails), search_dir, extensions, limit,
+                             on_done=lambda found: self._on_icon_search_done(found, search_dir, extensions, limit),
+                             on_error=lambda e: self.icon_search_status.config(text=f"❌ Search failed: {e}"),
+                             on_progress=lambda done, total, message: self.icon_search_status.config(text=message),
+                             on_cancelled=lambda: self.icon_search_status.config(text="✖ Search cancelled"))
+
+    def _find_icon_thumbnails(self, task, search_dir, extensions, limit):
+        """Find icon files and decode their thumbnails (background thread).
+
+        Directories below an indexed root are answered from the icon index;
+        others are walked by a ParallelDirectoryWalker, stopping at limit. Every thumbnail is posted to the
+        grid as soon as it is decoded. Returns (results, from_index, walk):
+        results are (path, thumbnail) pairs, thumbnail being None for
+        unreadable images, and walk holds the directory count and elapsed time.
+        """
+        results = []
+        tracer = self.tracer
+        started = time.perf_counter()
+        walk = {'dirs': 0, 'reported_at': started}
+
+        def on_directory():
+            # Runs for every listed directory, so cancellation works between hits too
+            task.token.check()
+            walk['dirs'] += 1
+            now = time.perf_counter()
+            if now - walk['reported_at'] >= 0.25:
+                walk['reported_at'] = now
+                rate = walk['dirs'] / (now - started)
+                task.report(len(results), limit, f"🔍 Searching... {walk['dirs']:,} dirs · "
+                                                 f"{rate:,.0f} dirs/s · {len(results)} found")
+
+        settings = self.default_settings
+        walker = ParallelDirectoryWalker(
+            extensions, workers=settings.get('icon_search_workers', 8),
+            max_depth=settings.get('icon_search_max_depth', 0) or None,
+            ignore_patterns=[p.strip() for p in settings.get('icon_search_ignore', '').split(',') if p.strip()])
+        from_index = self.icon_index.covering_root(search_dir) is not None
+        with tracer.span("icon search", "icons", directory=search_dir, indexed=from_index):
+            if from_index:
+                # The index holds the whole tree; the depth and ignore settings apply to its rows too
+                icon_paths = self.icon_index.search(search_dir, extensions, limit,
+                                                    accept=lambda path: walker.accepts(search_dir, path))
+            else:
+                icon_paths = walker.walk(search_dir, limit, on_directory)
+            # Spans alternate between walking to the next hit and decoding it
+            walk_start = tracer.now_us()
+            try:
+                for icon_path in icon_paths:
+                    task.token.check()
+                    decode_start = tracer.now_us()
+                    tracer.add("search traversal", "icons", walk_start, decode_start)
+                    try:
+                        with Image.open(icon_path) as img:
+                            # Performance Optimization: Use BOX resampling for fast thumbnail generation.
+                            img.thumbnail((64, 64), Image.Resampling.BOX)
+                            thumbnail = img.copy()
+                    except Exception:
+                        thumbnail = None
+                    walk_start = tracer.now_us()
+                    tracer.add("thumbnail decode", "icons", decode_start, walk_start, path=os.path.basename(icon_path))
+                    results.append((icon_path, thumbnail))
+                    self.ui_bus.call(self._add_icon_tile, task, len(results) - 1, icon_path, thumbnail)
+            finally:
+                # Stops the walker's threads when the search is cancelled mid-walk
+                close = getattr(icon_paths, 'close', None)
+                if close:
+                    close()
+            tracer.add("search traversal", "icons", walk_start, tracer.now_us())
+        walk['elapsed'] = time.perf_counter() - started
+        return results, from_index, walk
+
+    def _on_icon_search_done(self, found, search_dir, extensions, limit):
+        """Finish the search results, then bring the icon index for the directory up to date (Tk thread)."""
+        results, from_index, walk = found
+        self._show_icon_results(results, limit, walk, from_index)
+
+        def refresh(task):
+            return self.icon_index.refresh(search_dir, extensions, token=task.token)
+
+        def refreshed(stats):
+            changed = stats['added'] + stats['updated'] + stats['removed']
+            if changed:
+                self.log_output(f"Icon index for {search_dir}: {stats['added']} added, "
+                                f"{stats['updated']} updated, {stats['removed']} removed "
+                                f"({stats['dirs_listed']} directories listed)", "info")
+            # Results that came from a stale index are redrawn; walked results already are current
+            if changed and from_index and self.search_entry.get().strip() == search_dir:
+                self.search_icons()
+
+        self.executor.submit('icon_index', refresh, on_done=refreshed,
+                             on_error=lambda e: self.log_output(f"Icon index refresh failed: {e}", "warning"))
+
+    def _show_icon_results(self, results, limit, walk=None, from_index=False):
+        """Finish a search whose thumbnails were already streamed into the grid (Tk thread)."""
+        found_count = len(results)
+        self.icon_search_status.config(text="")
 
         if found_count == 0:
             self.empty_icons_label.config(text="❌ No icons found in this directory.")
             self.empty_icons_label.place(relx=0.5, rely=0.5, anchor='center')
             return
 
+        if walk and walk.get('elapsed'):
+            source = "from the icon index" if from_index else f"in {walk['dirs']:,} dirs"
+            self.icon_search_status.config(text=f"✅ {found_count} icons {source} ({walk['elapsed']:.2f} s)")
+
         # Display found icons
         if hasattr(self, 'log_output'):
             msg = f"Found {found_count} icon files"
@@ -2203,55 +5820,56 @@ Use Help menu to access guides and export files."""
                 msg += f" (stopped searching at {limit} for performance)"
             self.log_output(msg, "info")
 
+    def _add_icon_tile(self, task, index, icon_path, thumbnail):
+        """Add one decoded search hit to the icon preview grid (Tk thread)."""
+        # Hits of a cancelled or superseded search must not land in the new grid
+        if task.token.cancelled:
+            return
+
         # Create grid of icon previews
         columns = 4
-        # Display a subset of found icons to maintain UI performance
-        display_limit = 20
-        for i, icon_path in enumerate(icon_files[:display_limit]):
-            row = i // columns
-            col = i % columns
-
-            icon_frame = tk.Frame(self.icons_scrollable_frame, bg=self.colors['card'])
-            icon_frame.grid(row=row, column=col, padx=10, pady=10, sticky='w')
-
-            try:
-                # Create icon preview
-                with Image.open(icon_path) as img:
-                    # Performance Optimization: Use BOX resampling for fast thumbnail generation.
-                    img.thumbnail((64, 64), Image.Resampling.BOX)
-                    icon_photo = ImageTk.PhotoImage(img)
-
-                    icon_btn = tk.Button(icon_frame,
-                                        image=icon_photo,
-                                        command=lambda p=str(icon_path): self.select_icon_preview(p),
-                                        bg=self.colors['card'],
-                                        activebackground=self.colors['surface'],
-                                        relief='flat',
-                                        borderwidth=0,
-                                        highlightthickness=1,
-                                        highlightbackground=self.colors['border'],
-                                        cursor='hand2')
-                    icon_btn.pack()
+        row = index // columns
+        col = index % columns
 
-                    # Keep reference to prevent garbage collection
-                    icon_btn.image = icon_photo
+        icon_frame = tk.Frame(self.icons_scrollable_frame, bg=self.colors['card'])
+        icon_frame.grid(row=row, column=col, padx=10, pady=10, sticky='w')
 
-                    # Icon filename label
-                    name_label = tk.Label(icon_frame,
-                                         text=icon_path.name[:15] + "..." if len(icon_path.name) > 15 else icon_path.name,
-                                         bg=self.colors['card'],
-                                         fg=self.colors['fg'],
-                                         font=('Segoe UI', self.base_font_size - 1))
-                    name_label.pack()
+        if thumbnail is None:
+            # Fallback for unreadable images
+            error_label = tk.Label(icon_frame,
+                                  text="Invalid\nImage",
+                                  bg=self.colors['card'],
+                                  fg=self.colors['error'],
+                                  font=('Segoe UI', self.base_font_size - 1))
+            error_label.pack()
+            return
 
-            except Exception as e:
-                # Fallback for unreadable images
-                error_label = tk.Label(icon_frame,
-                                      text="Invalid\nImage",
-                                      bg=self.colors['card'],
-                                      fg=self.colors['error'],
-                                      font=('Segoe UI', self.base_font_size - 1))
-                error_label.pack()
+        # Create icon preview
+        icon_photo = ImageTk.PhotoImage(thumbnail)
+
+        icon_btn = tk.Button(icon_frame,
+                            image=icon_photo,
+                            command=lambda p=icon_path: self.select_icon_preview(p),
+                            bg=self.colors['card'],
+                            activebackground=self.colors['surface'],
+                            relief='flat',
+                            borderwidth=0,
+                            highlightthickness=1,
+                            highlightbackground=self.colors['border'],
+                            cursor='hand2')
+        icon_btn.pack()
+
+        # Keep reference to prevent garbage collection
+        icon_btn.image = icon_photo
+
+        # Icon filename label
+        name = os.path.basename(icon_path)
+        name_label = tk.Label(icon_frame,
+                             text=name[:15] + "..." if len(name) > 15 else name,
+                             bg=self.colors['card'],
+                             fg=self.colors['fg'],
+                             font=('Segoe UI', self.base_font_size - 1))
+        name_label.pack()
 
     def select_icon_preview(self, icon_path):
         """Select an icon from the preview grid."""
@@ -2442,6 +6060,82 @@ Use Help menu to access guides and export files."""
                                                  self.validate_before_convert_var)
         validate_cb.pack(anchor='w', pady=5)
 
+        # Stream build output
+        self.stream_build_output_var = tk.BooleanVar(value=self.default_settings.get('stream_build_output', True))
+        stream_cb = self.create_modern_checkbox(behavior_container,
+                                               "📜 Stream PyInstaller output into the log while building",
+                                               self.stream_build_output_var)
+        stream_cb.pack(anchor='w', pady=5)
+
+        # Collapse repeated build lines
+        self.coalesce_build_output_var = tk.BooleanVar(value=self.default_settings.get('coalesce_build_output', True))
+        coalesce_cb = self.create_modern_checkbox(behavior_container,
+                                                  "🗜️ Collapse runs of similar build lines in the log",
+                                                  self.coalesce_build_output_var)
+        coalesce_cb.pack(anchor='w', pady=5)
+
+        # Smoke test timeout
+        smoke_timeout_frame = tk.Frame(behavior_container, bg=self.colors['surface'])
+        smoke_timeout_frame.pack(anchor='w', pady=5)
+
+        ttk.Label(smoke_timeout_frame, text="🧪 Smoke test timeout (seconds):").pack(side='left')
+        self.smoke_timeout_var = tk.IntVar(value=self.default_settings.get('smoke_test_timeout', 10))
+        tk.Spinbox(smoke_timeout_frame, from_=1, to=600, width=5,
+                   textvariable=self.smoke_timeout_var,
+                   bg=self.colors['card'], fg=self.colors['fg'],
+                   buttonbackground=self.colors['surface'],
+                   insertbackground=self.colors['fg'],
+                   highlightthickness=1, highlightbackground=self.colors['border'],
+                   font=('Segoe UI', self.base_font_size)).pack(side='left', padx=10)
+
+        # Metrics endpoint port
+        metrics_frame = tk.Frame(behavior_container, bg=self.colors['surface'])
+        metrics_frame.pack(anchor='w', pady=5)
+
+        ttk.Label(metrics_frame, text="📡 Metrics endpoint port (0 = off):").pack(side='left')
+        self.metrics_port_var = tk.IntVar(value=self.default_settings.get('metrics_port', 0))
+        metrics_spinbox = tk.Spinbox(metrics_frame, from_=0, to=65535, width=6,
+                                     textvariable=self.metrics_port_var,
+                                     bg=self.colors['card'], fg=self.colors['fg'],
+                                     buttonbackground=self.colors['surface'],
+                                     insertbackground=self.colors['fg'],
+                                     highlightthickness=1, highlightbackground=self.colors['border'],
+                                     font=('Segoe UI', self.base_font_size))
+        metrics_spinbox.pack(side='left', padx=10)
+        self.create_tooltip(metrics_spinbox, "Serve Prometheus metrics at http://127.0.0.1:<port>/metrics")
+
+        # Icon search traversal
+        icon_search_frame = tk.Frame(behavior_container, bg=self.colors['surface'])
+        icon_search_frame.pack(anchor='w', pady=5)
+
+        ttk.Label(icon_search_frame, text="🔍 Icon search threads:").pack(side='left')
+        self.icon_search_workers_var = tk.IntVar(value=self.default_settings.get('icon_search_workers', 8))
+        self.icon_search_depth_var = tk.IntVar(value=self.default_settings.get('icon_search_max_depth', 0))
+        self.icon_search_ignore_var = tk.StringVar(value=self.default_settings.get('icon_search_ignore', ''))
+        for label, variable, low, high, tip in (
+                (None, self.icon_search_workers_var, 1, 64,
+                 "Directories listed at once; raise it for network drives"),
+                ("max depth (0 = any):", self.icon_search_depth_var, 0, 99,
+                 "How many levels below the search directory are searched")):
+            if label:
+                ttk.Label(icon_search_frame, text=label).pack(side='left')
+            spinbox = tk.Spinbox(icon_search_frame, from_=low, to=high, width=4, textvariable=variable,
+                                 bg=self.colors['card'], fg=self.colors['fg'],
+                                 buttonbackground=self.colors['surface'],
+                                 insertbackground=self.colors['fg'],
+                                 highlightthickness=1, highlightbackground=self.colors['border'],
+                                 font=('Segoe UI', self.base_font_size))
+            spinbox.pack(side='left', padx=10)
+            self.create_tooltip(spinbox, tip)
+        ttk.Label(icon_search_frame, text="ignore:").pack(side='left')
+        ignore_entry = tk.Entry(icon_search_frame, textvariable=self.icon_search_ignore_var, width=24,
+                                bg=self.colors['card'], fg=self.colors['fg'],
+                                insertbackground=self.colors['fg'],
+                                highlightthickness=1, highlightbackground=self.colors['border'],
+                                font=('Segoe UI', self.base_font_size))
+        ignore_entry.pack(side='left', padx=10)
+        self.create_tooltip(ignore_entry, "Comma-separated name patterns to skip, e.g. backup*, *.tmp")
+
     def create_settings_controls(self, parent):
         """Create settings control buttons."""
         controls_frame = ttk.LabelFrame(parent, text="💾 Settings Controls")
@@ -2552,7 +6246,8 @@ Use Help menu to access guides and export files."""
         """Handle theme selection change."""
         if hasattr(self, 'apply_theme'):
             selected_theme = self.theme_var.get()
-            self.apply_theme(selected_theme)
+            with self.profiler.profile('theme_switch'):
+                self.apply_theme(selected_theme)
             if hasattr(self, 'log_output'):
                 self.log_output(f"Applied {selected_theme} theme", "success")
 
@@ -2565,8 +6260,18 @@ Use Help menu to access guides and export files."""
             'show_icon_notifications': self.show_notifications_var.get(),
             'window_transparency': self.transparency_var.get(),
             'auto_search_icons': self.auto_search_icons_var.get(),
-            'validate_before_convert': self.validate_before_convert_var.get()
+            'validate_before_convert': self.validate_before_convert_var.get(),
+            'smoke_test_enabled': self.smoke_test_var.get(),
+            'smoke_test_args': self.smoke_args_entry.get().strip(),
+            'smoke_test_timeout': self.smoke_timeout_var.get(),
+            'stream_build_output': self.stream_build_output_var.get(),
+            'coalesce_build_output': self.coalesce_build_output_var.get(),
+            'metrics_port': self.metrics_port_var.get(),
+            'icon_search_workers': self.icon_search_workers_var.get(),
+            'icon_search_max_depth': self.icon_search_depth_var.get(),
+            'icon_search_ignore': self.icon_search_ignore_var.get().strip()
         })
+        self._apply_metrics_port()
 
         if hasattr(self, 'theme_var'):
             self.default_settings['theme'] = self.theme_var.get()
@@ -2598,6 +6303,13 @@ Use Help menu to access guides and export files."""
         self.transparency_var.set(0.95)
         self.auto_search_icons_var.set(False)
         self.validate_before_convert_var.set(True)
+        self.smoke_timeout_var.set(10)
+        self.stream_build_output_var.set(True)
+        self.coalesce_build_output_var.set(True)
+        self.metrics_port_var.set(0)
+        self.icon_search_workers_var.set(8)
+        self.icon_search_depth_var.set(0)
+        self.icon_search_ignore_var.set('')
 
         if hasattr(self, 'theme_var'):
             self.theme_var.set('dark')
@@ -2615,8 +6327,16 @@ Use Help menu to access guides and export files."""
             'window_transparency': 0.95,
             'auto_search_icons': False,
             'validate_before_convert': True,
+            'smoke_test_timeout': 10,
+            'stream_build_output': True,
+            'coalesce_build_output': True,
+            'metrics_port': 0,
+            'icon_search_workers': 8,
+            'icon_search_max_depth': 0,
+            'icon_search_ignore': '',
             'theme': 'dark'
         })
+        self._apply_metrics_port()
 
         self.update_settings_summary()
 
@@ -2647,8 +6367,16 @@ Use Help menu to access guides and export files."""
             'auto_select_created_icons': self.auto_select_icons_var.get(),
             'show_icon_notifications': self.show_notifications_var.get(),
             'auto_search_icons': self.auto_search_icons_var.get(),
-            'validate_before_convert': self.validate_before_convert_var.get()
+            'validate_before_convert': self.validate_before_convert_var.get(),
+            'smoke_test_timeout': self.smoke_timeout_var.get(),
+            'stream_build_output': self.stream_build_output_var.get(),
+            'coalesce_build_output': self.coalesce_build_output_var.get(),
+            'metrics_port': self.metrics_port_var.get(),
+            'icon_search_workers': self.icon_search_workers_var.get(),
+            'icon_search_max_depth': self.icon_search_depth_var.get(),
+            'icon_search_ignore': self.icon_search_ignore_var.get().strip()
         })
+        self._apply_metrics_port()
 
         self.update_settings_summary()
 
@@ -2675,16 +6403,133 @@ Use Help menu to access guides and export files."""
             self.root.geometry(f'{width}x{height}+{x}+{y}')
 
             # Start the main loop
+            self.stall_monitor.start()
             self.root.mainloop()
         except KeyboardInterrupt:
             self.log_output("Application interrupted by user", "warning")
         except Exception as e:
             self.log_output(f"Application error: {e}", "error")
             messagebox.showerror("Application Error", f"An unexpected error occurred: {e}")
+        finally:
+            self.shutdown()
+
+    def on_close(self):
+        """Window close handler: release background resources, then destroy the window."""
+        self.shutdown()
+        self.root.destroy()
+
+    def shutdown(self):
+        """Stop background work and write out the logs. Safe to call more than once."""
+        if getattr(self, '_shut_down', False):
+            return
+        self._shut_down = True
+        self.stall_monitor.stop()
+        # Cancelled builds terminate their PyInstaller process, so workers stop promptly
+        stopped = self.executor.shutdown()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+
+        # Records still queued for the widget would otherwise never reach the session log
+        while True:
+            try:
+                message, level, enqueued_at, job = self.log_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.session_log.append(self._format_log_timestamp(enqueued_at), message, level)
+        if not stopped:
+            # A worker is still logging; keep the sinks open and let process exit close them
+            self.session_log.flush()
+            return
+        self.json_log.close()
+        self.session_log.close()
+
+
+# First arguments that select a command-line subcommand; anything else starts the GUI
+CLI_COMMANDS = frozenset({'importtime', 'logs'})
+
+
+def run_cli(argv):
+    """Run a command-line subcommand instead of the GUI and return the exit code."""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="py2exe_converter_v4.py",
+                                     description="Modern Python to EXE Converter command-line tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    importtime_parser = subparsers.add_parser("importtime", help="profile the import time of a script")
+    importtime_parser.add_argument("script", help="Python script to profile")
+    importtime_parser.add_argument("--top", type=int, default=15, help="number of heaviest modules to show")
+    importtime_parser.add_argument("--threshold", type=float, default=20.0,
+                                   help="cumulative milliseconds above which an import is flagged")
+
+    logs_parser = subparsers.add_parser("logs", help="query the structured build log")
+    logs_parser.add_argument("--job", help="only events of this job id (prefix match, e.g. a batch id)")
+    logs_parser.add_argument("--script", help="only events of this script name")
+    logs_parser.add_argument("--level", action="append",
+                             choices=['info', 'success', 'warning', 'error', 'build'],
+                             help="only events with this level (repeatable)")
+    logs_parser.add_argument("--phase", help="only events of this phase (build, smoke, warnings, summary)")
+    logs_parser.add_argument("--grep", help="only events whose message contains this text (case-insensitive)")
+    logs_parser.add_argument("--since", help="only events at or after this ISO timestamp, e.g. 2025-01-31T12:00")
+    logs_parser.add_argument("--limit", type=int, default=0, help="only the last N matching events")
+    logs_parser.add_argument("--json", action="store_true", help="print raw JSON lines")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "logs":
+        grep = args.grep.lower() if args.grep else None
+        matches = deque(maxlen=args.limit) if args.limit > 0 else []
+        for event in iter_json_log_events():
+            if args.job and not (event.get('job') or '').startswith(args.job):
+                continue
+            if args.script and event.get('script') != args.script:
+                continue
+            if args.level and event.get('level') not in args.level:
+                continue
+            if args.phase and event.get('phase') != args.phase:
+                continue
+            if args.since and event.get('ts', '') < args.since:
+                continue
+            if grep and grep not in event.get('message', '').lower():
+                continue
+            matches.append(event)
+
+        for event in matches:
+            if args.json:
+                print(json.dumps(event, ensure_ascii=False))
+            else:
+                job = f" {event['job']}" if event.get('job') else ""
+                print(f"{event.get('ts')} {event.get('level', '').upper():7}{job} {event.get('message')}")
+        return 0
+
+    if args.command == "importtime":
+        roots = profile_import_time(args.script)
+        heavy = summarize_import_profile(args.script, roots, args.threshold)
+        deferrable = {node['name']: names for node, names in heavy if names}
+        total_ms = sum(node['cumulative_us'] for node in roots) / 1000
+        print(f"Imports of {args.script}: {total_ms:.1f} ms across {len(roots)} top-level modules\n")
+
+        def print_node(node, depth):
+            flag = "  <- deferrable" if depth == 0 and node['name'] in deferrable else ""
+            print(f"{node['cumulative_us'] / 1000:10.1f} ms  {'  ' * depth}{node['name']}{flag}")
+            for child in sorted(node['children'], key=lambda n: n['cumulative_us'], reverse=True)[:3]:
+                if depth < 2 and child['cumulative_us'] / 1000 >= args.threshold / 4:
+                    print_node(child, depth + 1)
+
+        for node in sorted(roots, key=lambda n: n['cumulative_us'], reverse=True)[:args.top]:
+            print_node(node, 0)
+        for module, names in deferrable.items():
+            print(f"\nTip: '{module}' is only used inside functions ({', '.join(names)}); "
+                  "importing it there defers its cost until first use.")
+    return 0
 
 
 def main():
     """Main function to run the application."""
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS:
+        sys.exit(run_cli(sys.argv[1:]))
+
     try:
         app = ModernPy2ExeConverter()
         app.run()
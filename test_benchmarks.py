@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+
+from run_benchmarks import compare_results, format_result, median_result  # noqa: E402
+from synthetic_project import module_levels  # noqa: E402
+
+BASELINE = {
+    'onefile/cold/hello_world': {'build_s': 10.0, 'size_bytes': 8_000_000, 'startup_s': 0.2, 'peak_rss_mb': 100},
+    'onefile/cold/file_organizer': {'build_s': 12.0, 'size_bytes': 9_000_000, 'startup_s': None,
+                                    'peak_rss_mb': 110},
+}
+
+
+def test_compare_results_reports_regressions_over_threshold():
+    results = {
+        'onefile/cold/hello_world': {'build_s': 12.0, 'size_bytes': 8_100_000, 'startup_s': 0.3,
+                                     'peak_rss_mb': 95},
+        'onefile/cold/file_organizer': {'build_s': 12.5, 'size_bytes': 9_000_000, 'startup_s': 0.4,
+                                        'peak_rss_mb': 110},
+        'onedir/cold/hello_world': {'build_s': 99.0},
+    }
+    regressions = compare_results(results, BASELINE, threshold=0.1)
+    assert [(key, metric) for key, metric, *_ in regressions] == [
+        ('onefile/cold/hello_world', 'build_s'), ('onefile/cold/hello_world', 'startup_s')]
+    assert regressions[0][2:4] == (10.0, 12.0)
+    assert round(regressions[0][4], 3) == 0.2
+
+
+def test_compare_results_ignores_changes_below_minimum_delta():
+    # +40% but only 0.04 s: startup noise on a fast machine
+    results = {'onefile/cold/hello_world': {'build_s': 10.0, 'size_bytes': 8_000_000, 'startup_s': 0.24,
+                                            'peak_rss_mb': 100}}
+    assert compare_results(results, BASELINE, threshold=0.1) == []
+    assert compare_results(results, BASELINE, threshold=0.1, min_deltas={}) != []
+
+
+def test_median_result_combines_repeated_runs():
+    runs = [{'build_s': build, 'cpu_user_s': cpu, 'peak_rss_mb': rss, 'startup_s': None, 'size_bytes': 10,
+             'returncode': 0} for build, cpu, rss in ((3.0, 1.0, 90), (1.0, 2.0, 80), (2.0, 3.0, 70))]
+    merged = median_result(runs)
+    assert (merged['build_s'], merged['cpu_user_s'], merged['peak_rss_mb']) == (2.0, 2.0, 80)
+    assert merged['startup_s'] is None
+    assert merged['runs'] == 3
+
+
+def test_format_result_reports_failures():
+    assert format_result('onedir/warm/x', {'returncode': 2}) == "  ✗ onedir/warm/x: build failed (exit 2)"
+    assert format_result('onedir/warm/x', {'returncode': 0, 'build_s': 1.5, 'size_bytes': 2 * 1024 * 1024}) == (
+        "  ✓ onedir/warm/x: build 1.50 s · 2.0 MB")
+
+
+@pytest.mark.parametrize('modules, depth', [(12, 12), (50, 3), (5, 10), (500, 4), (7, 1), (3, 2)])
+def test_module_levels_cover_every_module_once(modules, depth):
+    levels = module_levels(modules, depth)
+    assert [index for level in levels for index in level] == list(range(modules))
+    assert len(levels) == min(modules, depth)
+    assert all(len(upper) <= len(lower) for upper, lower in zip(levels, levels[1:]))
@@ -0,0 +1,125 @@
+import sys
+import textwrap
+from types import SimpleNamespace
+
+import pytest
+
+from py2exe_converter_v4 import (MissingModuleIndex, compute_trace_excludes, find_deferrable_imports,
+                                 parse_importtime, parse_warn_file, profile_import_time, summarize_resources)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _json
+import time:       300 |        300 |     re._parser
+import time:       200 |        500 |   re
+import time:      1000 |       1620 | json
+import time:        50 |         50 | tiny
+"""
+
+WARN_FILE = """\
+
+This file lists modules PyInstaller was not able to find.
+
+missing module named pwd - imported by posixpath (delayed, conditional, optional), shutil (delayed, optional)
+missing module named 'yaml.loader' - imported by app (top-level)
+missing module named guarded - imported by pkg.a (delayed, optional), pkg.b (conditional, top-level)
+missing module named needed - imported by pkg.a (delayed, optional), pkg.c (top-level)
+missing module named lazy - imported by pkg.d (delayed)
+"""
+
+
+def write_warn_file(tmp_path, name, text=WARN_FILE):
+    path = tmp_path / f'warn-{name}.txt'
+    path.write_text(text)
+    return str(path)
+
+
+def test_trace_excludes_are_untraced_top_level_packages():
+    bundled = {'json', 'json.decoder', 'numpy', 'numpy.core', 'requests.api', 'encodings.utf_8',
+               'pyimod02_importers', 'pyi_rth_pkgutil'}
+    traced = {'json', 'requests'}
+    assert compute_trace_excludes(bundled, traced) == ['numpy']
+
+
+def test_trace_excludes_match_packages_traced_by_submodule():
+    assert compute_trace_excludes({'email', 'xml'}, {'email.mime.text'}) == ['xml']
+
+
+def test_parse_importtime_builds_tree_from_children_first_output():
+    roots = parse_importtime(IMPORTTIME_OUTPUT)
+    assert [(node['name'], node['self_us'], node['cumulative_us']) for node in roots] == [
+        ('json', 1000, 1620), ('tiny', 50, 50)]
+    json_node = roots[0]
+    assert [child['name'] for child in json_node['children']] == ['_json', 're']
+    assert [child['name'] for child in json_node['children'][1]['children']] == ['re._parser']
+    assert roots[1]['children'] == []
+
+
+def test_deferrable_imports_exclude_module_level_uses(tmp_path):
+    script = tmp_path / 'app.py'
+    script.write_text(textwrap.dedent("""\
+        import json
+        import os.path
+        import csv as table
+        from decimal import Decimal
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+
+        BASE = os.path.dirname(__file__)
+
+        def load(path, default=Decimal(0)):
+            return json.load(open(path)), table, numpy
+        """))
+    assert find_deferrable_imports(str(script)) == {'json': ['json'], 'csv': ['table'], 'numpy': ['numpy']}
+
+
+def test_profile_import_time_reports_only_the_scripts_imports(tmp_path):
+    script = tmp_path / 'app.py'
+    ran = tmp_path / 'ran'
+    script.write_text(f"import json\nif __name__ == '__main__':\n    open({str(ran)!r}, 'w').close()\n")
+    names = [node['name'] for node in profile_import_time(str(script))]
+    assert 'json' in names
+    assert 'runpy' not in names and 'pkgutil' not in names
+    assert not ran.exists()
+
+
+def test_parse_warn_file(tmp_path):
+    missing = parse_warn_file(write_warn_file(tmp_path, 'app'))
+    assert sorted(missing) == ['guarded', 'lazy', 'needed', 'pwd', 'yaml.loader']
+    assert missing['pwd'] == {'posixpath': {'delayed', 'conditional', 'optional'},
+                              'shutil': {'delayed', 'optional'}}
+    assert missing['yaml.loader'] == {'app': {'top-level'}}
+
+
+def test_missing_module_suggestions_skip_guarded_and_harmless_modules(tmp_path):
+    index = MissingModuleIndex()
+    assert index.add_warn_file('one.py', write_warn_file(tmp_path, 'one')) == 5
+    index.add_warn_file('two.py', write_warn_file(tmp_path, 'two',
+                                                  "missing module named lazy - imported by x (delayed)\n"))
+
+    suggestions = index.suggestions()
+    # Top-level imports first, then modules missing from more scripts
+    assert [module for module, _ in suggestions] == ['needed', 'yaml.loader', 'lazy']
+    assert suggestions[2][1]['scripts'] == {'one.py', 'two.py'}
+    assert index.modules['guarded']['unguarded'] == set()
+
+
+MB = 1024 * 1024
+
+
+def test_summarize_resources_without_rusage():
+    assert summarize_resources(1.234, None, (300 * MB, 2 * MB, 5 * MB)) == {
+        'wall_s': 1.23, 'cpu_user_s': None, 'cpu_sys_s': None,
+        'peak_rss_mb': 300.0, 'read_mb': 2.0, 'write_mb': 5.0}
+
+
+@pytest.mark.parametrize('platform, maxrss', [('linux', 400 * 1024), ('darwin', 400 * MB)])
+def test_summarize_resources_takes_the_larger_measurement(monkeypatch, platform, maxrss):
+    monkeypatch.setattr(sys, 'platform', platform)
+    # ru_maxrss is kilobytes on Linux and bytes on macOS; blocks are 512 bytes
+    rusage = SimpleNamespace(ru_maxrss=maxrss, ru_inblock=4096, ru_oublock=2048, ru_utime=3.456, ru_stime=0.5)
+    resources = summarize_resources(10, rusage, (350 * MB, 1 * MB, 9 * MB))
+    assert resources == {'wall_s': 10, 'cpu_user_s': 3.46, 'cpu_sys_s': 0.5,
+                         'peak_rss_mb': 400.0, 'read_mb': 2.0, 'write_mb': 9.0}
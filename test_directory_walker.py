@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from py2exe_converter_v4 import IconIndex, ParallelDirectoryWalker, TaskCancelled
+
+EXTENSIONS = ('.ico', '.png')
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / 'tree'
+    for name in ('top.png', 'a/one.ico', 'a/deep/two.png', 'a/deep/deeper/three.png',
+                 'backup/old.png', 'b/skip.tmp.png', 'b/keep.ico', 'node_modules/pkg/vendor.png',
+                 '.git/hidden.png', 'a/readme.txt'):
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'')
+    return str(root)
+
+
+def relative(root, paths):
+    return sorted(os.path.relpath(path, root).replace(os.sep, '/') for path in paths)
+
+
+def test_walk_applies_skip_rules(tree):
+    found = ParallelDirectoryWalker(EXTENSIONS, workers=4).walk(tree, 100)
+    assert relative(tree, found) == ['a/deep/deeper/three.png', 'a/deep/two.png', 'a/one.ico',
+                                     'b/keep.ico', 'b/skip.tmp.png', 'backup/old.png', 'top.png']
+
+
+def test_walk_stops_at_limit(tree):
+    assert len(list(ParallelDirectoryWalker(EXTENSIONS).walk(tree, 3))) == 3
+
+
+def test_walk_reraises_from_on_directory(tree):
+    def on_directory():
+        raise TaskCancelled()
+
+    with pytest.raises(TaskCancelled):
+        list(ParallelDirectoryWalker(EXTENSIONS).walk(tree, 100, on_directory))
+
+
+@pytest.mark.parametrize('max_depth, ignore_patterns', [
+    (None, ()), (0, ()), (1, ()), (None, ('backup*', '*.tmp.png')), (1, ('DEEP',)),
+])
+def test_index_results_follow_walk_rules(tree, tmp_path, max_depth, ignore_patterns):
+    walker = ParallelDirectoryWalker(EXTENSIONS, max_depth=max_depth, ignore_patterns=ignore_patterns)
+    index = IconIndex(str(tmp_path / 'index.sqlite3'))
+    index.refresh(tree, EXTENSIONS)
+
+    walked = relative(tree, walker.walk(tree, 100))
+    indexed = relative(tree, index.search(tree, EXTENSIONS, 100, accept=lambda path: walker.accepts(tree, path)))
+    assert walked == indexed
+    if max_depth == 0:
+        assert walked == ['top.png']
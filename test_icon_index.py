@@ -0,0 +1,157 @@
+import os
+import threading
+
+import pytest
+
+import py2exe_converter_v4
+from py2exe_converter_v4 import CancelToken, IconIndex, TaskCancelled
+
+EXTENSIONS = ('.ico', '.png')
+
+
+class CancelAfter(CancelToken):
+    """Cancel token that trips after a number of checks."""
+
+    def __init__(self, checks):
+        super().__init__()
+        self.checks = checks
+
+    def check(self):
+        self.checks -= 1
+        if self.checks < 0:
+            self.cancel()
+        super().check()
+
+
+def touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(os.path.basename(path).encode())
+
+
+def bump_mtime(directory):
+    # Listing changes within one filesystem timestamp tick would go unnoticed
+    stat = os.stat(directory)
+    os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / 'tree'
+    for name in ('a/deep/x.png', 'b/y.png', 'a/z.ico'):
+        touch(str(root / name))
+    return str(root)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return IconIndex(str(tmp_path / 'index.sqlite3'))
+
+
+def names(paths):
+    return sorted(os.path.basename(path) for path in paths)
+
+
+def test_refresh_indexes_tree(tree, index):
+    stats = index.refresh(tree, EXTENSIONS)
+    assert stats['added'] == 3
+    assert index.covering_root(os.path.join(tree, 'a')) is not None
+    assert names(index.search(tree, EXTENSIONS)) == ['x.png', 'y.png', 'z.ico']
+    assert names(index.search(os.path.join(tree, 'a'), ('.png',))) == ['x.png']
+
+
+def test_cancelled_refresh_is_completed_by_next_refresh(tree, index):
+    with pytest.raises(TaskCancelled):
+        index.refresh(tree, EXTENSIONS, token=CancelAfter(1))
+    assert index.covering_root(tree) is None
+
+    index.refresh(tree, EXTENSIONS)
+    assert index.covering_root(tree) is not None
+    assert names(index.search(tree, EXTENSIONS)) == ['x.png', 'y.png', 'z.ico']
+
+
+@pytest.mark.parametrize('checks', range(1, 5))
+def test_refresh_cancelled_anywhere_is_completed(tree, index, checks):
+    index.refresh(tree, EXTENSIONS)
+    touch(os.path.join(tree, 'b', 'new', 'n.png'))
+    bump_mtime(os.path.join(tree, 'b'))
+    os.remove(os.path.join(tree, 'a', 'deep', 'x.png'))
+    bump_mtime(os.path.join(tree, 'a', 'deep'))
+
+    with pytest.raises(TaskCancelled):
+        index.refresh(tree, EXTENSIONS, token=CancelAfter(checks))
+    index.refresh(tree, EXTENSIONS)
+    assert names(index.search(tree, EXTENSIONS)) == ['n.png', 'y.png', 'z.ico']
+
+
+def test_refresh_tracks_add_remove_rename(tree, index):
+    index.refresh(tree, EXTENSIONS)
+
+    touch(os.path.join(tree, 'b', 'added.png'))
+    os.remove(os.path.join(tree, 'a', 'z.ico'))
+    os.rename(os.path.join(tree, 'a', 'deep'), os.path.join(tree, 'a', 'moved'))
+    for directory in ('a', 'b'):
+        bump_mtime(os.path.join(tree, directory))
+
+    stats = index.refresh(tree, EXTENSIONS)
+    assert (stats['added'], stats['removed']) == (2, 2)
+    assert sorted(os.path.relpath(path, tree) for path in index.search(tree, EXTENSIONS)) == [
+        os.path.join('a', 'moved', 'x.png'), os.path.join('b', 'added.png'), os.path.join('b', 'y.png')]
+
+
+def test_refresh_of_unchanged_tree_lists_nothing(tree, index):
+    index.refresh(tree, EXTENSIONS)
+    stats = index.refresh(tree, EXTENSIONS)
+    assert stats['dirs_listed'] == 0
+    assert stats['added'] + stats['updated'] + stats['removed'] == 0
+
+
+def test_add_files(tree, index):
+    index.refresh(tree, EXTENSIONS)
+    created = os.path.join(tree, 'b', 'created.ico')
+    touch(created)
+    index.add_files([created])
+    assert index.details(created)['size'] == len(b'created.ico')
+    assert 'created.ico' in names(index.search(tree, EXTENSIONS))
+
+
+def test_add_files_does_not_wait_for_refresh(tree, index, monkeypatch):
+    reading = threading.Event()
+    release = threading.Event()
+    read_icon = IconIndex.read_icon.__func__
+
+    def slow_read_icon(cls, path, stat=None):
+        if os.path.basename(path) == 'y.png':
+            reading.set()
+            release.wait(10)
+        return read_icon(cls, path, stat)
+
+    monkeypatch.setattr(IconIndex, 'read_icon', classmethod(slow_read_icon))
+    refresh = threading.Thread(target=index.refresh, args=(tree, EXTENSIONS))
+    refresh.start()
+    try:
+        assert reading.wait(10)
+        created = os.path.join(tree, 'created.png')
+        touch(created)
+        added = threading.Thread(target=index.add_files, args=([created],))
+        added.start()
+        added.join(5)
+        assert not added.is_alive()
+    finally:
+        release.set()
+        refresh.join()
+    assert 'created.png' in names(index.search(tree, EXTENSIONS))
+
+
+def test_paths_differing_in_case_share_entries(tmp_path, index, monkeypatch):
+    # Emulates Windows, where normcase folds case
+    monkeypatch.setattr(py2exe_converter_v4.os.path, 'normcase', str.lower)
+    root = str(tmp_path / 'icons')
+    touch(os.path.join(root, 'sub', 'Logo.PNG'))
+    index.refresh(root, EXTENSIONS)
+    index.refresh(root, EXTENSIONS)
+
+    upper = root.upper()
+    assert index.covering_root(upper) is not None
+    assert index.search(upper, EXTENSIONS) == [os.path.join(root, 'sub', 'Logo.PNG')]
+    assert index.details(os.path.join(upper, 'SUB', 'logo.png')) is not None
@@ -0,0 +1,86 @@
+import builtins
+import gzip
+import json
+import os
+
+from py2exe_converter_v4 import JsonLogSink, iter_json_log_events
+
+JOB = {'id': '20240101-000000-01', 'script': os.path.join('src', 'app.py')}
+
+
+def archives(log_dir):
+    return sorted(name for name in os.listdir(log_dir) if name.endswith('.jsonl.gz'))
+
+
+def test_events_are_written_as_json_lines(tmp_path):
+    sink = JsonLogSink(str(tmp_path), max_bytes=1024 * 1024).start()
+    sink.emit('build', "Building EXE ✓", JOB, 'build', timestamp=1700000000.5)
+    sink.emit('info', "done")
+    sink.close()
+
+    with open(sink.path, encoding='utf-8') as f:
+        events = [json.loads(line) for line in f]
+    assert [event['message'] for event in events] == ["Building EXE ✓", "done"]
+    assert events[0]['job'] == JOB['id']
+    assert events[0]['script'] == 'app.py'
+    assert events[0]['phase'] == 'build'
+    assert events[1]['job'] is None
+
+
+def test_rotation_compresses_and_prunes_archives(tmp_path):
+    sink = JsonLogSink(str(tmp_path), max_bytes=2000, max_files=3)
+    # Queued before the writer starts, so rotations happen in one writer batch
+    for i in range(200):
+        sink.emit('info', f"event {i:03d} " + "x" * 50)
+    sink.start().close()
+
+    rotated = archives(str(tmp_path))
+    assert len(rotated) == 3
+    for name in rotated:
+        with gzip.open(os.path.join(str(tmp_path), name), 'rt', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert lines and all(json.loads(line)['level'] == 'info' for line in lines)
+        assert sum(len(line.encode('utf-8')) + 1 for line in lines) >= 2000
+
+    # The newest archives and the current file hold the most recent events, in order
+    messages = [event['message'][:9] for event in iter_json_log_events(str(tmp_path))]
+    assert messages == sorted(messages)
+    assert messages[-1] == "event 199"
+
+
+def test_failed_reopen_after_rotation_disables_sink(tmp_path, monkeypatch):
+    logged = []
+    sink = JsonLogSink(str(tmp_path), max_bytes=500, log=lambda message, level: logged.append(level))
+    opens = []
+    real_open = builtins.open
+
+    def failing_reopen(path, mode='r', *args, **kwargs):
+        if path == sink.path and mode == 'ab':
+            opens.append(path)
+            if len(opens) > 1:
+                raise PermissionError(13, "Permission denied", path)
+        return real_open(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, 'open', failing_reopen)
+    for i in range(20):
+        sink.emit('info', f"event {i} " + "x" * 40)
+    sink.start()
+    sink._thread.join(5)
+    assert not sink._thread.is_alive()
+    sink.emit('info', "after")
+    sink.close()
+
+    assert sink.disabled
+    assert logged == ['error']
+    assert len(archives(str(tmp_path))) == 1
+    written = sum(1 for _ in iter_json_log_events(str(tmp_path)))
+    assert written + sink.dropped == 21
+
+
+def test_full_queue_drops_events(tmp_path):
+    sink = JsonLogSink(str(tmp_path), max_queue=5)
+    for i in range(8):
+        sink.emit('info', f"event {i}")
+    assert sink.dropped == 3
+    sink.start().close()
+    assert [event['message'] for event in iter_json_log_events(str(tmp_path))] == [f"event {i}" for i in range(5)]
@@ -0,0 +1,251 @@
+import os
+import time
+from unittest import mock
+
+import pytest
+
+from py2exe_converter_v4 import LogSearchIndex, ModernPy2ExeConverter, SessionLog, log_line_pattern
+
+LEVELS = ('info', 'success', 'warning', 'error', 'build')
+
+
+def make_records(count):
+    return [(f"12:00:{i % 60:02d}", f"message {i} ünïcode" + ("\nsecond line" if i % 7 == 0 else ""),
+             LEVELS[i % len(LEVELS)]) for i in range(count)]
+
+
+class FakeText:
+    """Records the text the log pipeline inserts at the end of the widget."""
+
+    def __init__(self):
+        self.text = ''
+
+    def config(self, **options):
+        pass
+
+    def insert(self, index, *chunks):
+        self.text += ''.join(chunks[0::2])
+
+    def see(self, index):
+        pass
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Converter with only its log pipeline, as the log benchmark builds it."""
+    app = object.__new__(ModernPy2ExeConverter)
+    app.default_settings = {}
+    app.ui_bus = mock.Mock()
+    app.json_log = mock.Mock()
+    app._init_log_pipeline(SessionLog(str(tmp_path / 'drain.log')))
+    app.output_text = FakeText()
+    yield app
+    app.session_log.close()
+
+
+@pytest.fixture(params=['file', 'memory'])
+def session_log(request, tmp_path):
+    path = tmp_path / 'session.log'
+    if request.param == 'memory':
+        # A directory in place of the file makes the open fail
+        path.mkdir()
+    log = SessionLog(str(path))
+    assert log.in_memory == (request.param == 'memory')
+    yield log
+    log.close()
+
+
+def test_session_log_pages_round_trip(session_log):
+    records = make_records(250)
+    for number, record in enumerate(records):
+        assert session_log.append(*record) == number
+    assert len(session_log) == 250
+
+    paged = []
+    for start in range(0, 250, 64):
+        paged.extend(session_log.read(start, start + 64))
+    assert paged == records
+    assert session_log.read(100, 103) == records[100:103]
+
+
+def test_session_log_read_raw_matches_file_offsets(session_log):
+    records = make_records(20)
+    for record in records:
+        session_log.append(*record)
+    raw = session_log.read_raw(0, 20)
+    assert raw.count(b"\n") == 20 + sum(1 for _, message, _ in records if "\n" in message)
+    assert session_log.read_raw(6, 7) == f"[{records[6][0]}] [SUCCESS] {records[6][1]}\n".encode('utf-8')
+    if not session_log.in_memory:
+        session_log.flush()
+        with open(session_log.path, 'rb') as f:
+            assert f.read() == raw
+
+
+@pytest.mark.parametrize('start, end', [(-5, 3), (18, 40), (10, 10), (12, 4), (30, 40)])
+def test_session_log_clamps_ranges(session_log, start, end):
+    records = make_records(20)
+    for record in records:
+        session_log.append(*record)
+    assert session_log.read(start, end) == records[max(0, start):min(end, 20)]
+
+
+def test_session_log_reads_records_appended_after_a_read(session_log):
+    session_log.append('12:00:00', 'first', 'info')
+    assert session_log.read(0, 1) == [('12:00:00', 'first', 'info')]
+    session_log.append('12:00:01', 'second', 'error')
+    assert session_log.read(0, 2) == [('12:00:00', 'first', 'info'), ('12:00:01', 'second', 'error')]
+
+
+def test_create_for_session_prunes_old_sessions(tmp_path):
+    sessions = tmp_path / 'sessions'
+    sessions.mkdir()
+    for i in range(SessionLog.MAX_SESSION_FILES + 3):
+        (sessions / f'session-20240101-0000{i:02d}-1.log').write_text('')
+    log = SessionLog.create_for_session(str(tmp_path))
+    log.close()
+    remaining = sorted(os.listdir(sessions))
+    assert len(remaining) == SessionLog.MAX_SESSION_FILES
+    assert os.path.basename(log.path) in remaining
+
+
+def test_drain_takes_whole_backlog_within_budget(app):
+    for i in range(100):
+        app.log_output(f"line {i}", "info")
+    assert app._process_log_queue() is False
+    assert len(app.session_log) == 100
+    assert app.output_text.text.count("\n") == 100
+    assert (app.log_metrics['drained'], app.log_metrics['ticks'], app.log_metrics['depth']) == (100, 1, 0)
+
+
+def test_drain_yields_when_budget_is_spent(app):
+    app.LOG_DRAIN_BUDGET = -1
+    for i in range(100):
+        app.log_output(f"line {i}", "info")
+    # The budget is checked every 32 messages; a backlog keeps the pump running
+    assert app._process_log_queue() is True
+    assert len(app.session_log) == 32
+    assert app.log_metrics['depth'] == 68
+    while app._process_log_queue():
+        pass
+    assert [message for _, message, _ in app.session_log.read(0, 100)] == [f"line {i}" for i in range(100)]
+
+
+def test_drain_waits_for_log_widget(app):
+    del app.output_text
+    app.log_output("early", "info")
+    assert app._process_log_queue() is False
+    assert app.log_queue.qsize() == 1
+
+
+def test_log_timestamp_is_formatted_once_per_second(app):
+    now = int(time.time())
+    first = app._format_log_timestamp(now + 0.1)
+    assert app._format_log_timestamp(now + 0.9) is first
+    assert app._format_log_timestamp(now + 1.2) != first
+
+
+JOBS = [{'id': f"20240101-000000-{i:02d}", 'script': f"app{i}.py"} for i in (1, 2)]
+
+
+def build_index(count=300):
+    index = LogSearchIndex()
+    records = []
+    for record in range(count):
+        message = f"Processing module pkg{record % 13} hook-{record % 5} Done"
+        if record % 4 == 0:
+            message = "Warning: missing numpy"
+        level = 'warning' if record % 4 == 0 else LEVELS[record % 3]
+        job = JOBS[record % 3] if record % 3 < 2 else None
+        index.add(record, message, level, job)
+        records.append((message, level, job))
+    return index, records
+
+
+def linear_search(records, query, level=None, job=None, start=0):
+    terms = LogSearchIndex.TOKEN_RE.findall(query.lower())
+    return [record for record, (message, record_level, record_job) in enumerate(records)
+            if record >= start
+            and all(any(token.startswith(term) for token in LogSearchIndex.TOKEN_RE.findall(message.lower()))
+                    for term in terms)
+            and (not level or record_level == level)
+            and (not job or (record_job and record_job['id'] == job))]
+
+
+@pytest.mark.parametrize('query, level, job, start', [
+    ("pkg1", None, None, 0),
+    ("PKG12 hook", None, None, 0),
+    ("proc", 'success', None, 0),
+    ("", 'warning', JOBS[1]['id'], 0),
+    ("numpy", None, JOBS[0]['id'], 150),
+    ("hook-3 done", 'info', JOBS[0]['id'], 17),
+])
+def test_index_search_matches_linear_scan(query, level, job, start):
+    index, records = build_index()
+    expected = linear_search(records, query, level, job, start)
+    assert expected
+    assert index.search(query, level, job, start) == expected
+
+
+def test_index_search_edge_cases():
+    index, _ = build_index()
+    assert index.search() is None
+    assert index.search("absent") == []
+    assert index.search("numpy", level='error') == []
+    assert index.job_labels[JOBS[0]['id']] == f"{JOBS[0]['id']} · app1.py"
+    assert index.records == 300
+
+
+def test_index_sees_tokens_added_after_a_search():
+    index = LogSearchIndex()
+    index.add(0, "alpha", 'info')
+    assert index.search("al") == [0]
+    index.add(1, "almond alpha", 'info')
+    assert index.search("al") == [0, 1]
+    assert index.search("alm") == [1]
+
+
+@pytest.mark.parametrize('message, level, pattern', [
+    ("1234 INFO: Loading module hook 'hook-a.py' from '/x/hooks'...", 'build',
+     "# INFO: Loading module hook # from #..."),
+    ("5 INFO: Processing C:\\src\\pkg\\mod.py", 'build', "# INFO: Processing #"),
+    ("Loading module hook 'hook-a.py'", 'info', None),
+    ("Traceback (most recent call last):\n  File 'x.py'", 'build', None),
+])
+def test_log_line_pattern(message, level, pattern):
+    assert log_line_pattern(message, level) == pattern
+
+
+def hook_line(i):
+    return (f"12:00:{i:02d}", f"{100 + i} INFO: Loading module hook 'hook-{i}.py'", 'build')
+
+
+def test_render_collapses_runs_of_similar_build_lines(app):
+    records = [hook_line(1), hook_line(2), hook_line(3), ("12:00:04", "Converted", 'success'), hook_line(5)]
+    inserts, line_counts, run, extends_tail = app._render_log_records(records)
+
+    assert inserts == [
+        "[12:00:01] ", "timestamp", f"{records[0][1]}\n", 'build',
+        "        ⋯ 2 more similar lines (click to expand)\n", "coalesced",
+        "[12:00:04] ", "timestamp", "Converted\n", 'success',
+        "[12:00:05] ", "timestamp", f"{records[4][1]}\n", 'build',
+    ]
+    # The run's summary line belongs to its last record
+    assert line_counts == [1, 0, 1, 1, 1]
+    assert run == (log_line_pattern(records[4][1], 'build'), 0)
+    assert not extends_tail
+
+
+def test_render_continues_run_from_previous_batch(app):
+    _, _, run, _ = app._render_log_records([hook_line(1), hook_line(2)])
+    inserts, line_counts, run, extends_tail = app._render_log_records([hook_line(3), hook_line(4)], run)
+    assert extends_tail
+    assert inserts == ["        ⋯ 3 more similar lines (click to expand)\n", "coalesced"]
+    assert line_counts == [0, 1]
+    assert run[1] == 3
+
+
+def test_render_without_coalescing(app):
+    records = [hook_line(1), hook_line(2), ("12:00:03", "two\nlines", 'error')]
+    inserts, line_counts, _, _ = app._render_log_records(records, coalesce=False)
+    assert "coalesced" not in inserts
+    assert line_counts == [1, 1, 2]
@@ -0,0 +1,54 @@
+from py2exe_converter_v4 import MetricsRegistry
+
+
+def test_render_exposition_format():
+    metrics = MetricsRegistry()
+    metrics.declare('jobs_total', 'counter', "Finished jobs by status.")
+    metrics.declare('jobs', 'gauge', "Jobs by state.")
+    metrics.declare('build_seconds', 'histogram', "Build wall time.", buckets=(1, 5))
+    metrics.declare_callback('cache_entries', 'gauge', "Cache entries.", lambda: {(('cache', 'mask'),): 4})
+    metrics.declare_callback('uptime_seconds', 'gauge', "Uptime.", lambda: 12.5)
+
+    metrics.inc('jobs_total', status='succeeded')
+    metrics.inc('jobs_total', 2, status='succeeded')
+    metrics.inc('jobs_total', status='failed')
+    metrics.set('jobs', 3, state='queued')
+    metrics.observe('build_seconds', 0.5, status='succeeded')
+    metrics.observe('build_seconds', 4, status='succeeded')
+    metrics.observe('build_seconds', 7, status='succeeded')
+
+    assert metrics.render() == (
+        '# HELP jobs_total Finished jobs by status.\n'
+        '# TYPE jobs_total counter\n'
+        'jobs_total{status="succeeded"} 3\n'
+        'jobs_total{status="failed"} 1\n'
+        '# HELP jobs Jobs by state.\n'
+        '# TYPE jobs gauge\n'
+        'jobs{state="queued"} 3\n'
+        '# HELP build_seconds Build wall time.\n'
+        '# TYPE build_seconds histogram\n'
+        'build_seconds_bucket{status="succeeded",le="1"} 1\n'
+        'build_seconds_bucket{status="succeeded",le="5"} 2\n'
+        'build_seconds_bucket{status="succeeded",le="+Inf"} 3\n'
+        'build_seconds_sum{status="succeeded"} 11.5\n'
+        'build_seconds_count{status="succeeded"} 3\n'
+        '# HELP cache_entries Cache entries.\n'
+        '# TYPE cache_entries gauge\n'
+        'cache_entries{cache="mask"} 4\n'
+        '# HELP uptime_seconds Uptime.\n'
+        '# TYPE uptime_seconds gauge\n'
+        'uptime_seconds 12.5\n'
+    )
+
+
+def test_render_skips_samples_of_failing_callbacks():
+    metrics = MetricsRegistry()
+    metrics.declare_callback('broken', 'gauge', "Broken.", lambda: 1 / 0)
+    assert metrics.render() == '# HELP broken Broken.\n# TYPE broken gauge\n'
+
+
+def test_value_reads_counter_and_gauge_samples():
+    metrics = MetricsRegistry().declare('hits_total', 'counter', "Hits.")
+    assert metrics.value('hits_total', cache='mask') == 0
+    metrics.inc('hits_total', cache='mask', result='hit')
+    assert metrics.value('hits_total', result='hit', cache='mask') == 1